@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: SDK overhead per call, excluding network time
+
+Requests go to an in-process transport that returns a canned response,
+so the time measured is what the SDK and requests spend per call. The
+transport's own time is measured separately and subtracted.
+    
+    python benchmarks/request_overhead.py [--calls 20000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from requests.adapters import BaseAdapter
+
+from touristesim import TouristEsim
+from touristesim.auth import Token
+
+PAYLOAD = json.dumps({'data': {'id': 1, 'name': 'Europe 5GB', 'price': 9.5}}).encode()
+
+
+class CannedAdapter(BaseAdapter):
+    """Transport answering every request with the same 200 response"""
+    
+    def __init__(self):
+        super().__init__()
+        self.elapsed = 0.0
+    
+    def send(self, request, **kwargs):
+        started = time.perf_counter()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = PAYLOAD
+        response.headers['Content-Type'] = 'application/json'
+        response.request = request
+        response.url = request.url
+        self.elapsed += time.perf_counter() - started
+        return response
+    
+    def close(self):
+        pass
+
+
+def build(options):
+    sdk = TouristEsim('bench', 'bench', options)
+    sdk.oauth.token = Token({'access_token': 'bench-token', 'expires_in': 86400})
+    adapter = CannedAdapter()
+    sdk.http_client.session.mount('https://', adapter)
+    return sdk, adapter
+
+
+def measure(name, options, call, calls):
+    sdk, adapter = build(options)
+    for _ in range(min(calls, 1000)):
+        call(sdk)
+    adapter.elapsed = 0.0
+    started = time.perf_counter()
+    for _ in range(calls):
+        call(sdk)
+    total = time.perf_counter() - started
+    overhead = (total - adapter.elapsed) / calls
+    print(f"{name:<34} {overhead * 1e6:8.1f} us/call   (transport {adapter.elapsed / calls * 1e6:.1f} us)")
+    return overhead
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+    
+    print(f"SDK overhead per call, {args.calls} calls\n")
+    measure('GET, defaults', {}, lambda sdk: sdk.http_client.get('/plans/1'), args.calls)
+    measure('GET with params', {}, lambda sdk: sdk.http_client.get('/plans', {'country': 'FR', 'page': 2}), args.calls)
+    measure('GET, no coalescing or breakers', {'coalesce_requests': False, 'circuit_breaker': False},
+            lambda sdk: sdk.http_client.get('/plans/1'), args.calls)
+    measure('POST with body', {}, lambda sdk: sdk.http_client.post('/orders', {'plan_id': 1, 'quantity': 1}), args.calls)
+
+
+if __name__ == '__main__':
+    main()
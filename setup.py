@@ -29,6 +29,12 @@ setup(
         "requests>=2.28.0",
     ],
     extras_require={
+        "parquet": [
+            "pyarrow>=10.0.0",
+        ],
+        "numpy": [
+            "numpy>=1.20.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
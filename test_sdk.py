@@ -4,9 +4,14 @@ Test Python SDK - Verify it loads without errors
 This does NOT make real API calls
 """
 
+import os
+import subprocess
 import sys
 sys.path.insert(0, 'src')
 
+# Cold `import touristesim` must stay well below this (seconds)
+IMPORT_TIME_BUDGET = 0.1
+
 print("=== Python SDK Test ===\n")
 
 try:
@@ -37,9 +42,857 @@ try:
         print(f"✗ FAIL: {e}")
         sys.exit(1)
     
+    # Test 5: Cold import is fast and defers heavy dependencies
+    print("5. Testing cold import time... ", end="")
+    import_check = (
+        "import sys, time; started = time.perf_counter(); import touristesim; "
+        "elapsed = time.perf_counter() - started; "
+        "print(elapsed, *[m for m in ('requests', 'asyncio', 'sqlite3') if m in sys.modules])"
+    )
+    timings = []
+    for _ in range(3):
+        output = subprocess.run(
+            [sys.executable, '-c', import_check],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.split()
+        timings.append(float(output[0]))
+        eager = output[1:]
+    if eager:
+        print(f"✗ FAIL: imported eagerly: {', '.join(eager)}")
+        sys.exit(1)
+    if min(timings) > IMPORT_TIME_BUDGET:
+        print(f"✗ FAIL: {min(timings) * 1000:.1f} ms > {IMPORT_TIME_BUDGET * 1000:.0f} ms")
+        sys.exit(1)
+    print(f"✓ PASS ({min(timings) * 1000:.1f} ms)")
+    
+    # Test 6: Requests go to the fastest live endpoint and fail over without retries
+    print("6. Testing endpoint failover... ", end="")
+    import json
+    import socket
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    def stand_in(delay, port=0):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            
+            def do_GET(self):
+                self.server.connections.add(self.client_address)
+                self.reply({'data': {'plans': [], 'path': self.path}})
+            
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self.server.tokens += 1
+                self.reply({'access_token': 'stand-in', 'token_type': 'Bearer', 'expires_in': 3600})
+            
+            def reply(self, payload):
+                time.sleep(delay)
+                body = json.dumps(payload).encode()
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting, e.g. at its deadline
+                    pass
+            
+            def log_message(self, *args):
+                pass
+        
+        server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        server.daemon_threads = True
+        server.tokens = 0
+        server.connections = set()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+    
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        dead_port = probe.getsockname()[1]
+    slow, fast = stand_in(0.05), stand_in(0)
+    urls = [f"http://127.0.0.1:{port}/v1" for port in (dead_port, slow.server_port, fast.server_port)]
+    routed = TouristEsim('id', 'secret', {
+        'base_url': urls,
+        'max_retries': 0,
+        'endpoint_routing': {'probe_interval': 0.05},
+    })
+    for _ in range(20):
+        routed.http_client.get('/plans')
+    endpoints = routed.http_client.get_stats()['endpoints']
+    if endpoints[urls[0]]['healthy'] or endpoints[urls[2]]['requests'] < 15:
+        print(f"✗ FAIL: unexpected routing {endpoints}")
+        sys.exit(1)
+    revived = stand_in(0, dead_port)
+    for _ in range(100):
+        if routed.http_client.router.get_stats()[urls[0]]['healthy']:
+            break
+        time.sleep(0.02)
+    else:
+        print("✗ FAIL: recovered endpoint was not probed back into rotation")
+        sys.exit(1)
+    for server in (slow, fast, revived):
+        server.shutdown()
+    print(f"✓ PASS ({endpoints[urls[2]]['requests']}/20 to fastest)")
+    
+    # Test 7: One client shared by many threads
+    print("7. Testing shared client under concurrency... ", end="")
+    server = stand_in(0.002)
+    shared = TouristEsim('id', 'secret', {
+        'base_url': f"http://127.0.0.1:{server.server_port}/v1",
+        'max_connections': 8,
+    })
+    resources = shared.map(lambda _: shared.plans(), range(64), concurrency=8)
+    plans = shared.map(lambda n: shared.plans().find(n), range(400), concurrency=8)
+    futures = [shared.submit(shared.esims().all, {'page': n}) for n in range(40)]
+    pages = [future.result() for future in futures]
+    if len({id(resource) for resource in resources}) != 1:
+        print("✗ FAIL: resource created more than once")
+        sys.exit(1)
+    if [plan.get('path') for plan in plans] != [f"/v1/plans/{n}" for n in range(400)] or len(pages) != 40:
+        print("✗ FAIL: responses mixed up between threads")
+        sys.exit(1)
+    if server.tokens != 1:
+        print(f"✗ FAIL: {server.tokens} token requests")
+        sys.exit(1)
+    if len(server.connections) > 8:
+        print(f"✗ FAIL: {len(server.connections)} connections opened for 8 threads")
+        sys.exit(1)
+    shared.close()
+    server.shutdown()
+    print(f"✓ PASS (440 calls, {len(server.connections)} connections, 1 token request)")
+    
+    # Test 8: CSV/Parquet exports keep their columns fixed, also when resumed
+    print("8. Testing export columns... ", end="")
+    import csv
+    import tempfile
+    from touristesim.collections import PaginatedCollection
+    from touristesim.export import Exporter, _ParquetWriter
+    
+    def listing(pages):
+        def fetch(filters):
+            page = filters['page']
+            return PaginatedCollection(pages[page - 1], {'current_page': page, 'last_page': len(pages)})
+        return fetch
+    
+    pages = [[{'iccid': 'a', 'status': 'active'}], [{'status': 'expired', 'iccid': 'b', 'note': 'late'}]]
+    workdir = tempfile.mkdtemp()
+    full = Exporter(listing(pages)).export(os.path.join(workdir, 'full.csv'), 'csv')
+    resumed_path = os.path.join(workdir, 'resumed.csv')
+    Exporter(listing(pages[:1])).export(resumed_path, 'csv')
+    resumed = Exporter(listing(pages)).export(resumed_path, 'csv', start_page=2)
+    expected = [['iccid', 'status'], ['a', 'active'], ['b', 'expired']]
+    for path in (full.path, resumed_path):
+        with open(path, newline='') as exported:
+            if list(csv.reader(exported)) != expected:
+                print(f"✗ FAIL: {os.path.basename(path)} rows misaligned")
+                sys.exit(1)
+    if not full.completed or full.dropped_fields != ['note'] or resumed.dropped_fields != ['note']:
+        print(f"✗ FAIL: dropped fields {full.dropped_fields}, {resumed.dropped_fields}")
+        sys.exit(1)
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        print("✓ PASS (Parquet skipped, pyarrow not installed)")
+    else:
+        # One row group per row, so the first group sees only a null note
+        _ParquetWriter.row_group_size = 1
+        try:
+            parquet_path = os.path.join(workdir, 'sparse.parquet')
+            Exporter(listing([[{'iccid': 'a', 'note': None}], [{'iccid': 'b', 'note': 5}]])).export(parquet_path, 'parquet')
+        finally:
+            _ParquetWriter.row_group_size = 10000
+        notes = pyarrow.parquet.read_table(parquet_path).to_pydict()['note']
+        if notes != [None, '5']:
+            print(f"✗ FAIL: Parquet notes {notes}")
+            sys.exit(1)
+        print("✓ PASS")
+    
+    # Test 9: A slow GET is hedged, and hedging does not cap concurrent reads
+    print("9. Testing hedged requests... ", end="")
+    from touristesim.hedging import HedgePolicy
+    
+    policy = HedgePolicy(max_delay=0.05, max_workers=2)
+    attempts = []
+    
+    def slow_first():
+        attempts.append(None)
+        time.sleep(0.5 if len(attempts) == 1 else 0.01)
+        return 'answer'
+    
+    started = time.perf_counter()
+    answer = policy.run('plans', slow_first)
+    hedged_in = time.perf_counter() - started
+    if answer != 'answer' or hedged_in > 0.3 or policy.hedge_wins != 1:
+        print(f"✗ FAIL: hedge did not win ({hedged_in:.2f}s, {policy.get_stats()})")
+        sys.exit(1)
+    started = time.perf_counter()
+    callers = [threading.Thread(target=policy.run, args=('plans', lambda: time.sleep(0.1))) for _ in range(40)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+    concurrent_in = time.perf_counter() - started
+    policy.close()
+    if concurrent_in > 0.5:
+        print(f"✗ FAIL: 40 reads on 2 hedge workers took {concurrent_in:.2f}s")
+        sys.exit(1)
+    print(f"✓ PASS (hedge won in {hedged_in * 1000:.0f} ms, 40 reads in {concurrent_in * 1000:.0f} ms)")
+    
+    # Test 10: Only upstream failures open a circuit breaker
+    print("10. Testing circuit breaker failures... ", end="")
+    from touristesim.exceptions import ConnectionException, RateLimitException, ServerException, TimeoutException
+    
+    server = stand_in(0.2)
+    guarded = TouristEsim('id', 'secret', {
+        'base_url': f"http://127.0.0.1:{server.server_port}/v1",
+        'max_retries': 0,
+        'circuit_breaker': {'minimum_calls': 2, 'window_size': 4},
+    })
+    guarded.http_client.get('/plans')
+    expired = 0
+    for _ in range(4):
+        try:
+            guarded.http_client.get('/plans', deadline=0.05)
+        except TimeoutException:
+            expired += 1
+    states = guarded.http_client.circuit_breakers.get_states()
+    failures = [ServerException('down', 503), RateLimitException('slow down', 1), ConnectionException('reset')]
+    if expired != 4 or any(state != 'closed' for state in states.values()):
+        print(f"✗ FAIL: caller deadlines opened the breaker ({expired} expired, {states})")
+        sys.exit(1)
+    if not all(guarded.http_client._is_breaker_failure(error) for error in failures):
+        print("✗ FAIL: upstream failure not counted")
+        sys.exit(1)
+    guarded.close()
+    server.shutdown()
+    print("✓ PASS")
+    
+    # Test 11: Evicted pool clients release their threads, tenants keep their own base_url
+    print("11. Testing pool eviction and tenant endpoints... ", end="")
+    from touristesim.pool import TouristEsimPool
+    
+    pooled, own = stand_in(0), stand_in(0)
+    pool = TouristEsimPool({
+        'base_url': [f"http://127.0.0.1:{pooled.server_port}/v1", f"http://127.0.0.1:{pooled.server_port}/v2"],
+        'endpoint_routing': {'probe_interval': 1},
+    }, max_clients=2)
+    for n in range(20):
+        pool.add(f"tenant-{n}", f"id-{n}", 'secret')
+        pool[f"tenant-{n}"].submit(pool[f"tenant-{n}"].balance_ledger).result()
+    workers = [
+        thread for thread in threading.enumerate()
+        if thread.name.startswith('touristesim_') or isinstance(thread, threading.Timer)
+    ]
+    evictions = pool.evictions
+    pool.add('own', 'id', 'secret', {'base_url': f"http://127.0.0.1:{own.server_port}/v1"})
+    pool['own'].plans().find(1)
+    pool.close()
+    for server in (pooled, own):
+        server.shutdown()
+    if len(workers) > 4 or evictions != 18:
+        print(f"✗ FAIL: {len(workers)} client threads and timers left after {evictions} evictions")
+        sys.exit(1)
+    if not own.connections:
+        print("✗ FAIL: tenant base_url ignored")
+        sys.exit(1)
+    print(f"✓ PASS ({evictions} evictions, {len(workers)} threads and timers left)")
+    
+    # Test 12: Itinerary search respects max_plans when the cheapest cover needs more plans
+    print("12. Testing itinerary plan limit... ", end="")
+    from touristesim.itinerary import ItineraryOptimizer
+    
+    optimizer = ItineraryOptimizer([
+        {'id': 1, 'countries': ['FR', 'DE', 'IT'], 'price': 18, 'validity_days': 30},
+        {'id': 2, 'countries': ['ES'], 'price': 3, 'validity_days': 30},
+        {'id': 3, 'countries': ['FR', 'DE'], 'price': 2, 'validity_days': 30},
+        {'id': 4, 'countries': ['IT'], 'price': 2, 'validity_days': 30},
+        {'id': 5, 'countries': ['FR', 'ES'], 'price': 7, 'validity_days': 30},
+    ])
+    trip = ['FR', 'DE', 'IT', 'ES']
+    cheapest = optimizer.optimize(trip, time_budget=None)[0]
+    limited = optimizer.optimize(trip, max_plans=2, time_budget=None)
+    if cheapest.get_total_price() != 7 or len(cheapest.get_plans()) != 3:
+        print(f"✗ FAIL: cheapest cover {cheapest.to_dict()}")
+        sys.exit(1)
+    if [option.get_total_price() for option in limited] != [21, 25] or any(len(option.get_plans()) > 2 for option in limited):
+        print(f"✗ FAIL: covers within 2 plans {[option.to_dict() for option in limited]}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 13: Lazy components are built once, and nested calls only run inline on their own client
+    print("13. Testing lazy init and nested submits... ", end="")
+    first, second = TouristEsim('id', 'secret'), TouristEsim('id', 'secret')
+    start = threading.Barrier(16)
+    waiters = []
+    
+    def get_waiter():
+        start.wait()
+        waiters.append(first.orders().waiter())
+    
+    racers = [threading.Thread(target=get_waiter) for _ in range(16)]
+    for racer in racers:
+        racer.start()
+    for racer in racers:
+        racer.join()
+    
+    def nested():
+        outer = threading.current_thread()
+        same = first.submit(threading.current_thread).result()
+        other = second.submit(threading.current_thread).result()
+        return same is outer, other is outer
+    
+    inline_same, inline_other = first.submit(nested).result()
+    first.close()
+    second.close()
+    if len({id(waiter) for waiter in waiters}) != 1:
+        print("✗ FAIL: order waiter built more than once")
+        sys.exit(1)
+    if not inline_same or inline_other:
+        print(f"✗ FAIL: nested submit inline on same client {inline_same}, on other client {inline_other}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 14: Order waiter resolves by polling or webhook and tolerates cancelled futures
+    print("14. Testing order waiter... ", end="")
+    from touristesim.events import EventDispatcher
+    from touristesim.models import Order
+    from touristesim.waiter import OrderWaiter
+    
+    class OrderStub:
+        checks = 0
+        
+        def find(self, order_id):
+            OrderStub.checks += 1
+            return Order({'id': order_id, 'status': 'completed' if order_id == 1 and OrderStub.checks > 2 else 'processing'})
+    
+    dispatcher = EventDispatcher()
+    waiter = OrderWaiter(OrderStub(), dispatcher, initial_interval=0.01, max_interval=0.02)
+    polled = waiter.wait(1, timeout=2)
+    hooked = waiter.submit(2, timeout=2)
+    abandoned = waiter.submit(3, timeout=2)
+    abandoned.cancel()
+    dispatcher.dispatch({'event': 'order.completed', 'data': {'id': 3, 'status': 'completed'}})
+    dispatcher.dispatch({'event': 'order.completed', 'data': {'id': 2, 'status': 'completed'}})
+    try:
+        waiter.wait(4, timeout=0.1)
+        timed_out = False
+    except TimeoutException:
+        timed_out = True
+    waiter.close()
+    if polled.get_status() != 'completed' or hooked.result(1).get_status() != 'completed':
+        print("✗ FAIL: order not resolved")
+        sys.exit(1)
+    if not timed_out or waiter.polls < 3:
+        print(f"✗ FAIL: timed out {timed_out}, {waiter.polls} polls")
+        sys.exit(1)
+    print(f"✓ PASS ({waiter.polls} polls)")
+    
+    # Test 15: State store merges concurrent webhooks, hands out copies and seeds outside the client lock
+    print("15. Testing state store... ", end="")
+    from touristesim.events import WebhookEvent
+    from touristesim.state import StateStore
+    
+    store = StateStore(None, None, max_age=None)
+    start = threading.Barrier(16)
+    
+    def webhook(n):
+        start.wait()
+        store.apply_event(WebhookEvent({'event': 'esim.updated', 'data': {'iccid': '89001', f"field_{n}": n}}))
+    
+    hooks = [threading.Thread(target=webhook, args=(n,)) for n in range(16)]
+    for hook in hooks:
+        hook.start()
+    for hook in hooks:
+        hook.join()
+    merged = store.esim('89001')
+    merged.set_attribute('field_0', 'changed')
+    if any(store.esim('89001').get(f"field_{n}") != n for n in range(16)):
+        print(f"✗ FAIL: webhook updates lost or cached entry shared {store.esim('89001').to_dict()}")
+        sys.exit(1)
+    server = stand_in(0.3)
+    seeded = TouristEsim('id', 'secret', {'base_url': f"http://127.0.0.1:{server.server_port}/v1", 'max_retries': 0})
+    seeder = threading.Thread(target=seeded.state_store, kwargs={'seed': True})
+    seeder.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    seeded.plans()
+    blocked = time.monotonic() - started
+    seeder.join()
+    seeded.close()
+    server.shutdown()
+    if blocked > 0.1:
+        print(f"✗ FAIL: accessor blocked {blocked * 1000:.0f} ms by seeding")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 16: Balance ledger fetches outside its lock and stamps reservations when the order is created
+    print("16. Testing balance ledger... ", end="")
+    from touristesim.collections import Collection
+    from touristesim.ledger import BalanceLedger
+    
+    class BalanceStub:
+        calls = []
+        amount = 100.0
+        delay = 0
+        
+        def get(self):
+            BalanceStub.calls.append('get')
+            time.sleep(BalanceStub.delay)
+            return {'balance': BalanceStub.amount}
+        
+        def history(self, filters=None):
+            BalanceStub.calls.append('history')
+            return Collection.make([{'id': 1}])
+    
+    class OrderStub:
+        def create(self, data):
+            BalanceStub.amount -= 30
+            return Order({'id': 7, 'status': 'completed', 'total_price': 30})
+    
+    ledger = BalanceLedger(BalanceStub(), reconcile_interval=None)
+    ledger.refresh()
+    reserve = ledger.reserve
+    
+    def reserve_then_refresh(amount, reference=None):
+        # A refresh between reserving and placing the order does not include the charge
+        reservation = reserve(amount, reference)
+        ledger.refresh()
+        return reservation
+    
+    ledger.reserve = reserve_then_refresh
+    ledger.place_order(OrderStub(), {'plan_id': 1}, 30)
+    settled = ledger.available()
+    BalanceStub.delay = 0.3
+    refresher = threading.Thread(target=ledger.refresh)
+    refresher.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    ledger.get_stats()
+    blocked = time.monotonic() - started
+    refresher.join()
+    if BalanceStub.calls[:2] != ['history', 'get']:
+        print(f"✗ FAIL: history marked after the balance read {BalanceStub.calls[:2]}")
+        sys.exit(1)
+    if settled != 70:
+        print(f"✗ FAIL: {settled} available after a 30 charge on 100")
+        sys.exit(1)
+    if blocked > 0.1:
+        print(f"✗ FAIL: ledger locked {blocked * 1000:.0f} ms during a refresh")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 17: Country index only fetches region members on refresh, building from data stays offline
+    print("17. Testing country index regions... ", end="")
+    from touristesim.country_index import CountryIndex
+    from touristesim.models import Country
+    
+    class CountriesStub:
+        lookups = 0
+        
+        def all(self):
+            return Collection.make([{'code': 'FR', 'name': 'France'}, {'code': 'DE', 'name': 'Germany'}], Country)
+        
+        def by_region(self, slug):
+            CountriesStub.lookups += 1
+            return Collection.make([{'code': 'fr'}, {'code': 'de'}], Country)
+    
+    class RegionsStub:
+        def all(self):
+            return [{'slug': 'europe', 'name': 'Europe'}]
+    
+    index = CountryIndex(CountriesStub(), RegionsStub(), refresh_interval=None)
+    index.build(CountriesStub().all().all(), RegionsStub().all())
+    offline = index.region_countries('europe')
+    index.refresh()
+    if CountriesStub.lookups != 1 or offline:
+        print(f"✗ FAIL: {CountriesStub.lookups} region lookups, {sorted(offline)} members built offline")
+        sys.exit(1)
+    if index.regions_for('fr') != ['europe']:
+        print(f"✗ FAIL: refreshed members {sorted(index.region_countries('europe'))}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 18: A failing usage listener does not stop the poll or the other listeners
+    print("18. Testing usage poller listeners... ", end="")
+    from touristesim.usage_poller import UsagePoller
+    
+    class EsimStub:
+        def usage(self, iccid):
+            return {'balance_data': 50}
+    
+    poller = UsagePoller(EsimStub(), min_interval=60)
+    crossed = []
+    
+    @poller.on_usage
+    def broken(iccid, usage):
+        raise RuntimeError('listener failed')
+    
+    poller.on_threshold(lambda iccid, threshold, remaining, usage: crossed.append(threshold))
+    poller.add('89001')
+    polled = poller.run_pending()
+    if polled != 1 or crossed != [1024, 500, 100] or poller.get_state('89001')['next_due'] <= time.time():
+        print(f"✗ FAIL: {polled} polls, crossed {crossed}")
+        sys.exit(1)
+    if poller.callback_errors != 1 or str(poller.last_error) != 'listener failed':
+        print(f"✗ FAIL: {poller.callback_errors} listener errors recorded")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 19: Request templates are shared by all endpoints of a base URL
+    print("19. Testing request templates... ", end="")
+    server = stand_in(0)
+    templated = TouristEsim('id', 'secret', {'base_url': f"http://127.0.0.1:{server.server_port}/v1", 'max_retries': 0})
+    found = [templated.plans().find(n).get('path') for n in range(50)]
+    stats = templated.http_client.get_stats()['templates']
+    templated.close()
+    server.shutdown()
+    if found != [f"/v1/plans/{n}" for n in range(50)]:
+        print(f"✗ FAIL: wrong paths {found[:3]}")
+        sys.exit(1)
+    if stats['templates'] != 1 or stats['hits'] != 49:
+        print(f"✗ FAIL: {stats}")
+        sys.exit(1)
+    print(f"✓ PASS ({stats['hits']} hits)")
+    
+    # Test 20: Coalescing is opt-in, and a leader's expired deadline is not handed to followers with time left
+    print("20. Testing request coalescing... ", end="")
+    from touristesim.deadline import Deadline
+    from touristesim.singleflight import SingleFlight
+    
+    flight = SingleFlight()
+    
+    def short_leader():
+        # Fail with the leader's own deadline once a follower has joined
+        while flight.coalesced == 0:
+            time.sleep(0.001)
+        raise TimeoutException.deadline_exceeded(0.05)
+    
+    def lead():
+        try:
+            flight.do('key', short_leader, Deadline(0.05))
+        except TimeoutException:
+            pass
+    
+    leader = threading.Thread(target=lead)
+    leader.start()
+    while not flight.in_flight():
+        time.sleep(0.001)
+    follower = flight.do('key', lambda: 'own result', Deadline(2))
+    leader.join()
+    if follower != 'own result':
+        print(f"✗ FAIL: follower got {follower!r}")
+        sys.exit(1)
+    if TouristEsim('id', 'secret').http_client.single_flight is not None:
+        print("✗ FAIL: coalescing enabled by default")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 21: Catalog snapshots release replaced mappings and refetch corrupt files
+    print("21. Testing catalog snapshot files... ", end="")
+    import os
+    import tempfile
+    from touristesim.snapshot import CatalogSnapshotManager
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'catalog.snap')
+        with open(path, 'wb') as handle:
+            handle.write(b'TESNAP\x01\x00\xff\x00\x00\x00{not json')
+        fetches = []
+        manager = CatalogSnapshotManager(path, lambda: fetches.append(1) or {'plans': [{'id': len(fetches)}]})
+        loaded = manager.load(revalidate=False)
+        refreshed = manager.refresh()
+        try:
+            loaded.section('plans')[0]
+            replaced_closed = False
+        except ValueError:
+            replaced_closed = True
+        plan = refreshed.section('plans')[0]
+        refreshed.close()
+    if len(fetches) != 2 or plan != {'id': 2}:
+        print(f"✗ FAIL: {len(fetches)} fetches, plan {plan}")
+        sys.exit(1)
+    if not replaced_closed:
+        print("✗ FAIL: replaced snapshot still mapped")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 22: Pre-opened connections keep the pool's timeout
+    print("22. Testing warmup connections... ", end="")
+    from touristesim.warmup import open_connections
+    
+    server = stand_in(0)
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    warmed = TouristEsim('id', 'secret', {'base_url': base_url})
+    ready, opened = open_connections(warmed.http_client, base_url, 2, 0.25)
+    pools = warmed.http_client.session.get_adapter(base_url).poolmanager.pools
+    timeouts = [conn.timeout for key in pools.keys() for conn in list(pools[key].pool.queue) if conn is not None]
+    warmed.close()
+    server.shutdown()
+    if (ready, opened) != (2, 2) or len(timeouts) != 2 or 0.25 in timeouts:
+        print(f"✗ FAIL: {ready} ready, {opened} opened, timeouts {timeouts}")
+        sys.exit(1)
+    print(f"✓ PASS ({opened} opened)")
+    
+    # Test 23: Delta sync resumes an interrupted run and then only asks for newer records
+    print("23. Testing delta sync... ", end="")
+    from touristesim.collections import PaginatedCollection
+    from touristesim.sync import SyncEngine
+    
+    requested = []
+    
+    def list_orders(filters):
+        requested.append(dict(filters))
+        if len(requested) == 2:
+            raise ConnectionError('dropped mid-run')
+        page = filters['page']
+        items = [{'id': page * 10 + n, 'updated_at': f"2026-01-0{page}T00:00:0{n}Z"} for n in range(2)]
+        return PaginatedCollection(items, {'current_page': page, 'last_page': 3})
+    
+    with tempfile.TemporaryDirectory() as directory:
+        engine = SyncEngine(os.path.join(directory, 'sync.db'), per_page=2)
+        engine.register('orders', list_orders, 'id', Order, 'updated_since')
+        try:
+            engine.sync()
+        except ConnectionError:
+            pass
+        resumed = engine.sync_resource('orders')
+        again = engine.sync_resource('orders')
+        stored = engine.count('orders')
+        engine.close()
+    if [filters['page'] for filters in requested] != [1, 2, 2, 3, 1, 2, 3]:
+        print(f"✗ FAIL: pages requested {[filters['page'] for filters in requested]}")
+        sys.exit(1)
+    if not resumed['resumed'] or resumed['pages'] != 2 or stored != 6:
+        print(f"✗ FAIL: {resumed}, {stored} stored")
+        sys.exit(1)
+    if again['resumed'] or requested[-1].get('updated_since') != '2026-01-03T00:00:01Z':
+        print(f"✗ FAIL: next run filters {requested[-1]}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 24: Loader dedupes queued keys into one batch and falls back to single finds
+    print("24. Testing batched lookups... ", end="")
+    from touristesim.loader import Loader
+    
+    batches, singles = [], []
+    
+    def find_many(ids):
+        batches.append(list(ids))
+        return {plan_id: {'id': plan_id} for plan_id in ids if plan_id != 3}
+    
+    def find_one(plan_id):
+        singles.append(plan_id)
+        return {'id': plan_id, 'single': True}
+    
+    plan_loader = Loader(find_one, find_many)
+    queued = [plan_loader.load(plan_id) for plan_id in (1, 2, 1, 3)]
+    values = [future.result() for future in queued]
+    cached = plan_loader.get(2)
+    if batches != [[1, 2, 3]] or singles != [3] or plan_loader.requests != 2:
+        print(f"✗ FAIL: batches {batches}, singles {singles}, {plan_loader.requests} requests")
+        sys.exit(1)
+    if [value['id'] for value in values] != [1, 2, 1, 3] or not values[3].get('single') or cached != {'id': 2}:
+        print(f"✗ FAIL: values {values}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 25: A deadline clamps connect/read timeouts and bounds the whole call
+    print("25. Testing request deadlines... ", end="")
+    budget = Deadline(0.5)
+    clamped = budget.timeout(10, 30)
+    server = stand_in(1)
+    bounded = TouristEsim('id', 'secret', {'base_url': f"http://127.0.0.1:{server.server_port}/v1", 'max_retries': 3})
+    bounded.oauth.get_token = lambda *args, **kwargs: 'stand-in'
+    started = time.monotonic()
+    try:
+        bounded.http_client.get('/plans', deadline=0.3)
+        expired = False
+    except TimeoutException:
+        expired = True
+    elapsed = time.monotonic() - started
+    bounded.close()
+    server.shutdown()
+    if not all(0.4 < value <= 0.5 for value in clamped):
+        print(f"✗ FAIL: timeouts {clamped} not clamped to the budget")
+        sys.exit(1)
+    if not expired or elapsed > 0.6:
+        print(f"✗ FAIL: expired {expired} after {elapsed:.2f}s")
+        sys.exit(1)
+    print(f"✓ PASS ({elapsed * 1000:.0f} ms)")
+    
+    # Test 26: Large request bodies are gzipped and compressed responses are decoded
+    print("26. Testing compressed bodies... ", end="")
+    import gzip
+    
+    class EchoHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            encoding = self.headers.get('Content-Encoding')
+            if encoding == 'gzip':
+                body = gzip.decompress(body)
+            payload = json.dumps({'data': {'echo': json.loads(body), 'encoding': encoding,
+                                           'accept': self.headers.get('Accept-Encoding')}}).encode()
+            compressed = gzip.compress(payload)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(compressed)))
+            self.end_headers()
+            self.wfile.write(compressed)
+        
+        def log_message(self, *args):
+            pass
+    
+    echo = ThreadingHTTPServer(('127.0.0.1', 0), EchoHandler)
+    echo.daemon_threads = True
+    threading.Thread(target=echo.serve_forever, daemon=True).start()
+    compressing = TouristEsim('id', 'secret', {
+        'base_url': f"http://127.0.0.1:{echo.server_port}/v1",
+        'compress_requests': 256,
+    })
+    compressing.oauth.get_token = lambda *args, **kwargs: 'stand-in'
+    large = {'esims': [{'iccid': f"8900{n:04d}", 'label': 'traveller'} for n in range(50)]}
+    small = {'plan_id': 1}
+    large_reply = compressing.http_client.post('/echo', large)['data']
+    small_reply = compressing.http_client.post('/echo', small)['data']
+    transfer = compressing.http_client.get_stats()['transfer']
+    compressing.close()
+    echo.shutdown()
+    if large_reply['echo'] != large or large_reply['encoding'] != 'gzip' or 'gzip' not in large_reply['accept']:
+        print(f"✗ FAIL: large body sent with {large_reply['encoding']}, accepting {large_reply['accept']}")
+        sys.exit(1)
+    if small_reply['echo'] != small or small_reply['encoding'] is not None:
+        print("✗ FAIL: small body compressed")
+        sys.exit(1)
+    if transfer['compressed_requests'] != 1 or transfer['bytes_sent'] >= transfer['body_bytes']:
+        print(f"✗ FAIL: {transfer}")
+        sys.exit(1)
+    print(f"✓ PASS ({transfer['bytes_sent']}/{transfer['body_bytes']} bytes sent)")
+    
+    # Test 27: Checkout traffic jumps queued background requests
+    print("27. Testing priority scheduling... ", end="")
+    from touristesim.priority import PriorityScheduler, priority
+    
+    scheduler = PriorityScheduler(max_concurrency=2, reserved=1)
+    started_order = []
+    scheduler.acquire('low')
+    scheduler.acquire('high')
+    
+    def queued_call(name):
+        with scheduler.slot(name, timeout=2) as acquired:
+            if acquired:
+                started_order.append(name)
+    
+    callers = []
+    for name in ('low', 'normal', 'high'):
+        caller = threading.Thread(target=queued_call, args=(name,))
+        caller.start()
+        callers.append(caller)
+        while scheduler.get_stats()[name]['queued'] == 0:
+            time.sleep(0.001)
+    scheduler.release('high')
+    while not started_order:
+        time.sleep(0.001)
+    scheduler.release('low')
+    for caller in callers:
+        caller.join()
+    with priority('high'):
+        resolved = scheduler.resolve(None)
+    if started_order != ['high', 'normal', 'low'] or resolved != 'high':
+        print(f"✗ FAIL: started {started_order}, resolved {resolved}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 28: Worker decoding round-trips sparse records and reports fields outside fixed columns
+    print("28. Testing page decoding... ", end="")
+    from touristesim.decoding import DecodedPage, _decode, _share, _take
+    
+    raw = json.dumps({'data': {
+        'esims': [{'iccid': '89001', 'status': 'active'}, {'iccid': '89002', 'label': None}],
+        'pagination': {'current_page': 2, 'last_page': 3},
+    }}).encode()
+    decoded = {}
+    for output, columns in (('records', None), ('csv', ['iccid', 'status'])):
+        source = _share(raw)
+        try:
+            name, size, count, pagination, used, dropped = _decode(source.name, len(raw), 'esims', None, output, columns)
+        finally:
+            source.close()
+            source.unlink()
+        decoded[output] = DecodedPage(_take(name, size, unlink=True), output, count, pagination, used, dropped)
+    records = decoded['records'].to_collection()
+    csv_page = decoded['csv']
+    if [record for record in records] != [{'iccid': '89001', 'status': 'active'}, {'iccid': '89002', 'label': None}]:
+        print(f"✗ FAIL: records {records.all()}")
+        sys.exit(1)
+    if records.get_current_page() != 2 or csv_page.payload.decode() != '89001,active\r\n89002,\r\n' or csv_page.dropped != ['label']:
+        print(f"✗ FAIL: csv {csv_page.payload!r}, dropped {csv_page.dropped}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 29: Usage history wraps its ring, restarts on a top-up and forecasts the burn rate
+    print("29. Testing usage history... ", end="")
+    from touristesim.usage_history import UsageHistory
+    
+    history = UsageHistory(capacity=4, slots=4)
+    for n in range(6):
+        history.record('89001', 1000 - 10 * n, 60.0 * n)
+        history.record('89002', 500, 60.0 * n)
+    wrapped = history.samples('89001')
+    forecast = history.forecast(now=300)
+    fallback = history._compute_python()[1]
+    history.record('89001', 2000, 360)
+    topped_up = history.samples('89001')
+    if wrapped != [(120.0, 980.0), (180.0, 970.0), (240.0, 960.0), (300.0, 950.0)] or topped_up != [(360.0, 2000.0)]:
+        print(f"✗ FAIL: samples {wrapped}, after top-up {topped_up}")
+        sys.exit(1)
+    rate, seconds = forecast['89001']
+    if abs(rate - 10 / 60) > 1e-9 or abs(seconds - 950 / rate) > 1e-6 or forecast['89002'] != (0.0, None):
+        print(f"✗ FAIL: forecast {forecast}")
+        sys.exit(1)
+    if abs(fallback[0] - rate) > 1e-9 or history.forecast(now=360)['89001'] != (0.0, None):
+        print(f"✗ FAIL: python fallback rate {fallback[0]}")
+        sys.exit(1)
+    print("✓ PASS")
+    
+    # Test 30: Batch runs calls across resources concurrently, sharing identical ones
+    print("30. Testing batched calls... ", end="")
+    server = stand_in(0.1)
+    batching = TouristEsim('id', 'secret', {'base_url': f"http://127.0.0.1:{server.server_port}/v1", 'max_connections': 8})
+    batching.oauth.get_token = lambda *args, **kwargs: 'stand-in'
+    started = time.monotonic()
+    with batching.batch() as batch:
+        plan = batch.plans().find(1)
+        same_plan = batch.plans().find(1)
+        esim = batch.esims().find('89001')
+        order = batch.orders().find(7)
+        failed = batch.call(lambda: 1 / 0)
+    elapsed = time.monotonic() - started
+    try:
+        batch.plans().find(2)
+        reopened = True
+    except RuntimeError:
+        reopened = False
+    batching.close()
+    server.shutdown()
+    paths = [future.result().get('path') for future in (plan, esim, order)]
+    if paths != ['/v1/plans/1', '/v1/esims/89001', '/v1/orders/7'] or same_plan is not plan or batch.deduplicated != 1:
+        print(f"✗ FAIL: paths {paths}, {batch.deduplicated} deduplicated")
+        sys.exit(1)
+    if not isinstance(failed.exception(), ZeroDivisionError) or reopened or elapsed > 0.25:
+        print(f"✗ FAIL: error {failed.exception()!r}, reopened {reopened}, {elapsed:.2f}s for 3 calls")
+        sys.exit(1)
+    print(f"✓ PASS ({elapsed * 1000:.0f} ms)")
+    
     print("\n=== All Basic Tests Passed ✓ ===")
     print("SDK is ready for PyPI publication!\n")
-    
+
 except Exception as e:
     print(f"\n✗ FAIL: {e}")
     import traceback
@@ -1,85 +1,355 @@
 """
 TouristeSIM Python SDK - Main entry point
+
+Resources, models and optional components are imported lazily on first
+use, and `requests` is not imported until the first HTTP request, so
+`import touristesim` stays cheap for short-lived processes.
 """
-from typing import Optional, Dict, Any
+import threading
+from importlib import import_module
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Iterable, List
 
 from .config import Config
 from .http_client import HttpClient
 from .auth.oauth import OAuthClient
-from .resources import (
-    Plans,
-    Countries,
-    Regions,
-    Orders,
-    Esims,
-    Balance,
-    Webhooks,
-)
+from .events import EventDispatcher, WebhookEvent
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from .resources import Plans, Countries, Regions, Orders, Esims, Balance, Webhooks
+    from .state import StateStore
+    from .sync import SyncEngine
+    from .country_index import CountryIndex
+    from .loader import LoaderScope
+    from .usage_poller import UsagePoller
+    from .snapshot import CatalogSnapshot, CatalogSnapshotManager
+    from .ledger import BalanceLedger
+    from .executor import ClientExecutor
+    from .warmup import WarmupReport
+    from .batch import Batch
 
 
 class TouristEsim:
     """
     Main Tourist eSIM SDK class
+    
+    An instance is safe to share between threads: resources are created
+    once, a single token refresh runs at a time, and all threads reuse the
+    same connection pool (max_connections connections per host). map() and
+    submit() run calls on a thread pool of the same size.
     """
     
     VERSION = '1.0.0'
     
-    def __init__(self, client_id: str, client_secret: str, options: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        options: Optional[Dict[str, Any]] = None,
+        http_client: Optional[Callable[[Config, OAuthClient], HttpClient]] = None,
+    ):
         self.config = Config(client_id, client_secret, options)
         self.oauth = OAuthClient(self.config)
-        self.http_client = HttpClient(self.config, self.oauth)
+        # http_client builds a custom HttpClient from config and OAuth client
+        self.http_client = (http_client or HttpClient)(self.config, self.oauth)
+        self.events = EventDispatcher()
         
         # Lazy load resources
-        self._plans_resource: Optional[Plans] = None
-        self._countries_resource: Optional[Countries] = None
-        self._regions_resource: Optional[Regions] = None
-        self._orders_resource: Optional[Orders] = None
-        self._esims_resource: Optional[Esims] = None
-        self._balance_resource: Optional[Balance] = None
-        self._webhooks_resource: Optional[Webhooks] = None
-    
-    def plans(self) -> Plans:
+        self._plans_resource: Optional['Plans'] = None
+        self._countries_resource: Optional['Countries'] = None
+        self._regions_resource: Optional['Regions'] = None
+        self._orders_resource: Optional['Orders'] = None
+        self._esims_resource: Optional['Esims'] = None
+        self._balance_resource: Optional['Balance'] = None
+        self._webhooks_resource: Optional['Webhooks'] = None
+        self._state_store: Optional['StateStore'] = None
+        self._country_index: Optional['CountryIndex'] = None
+        self._catalog: Optional['CatalogSnapshotManager'] = None
+        self._balance_ledger: Optional['BalanceLedger'] = None
+        self._executor: Optional['ClientExecutor'] = None
+        self._lock = threading.RLock()
+    
+    def plans(self) -> 'Plans':
         """Get Plans resource"""
         if self._plans_resource is None:
-            self._plans_resource = Plans(self.http_client)
+            from .resources import Plans
+            with self._lock:
+                if self._plans_resource is None:
+                    self._plans_resource = Plans(self.http_client)
         return self._plans_resource
     
-    def countries(self) -> Countries:
+    def countries(self) -> 'Countries':
         """Get Countries resource"""
         if self._countries_resource is None:
-            self._countries_resource = Countries(self.http_client)
+            from .resources import Countries
+            with self._lock:
+                if self._countries_resource is None:
+                    self._countries_resource = Countries(self.http_client)
         return self._countries_resource
     
-    def regions(self) -> Regions:
+    def regions(self) -> 'Regions':
         """Get Regions resource"""
         if self._regions_resource is None:
-            self._regions_resource = Regions(self.http_client)
+            from .resources import Regions
+            with self._lock:
+                if self._regions_resource is None:
+                    self._regions_resource = Regions(self.http_client)
         return self._regions_resource
     
-    def orders(self) -> Orders:
+    def orders(self) -> 'Orders':
         """Get Orders resource"""
         if self._orders_resource is None:
-            self._orders_resource = Orders(self.http_client)
+            from .resources import Orders
+            with self._lock:
+                if self._orders_resource is None:
+                    self._orders_resource = Orders(self.http_client, self.events)
         return self._orders_resource
     
-    def esims(self) -> Esims:
+    def esims(self) -> 'Esims':
         """Get Esims resource"""
         if self._esims_resource is None:
-            self._esims_resource = Esims(self.http_client)
+            from .resources import Esims
+            with self._lock:
+                if self._esims_resource is None:
+                    self._esims_resource = Esims(self.http_client)
         return self._esims_resource
     
-    def balance(self) -> Balance:
+    def balance(self) -> 'Balance':
         """Get Balance resource"""
         if self._balance_resource is None:
-            self._balance_resource = Balance(self.http_client)
+            from .resources import Balance
+            with self._lock:
+                if self._balance_resource is None:
+                    self._balance_resource = Balance(self.http_client)
         return self._balance_resource
     
-    def webhooks(self) -> Webhooks:
+    def webhooks(self) -> 'Webhooks':
         """Get Webhooks resource"""
         if self._webhooks_resource is None:
-            self._webhooks_resource = Webhooks(self.http_client)
+            from .resources import Webhooks
+            with self._lock:
+                if self._webhooks_resource is None:
+                    self._webhooks_resource = Webhooks(self.http_client)
         return self._webhooks_resource
     
+    def state_store(self, max_age: Optional[float] = 300, seed: bool = False) -> 'StateStore':
+        """Get webhook-driven local eSIM and order state store"""
+        if self._state_store is None:
+            from .state import StateStore
+            created = None
+            with self._lock:
+                if self._state_store is None:
+                    created = StateStore(self.orders(), self.esims(), max_age)
+                    self.events.listen(created.apply_event)
+                    self._state_store = created
+            # Seed outside the client lock, paging the catalog must not block other accessors
+            if created is not None and seed:
+                created.seed()
+        return self._state_store
+    
+    def country_index(self, refresh_interval: Optional[float] = 86400) -> 'CountryIndex':
+        """Get offline country/region index, built on first use and refreshed in the background"""
+        if self._country_index is None:
+            from .country_index import CountryIndex
+            with self._lock:
+                if self._country_index is None:
+                    index = CountryIndex(self.countries(), self.regions(), refresh_interval)
+                    snapshot = self._catalog.snapshot if self._catalog is not None else None
+                    if snapshot is not None:
+                        index.build(snapshot.section('countries'), snapshot.section('regions').all())
+                    else:
+                        index.refresh()
+                        index.start()
+                    self._country_index = index
+        return self._country_index
+    
+    def balance_ledger(self, **options) -> 'BalanceLedger':
+        """Get local balance ledger for order admission, seeded and reconciled in the background"""
+        if self._balance_ledger is None:
+            from .ledger import BalanceLedger
+            with self._lock:
+                if self._balance_ledger is None:
+                    ledger = BalanceLedger(self.balance(), **options)
+                    ledger.refresh()
+                    ledger.start()
+                    self._balance_ledger = ledger
+        return self._balance_ledger
+    
+    def save_catalog_snapshot(self, path: str) -> 'CatalogSnapshot':
+        """Fetch plans, countries and regions and write them to a snapshot file"""
+        from .snapshot import CatalogSnapshot
+        from .models import Plan, Country
+        CatalogSnapshot.write(path, self._fetch_catalog(), {'sdk_version': self.VERSION})
+        return CatalogSnapshot(path, {'plans': Plan, 'countries': Country})
+    
+    def load_catalog_snapshot(self, path: str, max_age: float = 3600, revalidate: bool = True) -> 'CatalogSnapshot':
+        """
+        Load catalog snapshot for a warm start, fetching it when the file is missing or corrupt.
+        
+        A stale snapshot is served right away and refreshed in a background
+        thread; country_index() is then built from the snapshot.
+        """
+        with self._lock:
+            if self._catalog is None or self._catalog.path != path:
+                from .snapshot import CatalogSnapshotManager
+                from .models import Plan, Country
+                self._catalog = CatalogSnapshotManager(
+                    path,
+                    self._fetch_catalog,
+                    {'plans': Plan, 'countries': Country},
+                    max_age,
+                    {'sdk_version': self.VERSION},
+                )
+                self._catalog.on_refresh(self._apply_catalog)
+            catalog = self._catalog
+            catalog.max_age = max_age
+        return catalog.load(revalidate)
+    
+    def catalog_snapshot(self) -> Optional['CatalogSnapshot']:
+        """Get loaded catalog snapshot"""
+        return self._catalog.snapshot if self._catalog is not None else None
+    
+    def loader(self, concurrency: int = 8, batch_filter: Optional[str] = None) -> 'LoaderScope':
+        """Create a scope that batches and memoizes plan, eSIM and order lookups"""
+        from .loader import LoaderScope
+        return LoaderScope(self.plans(), self.esims(), self.orders(), concurrency, batch_filter)
+    
+    def usage_poller(self, **options) -> 'UsagePoller':
+        """Create adaptive usage polling scheduler for eSIMs"""
+        from .usage_poller import UsagePoller
+        return UsagePoller(self.esims().with_priority('low'), **options)
+    
+    def sync_engine(self, path: str, since_filters: Optional[Dict[str, str]] = None, **options) -> 'SyncEngine':
+        """
+        Create SQLite delta sync engine for orders and eSIMs.
+        
+        since_filters maps 'orders' and 'esims' to the listing filter taking
+        the high-water mark; resources without one are fully re-read.
+        """
+        from .sync import SyncEngine
+        from .models import Order, Esim
+        since_filters = since_filters or {}
+        engine = SyncEngine(path, **options)
+        engine.register('orders', self.orders().with_priority('low').all, 'id', Order, since_filters.get('orders'))
+        engine.register('esims', self.esims().with_priority('low').all, 'iccid', Esim, since_filters.get('esims'))
+        return engine
+    
+    def priority(self, name: str):
+        """Context manager running calls made in the block with priority ('high', 'normal', 'low')"""
+        return self.http_client.priority(name)
+    
+    def executor(self) -> 'ClientExecutor':
+        """Get thread pool for concurrent calls, sized to the connection pool"""
+        if self._executor is None:
+            from .executor import ClientExecutor
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ClientExecutor(self.config.get_max_connections())
+        return self._executor
+    
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> 'Future':
+        """Run fn(*args, **kwargs) on the client's thread pool, returns a Future"""
+        return self.executor().submit(fn, *args, **kwargs)
+    
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Call fn for every item on the client's thread pool, results in input order.
+        
+        concurrency caps calls in flight (at most max_connections). The
+        first exception is raised unless return_exceptions is set.
+        """
+        return self.executor().map(fn, items, concurrency, return_exceptions)
+    
+    def batch(self) -> 'Batch':
+        """
+        Context manager running calls made through it concurrently.
+        
+        with sdk.batch() as b: b.esims().find(iccid) returns a Future at
+        once; identical calls share one. All calls have finished when the
+        block exits, with errors kept on their futures.
+        """
+        from .batch import Batch
+        return Batch(self)
+    
+    def warmup(self, connections: Optional[int] = None, catalog: Any = False, timeout: Optional[float] = None) -> 'WarmupReport':
+        """
+        Fetch the access token and open pooled connections ahead of the first call.
+        
+        The token request runs alongside DNS resolution and the opening of
+        connections (default and at most max_connections) to every base
+        URL. catalog=True also builds the country index, a path loads a
+        catalog snapshot from it. Phases already warm are skipped, so the
+        call is cheap enough for readiness probes; failures are reported,
+        not raised.
+        """
+        import time
+        from .warmup import WarmupReport, open_connections, resolve
+        
+        limit = self.config.get_max_connections()
+        count = max(1, min(connections or limit, limit))
+        timeout = timeout if timeout is not None else self.config.get_connect_timeout()
+        report = WarmupReport()
+        started = time.perf_counter()
+        token = threading.Thread(target=report.run, args=('token', lambda: self.oauth.get_token((timeout, self.config.get_timeout()))), daemon=True)
+        token.start()
+        base_urls = self.config.get_base_urls()
+        report.run('dns', lambda: resolve(base_urls))
+        
+        def connect():
+            for base_url in base_urls:
+                ready, opened = open_connections(self.http_client, base_url, count, timeout)
+                report.connections += ready
+                report.opened += opened
+        
+        if 'dns' not in report.errors:
+            report.run('connections', connect)
+        token.join()
+        if catalog:
+            report.run('catalog', lambda: self.load_catalog_snapshot(catalog) if isinstance(catalog, str) else self.country_index())
+        report.timings['total'] = time.perf_counter() - started
+        return report
+    
+    async def warmup_async(self, connections: Optional[int] = None, catalog: Any = False, timeout: Optional[float] = None) -> 'WarmupReport':
+        """Warm up the client without blocking the event loop"""
+        import asyncio
+        
+        return await asyncio.wrap_future(self.submit(self.warmup, connections, catalog, timeout))
+    
+    def close(self):
+        """Stop background timers and threads, the thread pool and close pooled connections"""
+        if self._balance_ledger is not None:
+            self._balance_ledger.stop()
+        if self._country_index is not None:
+            self._country_index.stop()
+        if self._orders_resource is not None and self._orders_resource._waiter is not None:
+            self._orders_resource._waiter.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+        self.http_client.close()
+    
+    def handle_webhook(self, payload: Dict[str, Any]) -> WebhookEvent:
+        """Deliver a received webhook payload to in-process listeners"""
+        return self.events.dispatch(payload)
+    
+    def _fetch_catalog(self) -> Dict[str, Any]:
+        from .country_index import fetch_regions
+        return {
+            'plans': self.plans().all_plans(),
+            'countries': self.countries().all().all(),
+            'regions': fetch_regions(self.countries(), self.regions()),
+        }
+    
+    def _apply_catalog(self, snapshot: 'CatalogSnapshot'):
+        self.plans().set_catalog(snapshot.section('plans').all)
+        if self._country_index is not None:
+            self._country_index.build(snapshot.section('countries'), snapshot.section('regions').all())
+    
     def get_config(self) -> Config:
         """Get config instance"""
         return self.config
@@ -94,8 +364,62 @@ class TouristEsim:
         return cls.VERSION
 
 
+# Lazily imported public names (PEP 562)
+_LAZY_IMPORTS = {
+    'Plans': '.resources',
+    'Countries': '.resources',
+    'Regions': '.resources',
+    'Orders': '.resources',
+    'Esims': '.resources',
+    'Balance': '.resources',
+    'Webhooks': '.resources',
+    'Plan': '.models',
+    'Country': '.models',
+    'Order': '.models',
+    'Esim': '.models',
+    'BalanceTransaction': '.models',
+    'Collection': '.collections',
+    'PaginatedCollection': '.collections',
+    'StateStore': '.state',
+    'SyncEngine': '.sync',
+    'CountryIndex': '.country_index',
+    'LoaderScope': '.loader',
+    'UsagePoller': '.usage_poller',
+    'UsageHistory': '.usage_history',
+    'OrderWaiter': '.waiter',
+    'CatalogSnapshot': '.snapshot',
+    'Exporter': '.export',
+    'TouristEsimPool': '.pool',
+    'BalanceLedger': '.ledger',
+    'ItineraryOptimizer': '.itinerary',
+    'WarmupReport': '.warmup',
+    'Batch': '.batch',
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
+
+
 # Export public API
 __all__ = [
     'TouristEsim',
+    'TouristEsimPool',
     'Config',
+    'StateStore',
+    'SyncEngine',
+    'CountryIndex',
+    'LoaderScope',
+    'UsagePoller',
+    'CatalogSnapshot',
+    'WebhookEvent',
 ]
@@ -1,8 +1,8 @@
 """
 OAuth Token classes for TouristeSIM SDK
 """
+import threading
 import time
-from datetime import datetime
 
 
 class Token:
@@ -52,43 +52,48 @@ class Token:
 
 
 class TokenCache:
-    """In-memory token cache"""
+    """In-memory token cache, safe to share between threads"""
     
     def __init__(self, ttl: int = 3600):
         self.ttl = ttl
         self.cache = {}
         self.cache_time = {}
+        self._lock = threading.Lock()
     
     def get(self, key: str) -> Token:
-        if key in self.cache:
-            # Check if expired
-            cache_age = time.time() - self.cache_time.get(key, 0)
-            if cache_age < self.ttl:
-                token_data = self.cache[key]
-                token = Token.from_dict(token_data)
-                if not token.is_expired():
-                    return token
-            # Remove expired cache
-            del self.cache[key]
-            del self.cache_time[key]
-        return None
+        with self._lock:
+            if key in self.cache:
+                # Check if expired
+                cache_age = time.time() - self.cache_time.get(key, 0)
+                if cache_age < self.ttl:
+                    token_data = self.cache[key]
+                    token = Token.from_dict(token_data)
+                    if not token.is_expired():
+                        return token
+                # Remove expired cache
+                del self.cache[key]
+                del self.cache_time[key]
+            return None
     
     def store(self, key: str, token: Token):
-        self.cache[key] = token.to_dict()
-        self.cache_time[key] = time.time()
+        with self._lock:
+            self.cache[key] = token.to_dict()
+            self.cache_time[key] = time.time()
     
     def forget(self, key: str):
-        if key in self.cache:
-            del self.cache[key]
-            del self.cache_time[key]
+        with self._lock:
+            if key in self.cache:
+                del self.cache[key]
+                del self.cache_time[key]
     
     def flush(self):
-        self.cache.clear()
-        self.cache_time.clear()
+        self.clear()
     
     def has(self, key: str) -> bool:
-        return key in self.cache
+        with self._lock:
+            return key in self.cache
     
     def clear(self):
-        self.cache.clear()
-        self.cache_time.clear()
+        with self._lock:
+            self.cache.clear()
+            self.cache_time.clear()
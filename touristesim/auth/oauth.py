@@ -1,13 +1,16 @@
 """
 OAuth Client for TouristeSIM SDK
 """
-import requests
-from typing import Optional
+import threading
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 
 from .import Token, TokenCache
 from ..config import Config
 from ..exceptions import AuthenticationException
 
+if TYPE_CHECKING:
+    import requests
+
 
 class OAuthClient:
     """OAuth 2.0 Client for handling authentication"""
@@ -16,35 +19,63 @@ class OAuthClient:
         self.config = config
         self.token: Optional[Token] = None
         self.token_cache = TokenCache()
-        self.http_client = requests.Session()
+        self._http_client: Optional['requests.Session'] = None
+        self._http_client_lock = threading.Lock()
+        self._token_lock = threading.Lock()
+    
+    @property
+    def http_client(self) -> 'requests.Session':
+        """HTTP session for token requests, created on first use"""
+        if self._http_client is None:
+            with self._http_client_lock:
+                if self._http_client is None:
+                    import requests
+                    self._http_client = requests.Session()
+        return self._http_client
     
-    def get_token(self) -> str:
-        """Get valid access token"""
-        valid_token = self.get_valid_token()
+    @http_client.setter
+    def http_client(self, session: 'requests.Session'):
+        self._http_client = session
+    
+    def get_token(self, timeout: Optional[Union[float, Tuple[float, float]]] = None, base_url: Optional[str] = None) -> str:
+        """Get valid access token, requested from base_url when one is needed"""
+        valid_token = self.get_valid_token(timeout, base_url)
         return valid_token.get_access_token()
     
-    def get_valid_token(self) -> Token:
-        """Get valid token, refreshing if necessary"""
+    def get_valid_token(self, timeout: Optional[Union[float, Tuple[float, float]]] = None, base_url: Optional[str] = None) -> Token:
+        """Get valid token, refreshing if necessary (one refresh at a time across threads)"""
         # Check if we have a cached token that's still valid
-        if self.token and not self.token.is_expired():
-            return self.token
-        
-        # Try to get from file cache
-        cached_token = self.token_cache.get('oauth_token')
-        if cached_token and not cached_token.is_expired():
-            self.token = cached_token
-            return self.token
+        token = self.token
+        if token and not token.is_expired():
+            return token
         
-        # Request new token
-        self.token = self.request_token()
-        self.token_cache.store('oauth_token', self.token)
-        return self.token
+        with self._token_lock:
+            # Another thread may have refreshed while we waited
+            token = self.token
+            if token and not token.is_expired():
+                return token
+            
+            # Try to get from file cache
+            cached_token = self.token_cache.get('oauth_token')
+            if cached_token and not cached_token.is_expired():
+                self.token = cached_token
+                return cached_token
+            
+            # Request new token
+            token = self.request_token(timeout, base_url)
+            self.token_cache.store('oauth_token', token)
+            self.token = token
+            return token
     
-    def request_token(self) -> Token:
+    def request_token(self, timeout: Optional[Union[float, Tuple[float, float]]] = None, base_url: Optional[str] = None) -> Token:
         """Request new OAuth token"""
+        import requests
+        
+        if timeout is None:
+            timeout = (self.config.get_connect_timeout(), self.config.get_timeout())
         try:
             response = self.http_client.post(
-                self.config.get_oauth_token_url(),
+                self.config.get_oauth_token_url(base_url),
                 data={
                     'grant_type': 'client_credentials',
                     'client_id': self.config.get_client_id(),
@@ -55,7 +86,7 @@ class OAuthClient:
                     'User-Agent': self.config.get_user_agent(),
                     'Accept': 'application/json',
                 },
-                timeout=self.config.get_timeout(),
+                timeout=timeout,
                 verify=self.config.should_verify_ssl(),
             )
             
@@ -0,0 +1,113 @@
+"""
+Batched concurrent calls for TouristeSIM SDK
+"""
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from . import TouristEsim
+
+# Client accessors that can be called on a batch
+RESOURCES = ('plans', 'countries', 'regions', 'orders', 'esims', 'balance', 'webhooks')
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+class _BatchedResource:
+    """Resource whose method calls are submitted to a batch"""
+    
+    def __init__(self, batch: 'Batch', resource: Any):
+        self._batch = batch
+        self._resource = resource
+    
+    def __getattr__(self, name: str) -> Callable[..., 'Future']:
+        method = getattr(self._resource, name)
+        if not callable(method):
+            return method
+        
+        def submit(*args: Any, **kwargs: Any) -> 'Future':
+            return self._batch.call(method, *args, **kwargs)
+        
+        return submit
+
+
+class Batch:
+    """
+    Run calls across resources concurrently, collecting their futures.
+    
+    Calls start as soon as they are made, on the client's thread pool, so
+    they are limited to max_connections in flight. Identical calls (same
+    method and arguments) share one future. Leaving the block waits for
+    every call; errors stay on their futures instead of being raised.
+    """
+    
+    def __init__(self, client: 'TouristEsim'):
+        self.client = client
+        self._futures: Dict[Tuple[Any, ...], 'Future'] = {}
+        self._pending: List['Future'] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.deduplicated = 0
+    
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> 'Future':
+        """Submit fn(*args, **kwargs), or get the future of an identical call"""
+        try:
+            key: Optional[Tuple[Any, ...]] = (fn, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            # Unhashable arguments are never deduplicated
+            key = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Batch is closed')
+            if key is not None and key in self._futures:
+                self.deduplicated += 1
+                return self._futures[key]
+            future = self.client.submit(fn, *args, **kwargs)
+            if key is not None:
+                self._futures[key] = future
+            self._pending.append(future)
+        return future
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for submitted calls, returns whether all are done"""
+        from concurrent.futures import wait
+        
+        with self._lock:
+            pending = list(self._pending)
+        return not wait(pending, timeout).not_done
+    
+    def close(self, cancel: bool = False):
+        """Stop accepting calls and wait for the submitted ones, cancelling those not started when cancel is set"""
+        with self._lock:
+            self._closed = True
+            pending = list(self._pending)
+        if cancel:
+            for future in pending:
+                future.cancel()
+        self.wait()
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def __getattr__(self, name: str) -> Callable[[], _BatchedResource]:
+        if name not in RESOURCES:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        accessor = getattr(self.client, name)
+        return lambda: _BatchedResource(self, accessor())
+    
+    def __enter__(self) -> 'Batch':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Calls not yet started are dropped when the block failed
+        self.close(cancel=exc_type is not None)
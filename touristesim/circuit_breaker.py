@@ -0,0 +1,156 @@
+"""
+Per-endpoint circuit breakers for TouristeSIM SDK
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with closed, open and half-open states.
+    
+    Opens when the failure rate over the last window_size calls reaches
+    failure_rate_threshold (after at least minimum_calls). While open, calls
+    are rejected until open_duration has passed; then up to
+    half_open_max_calls trial calls decide whether to close or reopen.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        open_duration: float = 30,
+        half_open_max_calls: int = 1,
+        on_state_change: Optional[Callable[[str, str, str], Any]] = None,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._outcomes: deque = deque(maxlen=window_size)
+        self._trials = 0
+        self._trial_successes = 0
+        self._trial_started_at = 0.0
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Check whether a call may proceed"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.open_duration:
+                    self.rejected += 1
+                    return False
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._trials >= self.half_open_max_calls:
+                    if time.monotonic() - self._trial_started_at < self.open_duration:
+                        self.rejected += 1
+                        return False
+                    # Trials never reported back, start a new round
+                    self._trials = 0
+                    self._trial_successes = 0
+                self._trials += 1
+                self._trial_started_at = time.monotonic()
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_successes += 1
+                if self._trial_successes >= self.half_open_max_calls:
+                    self._transition(self.CLOSED)
+                return
+            self._outcomes.append(True)
+    
+    def record_failure(self):
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._transition(self.OPEN)
+                return
+            if self.state == self.OPEN:
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) >= self.minimum_calls and self.get_failure_rate() >= self.failure_rate_threshold:
+                self._transition(self.OPEN)
+    
+    def get_state(self) -> str:
+        return self.state
+    
+    def get_failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+    
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
+    
+    def reset(self):
+        with self._lock:
+            self._transition(self.CLOSED)
+    
+    def _transition(self, state: str):
+        previous = self.state
+        self.state = state
+        self._trials = 0
+        self._trial_successes = 0
+        if state == self.OPEN:
+            self.opened_at = time.monotonic()
+        elif state == self.CLOSED:
+            self._outcomes.clear()
+        if previous != state and self.on_state_change is not None:
+            self.on_state_change(self.name, previous, state)
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers per endpoint group (first path segment, e.g. '/plans')"""
+    
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = dict(options or {})
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._listeners: List[Callable[[str, str, str], Any]] = []
+        self._lock = threading.Lock()
+    
+    def for_endpoint(self, endpoint: str) -> CircuitBreaker:
+        """Get breaker for endpoint's group"""
+        group = self.group(endpoint)
+        breaker = self._breakers.get(group)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(group)
+                if breaker is None:
+                    breaker = CircuitBreaker(group, on_state_change=self._notify, **self.options)
+                    self._breakers[group] = breaker
+        return breaker
+    
+    def listen(self, callback: Callable[[str, str, str], Any]):
+        """Register listener called with (group, previous_state, new_state)"""
+        self._listeners.append(callback)
+        return callback
+    
+    def get_states(self) -> Dict[str, str]:
+        return {name: breaker.get_state() for name, breaker in self._breakers.items()}
+    
+    def reset(self):
+        for breaker in list(self._breakers.values()):
+            breaker.reset()
+    
+    @staticmethod
+    def group(endpoint: str) -> str:
+        return '/' + endpoint.lstrip('/').split('/', 1)[0].split('?', 1)[0]
+    
+    def _notify(self, name: str, previous: str, state: str):
+        for callback in list(self._listeners):
+            callback(name, previous, state)
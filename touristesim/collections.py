@@ -1,7 +1,7 @@
 """
 Collection classes for TouristeSIM SDK
 """
-from typing import List, Dict, Any, Optional, Callable, TypeVar
+from typing import List, Dict, Any, Optional, Callable, Iterator, TypeVar
 
 T = TypeVar('T')
 
@@ -150,3 +150,19 @@ class PaginatedCollection(Collection):
             'data': self.to_dict_list(),
             'pagination': self.pagination,
         }
+
+
+def iterate_pages(
+    fetch: Callable[[Dict[str, Any]], PaginatedCollection],
+    filters: Optional[Dict[str, Any]] = None,
+    per_page: int = 100,
+    start_page: int = 1,
+) -> Iterator[PaginatedCollection]:
+    """Yield pages from a paginated listing call until the last page"""
+    page = start_page
+    while True:
+        collection = fetch({**(filters or {}), 'page': page, 'per_page': per_page})
+        yield collection
+        if collection.is_empty() or not collection.has_more():
+            break
+        page += 1
@@ -0,0 +1,96 @@
+"""
+Response compression negotiation and request body compression for TouristeSIM SDK
+"""
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Preferred order, most compact first
+PREFERRED_ENCODINGS = ('zstd', 'br', 'gzip', 'deflate')
+
+
+def available_encodings() -> List[str]:
+    """Get content encodings the installed urllib3 can decode (br/zstd need brotli/zstandard)"""
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:
+        return ['gzip', 'deflate']
+    supported = {encoding.strip() for encoding in ACCEPT_ENCODING.split(',')}
+    return [encoding for encoding in PREFERRED_ENCODINGS if encoding in supported]
+
+
+def accept_encoding_header(option: Union[bool, str, List[str], None]) -> str:
+    """Build Accept-Encoding header value from the 'accept_encoding' option"""
+    if option is False or option is None:
+        return 'identity'
+    available = available_encodings()
+    if option is True:
+        return ', '.join(available)
+    wanted = [option] if isinstance(option, str) else list(option)
+    chosen = [encoding for encoding in wanted if encoding in available or encoding == 'identity']
+    return ', '.join(chosen) or 'identity'
+
+
+class TransferStats:
+    """Counters for bytes on the wire vs decoded bytes"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.compressed_requests = 0
+        self.bytes_sent = 0
+        self.body_bytes = 0
+        self.bytes_received = 0
+        self.decoded_bytes_received = 0
+        self._lock = threading.Lock()
+    
+    def record_request(self, body_bytes: int, wire_bytes: int, compressed: bool):
+        with self._lock:
+            self.requests += 1
+            self.body_bytes += body_bytes
+            self.bytes_sent += wire_bytes
+            if compressed:
+                self.compressed_requests += 1
+    
+    def record_response(self, response: Any):
+        decoded = len(response.content or b'')
+        wire = None
+        raw = getattr(response, 'raw', None)
+        if raw is not None and hasattr(raw, 'tell'):
+            try:
+                wire = raw.tell()
+            except (OSError, ValueError):
+                wire = None
+        if not wire:
+            length = response.headers.get('Content-Length')
+            wire = int(length) if length and length.isdigit() else decoded
+        with self._lock:
+            self.bytes_received += wire
+            self.decoded_bytes_received += decoded
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'compressed_requests': self.compressed_requests,
+            'bytes_sent': self.bytes_sent,
+            'body_bytes': self.body_bytes,
+            'bytes_received': self.bytes_received,
+            'decoded_bytes_received': self.decoded_bytes_received,
+            'receive_ratio': (
+                self.bytes_received / self.decoded_bytes_received if self.decoded_bytes_received else 1.0
+            ),
+        }
+
+
+def encode_body(data: Optional[Dict[str, Any]], threshold: Optional[int], level: int = 6) -> Tuple[Optional[bytes], Dict[str, str], int]:
+    """
+    Serialize JSON body, gzip it when larger than threshold bytes.
+    
+    Returns (body, extra headers, uncompressed size).
+    """
+    if data is None:
+        return None, {}, 0
+    body = json.dumps(data).encode('utf-8')
+    if threshold is not None and len(body) > threshold:
+        import gzip
+        return gzip.compress(body, compresslevel=level), {'Content-Encoding': 'gzip'}, len(body)
+    return body, {}, len(body)
@@ -1,7 +1,4 @@
-import os
-import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 class Config:
     """Configuration class for TouristeSIM Python SDK"""
@@ -11,13 +8,29 @@ class Config:
         self.client_secret = client_secret
         
         options = options or {}
-        self.base_url = options.get('base_url', 'https://api.touristesim.net/v1').rstrip('/')
+        base_url = options.get('base_url', 'https://api.touristesim.net/v1')
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        if not urls:
+            raise ValueError('base_url must not be empty')
+        self.base_urls = [url.rstrip('/') for url in urls]
+        self.base_url = self.base_urls[0]
         self.mode = options.get('mode', 'sandbox')
         self.timeout = options.get('timeout', 30)
         self.connect_timeout = options.get('connect_timeout', 10)
         self.verify_ssl = options.get('verify_ssl', True)
         self.user_agent = options.get('user_agent') or self._get_default_user_agent()
         self.max_retries = options.get('max_retries', 3)
+        self.coalesce_requests = options.get('coalesce_requests', False)
+        self.circuit_breaker = options.get('circuit_breaker', False)
+        self.order_waiter = options.get('order_waiter', {})
+        self.hedging = options.get('hedging', False)
+        self.deadline = options.get('deadline')
+        self.min_attempt_time = options.get('min_attempt_time', 0.05)
+        self.accept_encoding = options.get('accept_encoding', True)
+        self.compress_requests = options.get('compress_requests', False)
+        self.priority_scheduling = options.get('priority_scheduling', False)
+        self.endpoint_routing = options.get('endpoint_routing', True)
+        self.max_connections = options.get('max_connections', 10)
     
     def get_client_id(self) -> str:
         return self.client_id
@@ -26,8 +39,13 @@ class Config:
         return self.client_secret
     
     def get_base_url(self) -> str:
+        """Get primary base URL"""
         return self.base_url
     
+    def get_base_urls(self) -> List[str]:
+        """Get all equivalent base URLs, primary first"""
+        return self.base_urls
+    
     def get_mode(self) -> str:
         return self.mode
     
@@ -46,14 +64,69 @@ class Config:
     def get_connect_timeout(self) -> int:
         return self.connect_timeout
     
+    def get_deadline(self) -> Optional[float]:
+        """Get default overall time budget per call in seconds, None when unbounded"""
+        return self.deadline
+    
+    def get_min_attempt_time(self) -> float:
+        return self.min_attempt_time
+    
     def get_user_agent(self) -> str:
         return self.user_agent
     
     def get_max_retries(self) -> int:
         return self.max_retries
     
-    def get_oauth_token_url(self) -> str:
-        return f"{self.base_url}/../oauth/token"
+    def get_max_connections(self) -> int:
+        """Get connections kept open per host, also the size of the client's thread pool"""
+        return self.max_connections
+    
+    def should_coalesce_requests(self) -> bool:
+        return self.coalesce_requests
+    
+    def get_circuit_breaker_options(self) -> Optional[Dict[str, Any]]:
+        """Get circuit breaker settings, None when disabled"""
+        if not self.circuit_breaker:
+            return None
+        return self.circuit_breaker if isinstance(self.circuit_breaker, dict) else {}
+    
+    def get_order_waiter_options(self) -> Dict[str, Any]:
+        """Get order waiter settings (concurrency, batch_filter, polling intervals)"""
+        return self.order_waiter
+    
+    def get_hedging_options(self) -> Optional[Dict[str, Any]]:
+        """Get hedged request settings, None when disabled"""
+        if not self.hedging:
+            return None
+        return self.hedging if isinstance(self.hedging, dict) else {}
+    
+    def get_priority_scheduling_options(self) -> Optional[Dict[str, Any]]:
+        """Get priority scheduler settings, None when disabled"""
+        if not self.priority_scheduling:
+            return None
+        return self.priority_scheduling if isinstance(self.priority_scheduling, dict) else {}
+    
+    def get_endpoint_routing_options(self) -> Optional[Dict[str, Any]]:
+        """Get endpoint router settings, None with a single base URL or when disabled"""
+        if len(self.base_urls) < 2 or not self.endpoint_routing:
+            return None
+        return self.endpoint_routing if isinstance(self.endpoint_routing, dict) else {}
+    
+    def get_accept_encoding(self):
+        """Get response encodings to negotiate: True for all supported, a list, or False"""
+        return self.accept_encoding
+    
+    def get_request_compression_threshold(self) -> Optional[int]:
+        """Get body size in bytes above which request bodies are gzipped, None when disabled"""
+        if self.compress_requests is False or self.compress_requests is None:
+            return None
+        if self.compress_requests is True:
+            return 1024
+        return int(self.compress_requests)
+    
+    def get_oauth_token_url(self, base_url: Optional[str] = None) -> str:
+        """Get token URL for base_url (defaults to the primary base URL)"""
+        return f"{base_url or self.base_url}/../oauth/token"
     
     def _get_default_user_agent(self) -> str:
         import sys
@@ -0,0 +1,201 @@
+"""
+Offline country and region index for TouristeSIM SDK
+"""
+import bisect
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .models import Country
+from .exceptions import ApiException
+from .resources import Countries, Regions
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents for matching"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower().strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def fetch_regions(countries: Countries, regions: Regions) -> List[Dict[str, Any]]:
+    """Get all regions, with member countries fetched for regions that do not list them"""
+    fetched = []
+    for region in regions.all():
+        slug = region.get('slug') or region.get('code')
+        if slug and region.get('countries') is None:
+            region = dict(region, countries=[country.get_code() for country in countries.by_region(slug)])
+        fetched.append(region)
+    return fetched
+
+
+class CountryIndex:
+    """
+    Locally cached country/region index.
+    
+    Built from Countries.all() and Regions.all(); lookups by ISO code are
+    dictionary lookups, name search uses a sorted prefix table with a
+    trigram fallback for typos. Network is only used by refresh().
+    """
+    
+    def __init__(self, countries: Countries, regions: Regions, refresh_interval: Optional[float] = 86400):
+        self.countries = countries
+        self.regions = regions
+        self.refresh_interval = refresh_interval
+        self._by_code: Dict[str, Country] = {}
+        self._terms: List[Tuple[str, str]] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._regions: Dict[str, Dict[str, Any]] = {}
+        self._members: Dict[str, FrozenSet[str]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.built_at: Optional[float] = None
+    
+    def refresh(self) -> 'CountryIndex':
+        """Rebuild index from the API"""
+        countries = self.countries.all().all()
+        regions = fetch_regions(self.countries, self.regions)
+        self.build(countries, regions)
+        return self
+    
+    def build(self, countries: List[Any], regions: List[Dict[str, Any]]) -> 'CountryIndex':
+        """Build index from country and region data, regions without a countries list have no members"""
+        by_code: Dict[str, Country] = {}
+        terms: List[Tuple[str, str]] = []
+        grams: Dict[str, Set[str]] = {}
+        for country in countries:
+            if not isinstance(country, Country):
+                country = Country(country)
+            code = country.get_code().upper()
+            if not code:
+                continue
+            by_code[code] = country
+            for name in self._names(country):
+                term = normalize(name)
+                terms.append((term, code))
+                for gram in trigrams(term):
+                    grams.setdefault(gram, set()).add(code)
+        terms.sort()
+        
+        region_map: Dict[str, Dict[str, Any]] = {}
+        members: Dict[str, FrozenSet[str]] = {}
+        for region in regions:
+            slug = region.get('slug') or region.get('code')
+            if not slug:
+                continue
+            region_map[slug] = region
+            codes = region.get('countries') or []
+            members[slug] = frozenset(
+                code.upper() for code in (self._code(item) for item in codes) if code
+            )
+        
+        with self._lock:
+            self._by_code = by_code
+            self._terms = terms
+            self._trigrams = grams
+            self._regions = region_map
+            self._members = members
+            self.built_at = time.time()
+        return self
+    
+    def get(self, code: str) -> Optional[Country]:
+        """Get country by ISO code"""
+        return self._by_code.get(code.upper())
+    
+    def search(self, query: str, limit: int = 10) -> List[Country]:
+        """Search countries by name, alias or code prefix, falling back to trigram similarity"""
+        term = normalize(query)
+        if not term:
+            return []
+        found: List[str] = []
+        exact = self._by_code.get(term.upper())
+        if exact is not None:
+            found.append(term.upper())
+        terms = self._terms
+        position = bisect.bisect_left(terms, (term, ''))
+        while position < len(terms) and len(found) < limit and terms[position][0].startswith(term):
+            if terms[position][1] not in found:
+                found.append(terms[position][1])
+            position += 1
+        if len(found) < limit and len(term) >= 3:
+            query_grams = trigrams(term)
+            scores: Dict[str, int] = {}
+            for gram in query_grams:
+                for code in self._trigrams.get(gram, ()):
+                    scores[code] = scores.get(code, 0) + 1
+            threshold = max(2, len(query_grams) // 2)
+            ranked = sorted((code for code, score in scores.items() if score >= threshold),
+                            key=lambda code: -scores[code])
+            for code in ranked:
+                if len(found) >= limit:
+                    break
+                if code not in found:
+                    found.append(code)
+        return [self._by_code[code] for code in found]
+    
+    def region(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Get region data"""
+        return self._regions.get(slug)
+    
+    def region_countries(self, slug: str) -> FrozenSet[str]:
+        """Get ISO codes of countries in region"""
+        return self._members.get(slug, frozenset())
+    
+    def regions_for(self, code: str) -> List[str]:
+        """Get slugs of regions containing country"""
+        code = code.upper()
+        return [slug for slug, codes in self._members.items() if code in codes]
+    
+    def in_region(self, code: str, slug: str) -> bool:
+        return code.upper() in self._members.get(slug, frozenset())
+    
+    def count(self) -> int:
+        return len(self._by_code)
+    
+    def is_built(self) -> bool:
+        return self.built_at is not None
+    
+    def start(self):
+        """Refresh periodically in a background thread"""
+        if self.refresh_interval is None:
+            return
+        self.stop()
+        self._timer = threading.Timer(self.refresh_interval, self._scheduled_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def _scheduled_refresh(self):
+        try:
+            self.refresh()
+        except ApiException:
+            # Keep serving the previous index until the next attempt
+            pass
+        finally:
+            # A stop() while this ran cleared the timer, stay stopped
+            if self._timer is threading.current_thread():
+                self.start()
+    
+    @staticmethod
+    def _code(item: Any) -> str:
+        return item.get('code', '') if hasattr(item, 'get') else str(item)
+    
+    @staticmethod
+    def _names(country: Country) -> List[str]:
+        names = [country.get_name(), country.get_code()]
+        for key in ('iso3', 'native_name', 'official_name'):
+            if country.get(key):
+                names.append(country.get(key))
+        aliases = country.get('aliases') or []
+        if isinstance(aliases, list):
+            names.extend(alias for alias in aliases if alias)
+        return [name for name in names if name]
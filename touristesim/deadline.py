@@ -0,0 +1,43 @@
+"""
+End-to-end request deadlines for TouristeSIM SDK
+"""
+import time
+from typing import Optional, Tuple
+
+from .exceptions import TimeoutException
+
+
+class Deadline:
+    """Overall time budget for a call, covering retries, backoff and token refresh"""
+    
+    def __init__(self, seconds: Optional[float] = None, min_attempt_time: float = 0.05):
+        self.seconds = seconds
+        self.min_attempt_time = min_attempt_time
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+    
+    def remaining(self) -> Optional[float]:
+        """Get remaining seconds, None when unbounded"""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def is_expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining < self.min_attempt_time
+    
+    def check(self):
+        """Raise when the remaining budget cannot fit another attempt"""
+        if self.is_expired():
+            raise TimeoutException.deadline_exceeded(self.seconds)
+    
+    def can_wait(self, delay: float) -> bool:
+        """Check whether sleeping delay seconds still leaves room for an attempt"""
+        remaining = self.remaining()
+        return remaining is None or remaining - delay >= self.min_attempt_time
+    
+    def timeout(self, connect_timeout: float, read_timeout: float) -> Tuple[float, float]:
+        """Get (connect, read) timeouts for the next attempt, clamped to the remaining budget"""
+        remaining = self.remaining()
+        if remaining is None:
+            return connect_timeout, read_timeout
+        return min(connect_timeout, remaining), min(read_timeout, remaining)
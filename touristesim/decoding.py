@@ -0,0 +1,294 @@
+"""
+Multi-process decoding of listing pages for TouristeSIM SDK
+"""
+import csv
+import io
+import json
+import marshal
+import os
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from .collections import PaginatedCollection
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ProcessPoolExecutor
+    from multiprocessing.shared_memory import SharedMemory
+    from .models import Model
+
+# Worker output formats
+OUTPUTS = ('records', 'ndjson', 'csv', 'arrow')
+
+# Stands in for absent keys in records, so sparse rows keep their exact keys
+_ABSENT = ...
+
+
+def _share(payload: bytes) -> 'SharedMemory':
+    from multiprocessing.shared_memory import SharedMemory
+    block = SharedMemory(create=True, size=max(1, len(payload)))
+    block.buf[:len(payload)] = payload
+    return block
+
+
+def _take(name: str, size: int, unlink: bool) -> bytes:
+    from multiprocessing.shared_memory import SharedMemory
+    block = SharedMemory(name=name)
+    try:
+        return bytes(block.buf[:size])
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'), default=str)
+    return value
+
+
+def _encode_records(items: List[Dict[str, Any]], columns: List[str]) -> bytes:
+    rows = [tuple(item.get(column, _ABSENT) for column in columns) for item in items]
+    sparse = [index for index, item in enumerate(items) if len(item) != len(columns)]
+    return marshal.dumps((columns, rows, sparse))
+
+
+def _encode_ndjson(items: List[Dict[str, Any]], columns: Optional[List[str]]) -> bytes:
+    if columns is not None:
+        items = [{column: item.get(column) for column in columns} for item in items]
+    return ''.join(json.dumps(item, separators=(',', ':'), default=str) + '\n' for item in items).encode('utf-8')
+
+
+def _encode_csv(items: List[Dict[str, Any]], columns: List[str]) -> bytes:
+    buffer = io.StringIO(newline='')
+    writer = csv.DictWriter(buffer, columns, extrasaction='ignore')
+    writer.writerows([{key: _cell(value) for key, value in item.items()} for item in items])
+    return buffer.getvalue().encode('utf-8')
+
+
+def _encode_arrow(items: List[Dict[str, Any]], columns: List[str]) -> bytes:
+    import pyarrow
+    table = pyarrow.Table.from_pydict({column: [_cell(item.get(column)) for item in items] for column in columns})
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _decode(
+    name: str,
+    size: int,
+    list_key: str,
+    model: Optional[Type['Model']],
+    output: str,
+    columns: Optional[List[str]],
+) -> Tuple[str, int, int, Dict[str, Any], Optional[List[str]], List[str]]:
+    """Worker: decode a raw page from shared memory, returns (name, size, count, pagination, columns, dropped fields) of the result"""
+    response = json.loads(_take(name, size, unlink=False))
+    data = response.get('data', {}) if isinstance(response, dict) else {}
+    items = data.get(list_key, []) if isinstance(data, dict) else []
+    if model is not None:
+        items = [model(item).attributes for item in items]
+    dropped: List[str] = []
+    if output == 'records':
+        if columns is None:
+            # Union of keys in first-seen order
+            columns = list(dict.fromkeys(key for item in items for key in item))
+        payload = _encode_records(items, columns)
+    elif output == 'ndjson':
+        payload = _encode_ndjson(items, columns)
+    else:
+        if columns is None:
+            columns = list(dict.fromkeys(key for item in items for key in item)) if items else None
+        else:
+            known = set(columns)
+            dropped = list(dict.fromkeys(key for item in items for key in item if key not in known))
+        if output == 'csv':
+            payload = _encode_csv(items, columns or [])
+        else:
+            payload = _encode_arrow(items, columns or [])
+    block = _share(payload)
+    result_name = block.name
+    block.close()
+    return result_name, len(payload), len(items), data.get('pagination', {}), columns, dropped
+
+
+class DecodedPage:
+    """Page decoded by a worker: records or output bytes plus pagination"""
+    
+    def __init__(
+        self,
+        payload: bytes,
+        output: str,
+        count: int,
+        pagination: Dict[str, Any],
+        columns: Optional[List[str]],
+        dropped: Optional[List[str]] = None,
+    ):
+        self.payload = payload
+        self.output = output
+        self.count = count
+        self.pagination = pagination
+        self.columns = columns
+        # Fields of the page's records that are not among columns
+        self.dropped = dropped or []
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def get_current_page(self) -> int:
+        return self.pagination.get('current_page', 1)
+    
+    def records(self) -> List[Dict[str, Any]]:
+        """Get records (only for 'records' output)"""
+        columns, rows, sparse = marshal.loads(self.payload)
+        records = [dict(zip(columns, row)) for row in rows]
+        for index in sparse:
+            records[index] = {key: value for key, value in records[index].items() if value is not _ABSENT}
+        return records
+    
+    def to_collection(self, model: Optional[Type['Model']] = None) -> PaginatedCollection:
+        """Get page as models (attributes were already cast by the worker)"""
+        records = self.records()
+        items = [model.from_attributes(record) for record in records] if model is not None else records
+        return PaginatedCollection(items, self.pagination)
+
+
+class PageDecoder:
+    """
+    Decode raw listing pages in a process pool.
+    
+    Response bytes go to a worker through shared memory. The worker
+    parses the JSON, applies the model's casts, and writes back either
+    compact records (column names plus marshalled value tuples) or
+    ready-to-write NDJSON, CSV or Arrow IPC bytes, again through shared
+    memory. The calling process only fetches pages and copies bytes, so
+    decoding runs on as many cores as there are workers.
+    """
+    
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional['ProcessPoolExecutor'] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def pool(self) -> 'ProcessPoolExecutor':
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    # Forking a process that runs threads is unsafe, workers start from a clean interpreter
+                    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                    self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context(method))
+        return self._pool
+    
+    def decode_pages(
+        self,
+        fetch: Callable[[int], bytes],
+        list_key: str,
+        model: Optional[Type['Model']] = None,
+        output: str = 'records',
+        columns: Optional[List[str]] = None,
+        start_page: int = 1,
+        window: Optional[int] = None,
+    ) -> Iterator[DecodedPage]:
+        """
+        Fetch pages from start_page with fetch(page) and yield them decoded, in order.
+        
+        The first page is decoded before the rest are fetched: it fixes the
+        columns and tells how many pages there are. Up to window pages
+        (default twice the workers) are decoded at once.
+        """
+        if output not in OUTPUTS:
+            raise ValueError(f"Unsupported output '{output}', expected one of {', '.join(OUTPUTS)}")
+        window = window or 2 * self.workers
+        first = self._collect(self._submit(fetch(start_page), list_key, model, output, columns), output)
+        yield first
+        if first.count == 0 or not PaginatedCollection([], first.pagination).has_more():
+            return
+        if output != 'records' and columns is None:
+            columns = first.columns
+        last_page = first.pagination.get('last_page')
+        pending: Deque[Tuple['Future', 'SharedMemory']] = deque()
+        page = start_page + 1
+        try:
+            if last_page is None:
+                # Unknown page count: stop as soon as a page says it is the last one
+                while True:
+                    decoded = self._collect(self._submit(fetch(page), list_key, model, output, columns), output)
+                    yield decoded
+                    if decoded.count == 0 or not PaginatedCollection([], decoded.pagination).has_more():
+                        return
+                    page += 1
+            while page <= last_page or pending:
+                while page <= last_page and len(pending) < window:
+                    pending.append(self._submit(fetch(page), list_key, model, output, columns))
+                    page += 1
+                yield self._collect(pending.popleft(), output)
+        finally:
+            for entry in pending:
+                self._discard(entry)
+    
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+    
+    def __enter__(self) -> 'PageDecoder':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _submit(self, raw: bytes, list_key: str, model, output: str, columns) -> Tuple['Future', 'SharedMemory']:
+        block = _share(raw)
+        try:
+            future = self.pool.submit(_decode, block.name, len(raw), list_key, model, output, columns)
+        except BaseException:
+            self._release(block)
+            raise
+        return future, block
+    
+    def _collect(self, entry: Tuple['Future', 'SharedMemory'], output: str) -> DecodedPage:
+        future, block = entry
+        try:
+            name, size, count, pagination, columns, dropped = future.result()
+        finally:
+            self._release(block)
+        return DecodedPage(_take(name, size, unlink=True), output, count, pagination, columns, dropped)
+    
+    def _discard(self, entry: Tuple['Future', 'SharedMemory']):
+        future, block = entry
+        if not future.cancel():
+            try:
+                name, size = future.result()[:2]
+                _take(name, 0, unlink=True)
+            except Exception:
+                pass
+        self._release(block)
+    
+    @staticmethod
+    def _release(block: 'SharedMemory'):
+        block.close()
+        block.unlink()
+
+
+def decoded_pages(
+    workers: Union[int, PageDecoder],
+    fetch: Callable[[int], bytes],
+    list_key: str,
+    model: Optional[Type['Model']] = None,
+    output: str = 'records',
+    columns: Optional[List[str]] = None,
+    start_page: int = 1,
+) -> Iterator[DecodedPage]:
+    """Decode pages with a PageDecoder, or a temporary one with workers processes"""
+    decoder = workers if isinstance(workers, PageDecoder) else PageDecoder(workers)
+    try:
+        yield from decoder.decode_pages(fetch, list_key, model, output, columns, start_page)
+    finally:
+        if decoder is not workers:
+            decoder.close()
@@ -0,0 +1,65 @@
+"""
+Webhook event dispatching for TouristeSIM SDK
+"""
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class WebhookEvent:
+    """Webhook event delivered to the process"""
+    
+    def __init__(self, payload: Dict[str, Any]):
+        self.payload = payload or {}
+        self.type = self.payload.get('event') or self.payload.get('type') or ''
+        self.data = self.payload.get('data') or {}
+    
+    def get_type(self) -> str:
+        return self.type
+    
+    def get_resource(self) -> str:
+        """Get resource part of the event type, e.g. 'order' for 'order.completed'"""
+        return self.type.split('.', 1)[0]
+    
+    def get_data(self) -> Dict[str, Any]:
+        return self.data
+    
+    def get_payload(self) -> Dict[str, Any]:
+        return self.payload
+    
+    def is_order_event(self) -> bool:
+        return self.get_resource() == 'order'
+    
+    def is_esim_event(self) -> bool:
+        return self.get_resource() == 'esim'
+
+
+class EventDispatcher:
+    """Fan out incoming webhook events to in-process listeners"""
+    
+    def __init__(self):
+        self._listeners: List[Tuple[Optional[str], Callable[[WebhookEvent], Any]]] = []
+        self._lock = threading.Lock()
+    
+    def listen(self, callback: Callable[[WebhookEvent], Any], prefix: Optional[str] = None) -> Callable:
+        """Register listener, optionally only for event types starting with prefix"""
+        with self._lock:
+            self._listeners.append((prefix, callback))
+        return callback
+    
+    def forget(self, callback: Callable[[WebhookEvent], Any]):
+        """Remove listener"""
+        with self._lock:
+            self._listeners = [item for item in self._listeners if item[1] is not callback]
+    
+    def dispatch(self, payload: Dict[str, Any]) -> WebhookEvent:
+        """Deliver webhook payload to all matching listeners"""
+        event = payload if isinstance(payload, WebhookEvent) else WebhookEvent(payload)
+        with self._lock:
+            listeners = list(self._listeners)
+        for prefix, callback in listeners:
+            if prefix is None or event.get_type().startswith(prefix):
+                callback(event)
+        return event
+    
+    def count(self) -> int:
+        return len(self._listeners)
@@ -42,6 +42,14 @@ class AuthenticationException(ApiException):
 class ValidationException(ApiException):
     """Validation Exception - 422 Unprocessable Entity"""
     
+    @staticmethod
+    def insufficient_balance(required: float, available: float):
+        return ValidationException(
+            f'Insufficient balance: {required} required, {available} available',
+            422,
+            {'balance': [f'Insufficient balance: {required} required, {available} available']},
+        )
+    
     def __init__(self, message: str = 'Validation failed', status_code: int = 422, errors: dict = None):
         super().__init__(message, status_code)
         self.errors = errors or {}
@@ -93,6 +101,10 @@ class ServerException(ApiException):
     def maintenance(message: str = 'Server is under maintenance'):
         return ServerException(message, 503)
     
+    @staticmethod
+    def circuit_open(group: str):
+        return ServerException(f'Circuit breaker for {group} is open, request not sent', 503)
+    
     def __init__(self, message: str = 'Server error', status_code: int = 500):
         super().__init__(message, status_code)
 
@@ -110,3 +122,15 @@ class ConnectionException(ApiException):
     
     def __init__(self, message: str = 'Connection error', status_code: int = 0):
         super().__init__(message, status_code)
+
+
+class TimeoutException(ConnectionException):
+    """Timeout Exception - operation did not finish in the allotted time"""
+    
+    @staticmethod
+    def order(order_id, timeout: float):
+        return TimeoutException(f'Order with ID {order_id} did not complete within {timeout}s')
+    
+    @staticmethod
+    def deadline_exceeded(deadline: float):
+        return TimeoutException(f'Request deadline of {deadline}s exceeded')
@@ -0,0 +1,102 @@
+"""
+Managed thread pool for concurrent SDK calls
+"""
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+
+class ClientExecutor:
+    """
+    Thread pool sized to the client's connection pool.
+    
+    Tasks run with a copy of the submitting context, so priority() blocks
+    apply to work submitted inside them. Calls made from a task (nested
+    submit() or map() on the same client) run inline in that task instead
+    of waiting for a free worker, so they cannot deadlock the pool.
+    """
+    
+    def __init__(self, max_workers: int = 10):
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Marks threads running one of this pool's tasks
+        self._worker = threading.local()
+    
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='touristesim')
+        return self._executor
+    
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Run fn(*args, **kwargs) on the pool, returns its Future"""
+        if getattr(self._worker, 'active', False):
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+        context = contextvars.copy_context()
+        return self.executor.submit(context.run, self._run, fn, args, kwargs)
+    
+    def map(
+        self,
+        fn: Callable[[Any], Any],
+        items: Iterable[Any],
+        concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Call fn for every item with at most concurrency calls in flight.
+        
+        Returns results in input order. The first exception is raised and
+        no further items are started, unless return_exceptions is set, in
+        which case exceptions are returned in place of results.
+        """
+        limit = max(1, min(concurrency or self.max_workers, self.max_workers))
+        slots = threading.Semaphore(limit)
+        failed = threading.Event()
+        futures: List[Future] = []
+        
+        def done(future: Future):
+            if future.exception() is not None:
+                failed.set()
+            slots.release()
+        
+        for item in items:
+            slots.acquire()
+            if failed.is_set() and not return_exceptions:
+                slots.release()
+                break
+            future = self.submit(fn, item)
+            future.add_done_callback(done)
+            futures.append(future)
+        
+        results = []
+        for future in futures:
+            error = future.exception()
+            if error is None:
+                results.append(future.result())
+            elif return_exceptions:
+                results.append(error)
+            else:
+                raise error
+        return results
+    
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait)
+                self._executor = None
+    
+    def _run(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        self._worker.active = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self._worker.active = False
@@ -0,0 +1,359 @@
+"""
+Streaming export of paginated listings for TouristeSIM SDK
+"""
+import csv
+import json
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .collections import PaginatedCollection, iterate_pages
+
+if TYPE_CHECKING:
+    from .decoding import PageDecoder
+
+FORMATS = ('ndjson', 'csv', 'parquet')
+
+
+class ExportResult:
+    """Summary of an export run"""
+    
+    def __init__(self, path: str, format: str, start_page: int):
+        self.path = path
+        self.format = format
+        self.start_page = start_page
+        self.last_page: Optional[int] = None
+        self.pages = 0
+        self.records = 0
+        self.completed = False
+        # Fields left out because they first appeared after the columns were fixed
+        self.dropped_fields: List[str] = []
+    
+    def get_next_page(self) -> int:
+        """Get page to pass as start_page to resume an interrupted export"""
+        return self.start_page if self.last_page is None else self.last_page + 1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'format': self.format,
+            'start_page': self.start_page,
+            'last_page': self.last_page,
+            'pages': self.pages,
+            'records': self.records,
+            'completed': self.completed,
+            'dropped_fields': list(self.dropped_fields),
+        }
+
+
+class _NdjsonWriter:
+    
+    def __init__(self, path: str, columns: Optional[List[str]], append: bool):
+        self.columns = columns
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+    
+    def write(self, rows: List[Dict[str, Any]]):
+        self._file.write(''.join(json.dumps(row, separators=(',', ':'), default=str) + '\n' for row in rows))
+        self._file.flush()
+    
+    def write_encoded(self, payload: bytes, columns: Optional[List[str]]):
+        self._file.write(payload.decode('utf-8'))
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter:
+    
+    def __init__(self, path: str, columns: Optional[List[str]], append: bool):
+        self.columns = columns
+        self._append = append
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8', newline='')
+        self._writer: Optional[csv.DictWriter] = None
+    
+    def write(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        self._start(list(rows[0]))
+        self._writer.writerows([
+            {key: self._cell(value) for key, value in row.items()} for row in rows
+        ])
+        self._file.flush()
+    
+    def write_encoded(self, payload: bytes, columns: Optional[List[str]]):
+        if not payload:
+            return
+        self._start(columns or [])
+        self._file.write(payload.decode('utf-8'))
+        self._file.flush()
+    
+    def _start(self, first_columns: List[str]):
+        if self._writer is None:
+            # Without a projection, the first row fixes the columns
+            self.columns = self.columns or first_columns
+            self._writer = csv.DictWriter(self._file, self.columns, extrasaction='ignore')
+            if not self._append or self._file.tell() == 0:
+                self._writer.writeheader()
+    
+    def close(self):
+        self._file.close()
+    
+    @staticmethod
+    def header(path: str) -> Optional[List[str]]:
+        """Get the columns of an existing CSV file, None when it is missing or empty"""
+        try:
+            with open(path, encoding='utf-8', newline='') as existing:
+                return next(csv.reader(existing), None)
+        except FileNotFoundError:
+            return None
+    
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, separators=(',', ':'), default=str)
+        return value
+
+
+class _ParquetWriter:
+    
+    # Rows per row group, pages are buffered up to this size
+    row_group_size = 10000
+    
+    def __init__(self, path: str, columns: Optional[List[str]], append: bool):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow: pip install 'touristesim_python_sdk[parquet]'")
+        if append:
+            raise ValueError('Parquet files cannot be appended to, resume into a new file instead')
+        self._pyarrow = pyarrow
+        self._parquet = pyarrow.parquet
+        self.path = path
+        self.columns = columns
+        self._writer = None
+        self._pending: List[Dict[str, Any]] = []
+        self._tables: List[Any] = []
+        self._table_rows = 0
+    
+    def write(self, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+        if self.columns is None:
+            self.columns = list(rows[0])
+        self._pending.extend(rows)
+        if len(self._pending) >= self.row_group_size:
+            self._flush()
+    
+    def write_encoded(self, payload: bytes, columns: Optional[List[str]]):
+        """Write Arrow IPC stream bytes produced by a decoding worker"""
+        table = self._pyarrow.ipc.open_stream(payload).read_all()
+        if table.num_rows == 0:
+            return
+        if self.columns is None:
+            self.columns = table.column_names
+        self._tables.append(table)
+        self._table_rows += table.num_rows
+        if self._table_rows >= self.row_group_size:
+            self._flush()
+    
+    def close(self):
+        try:
+            self._flush()
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+    
+    def _flush(self):
+        if self._tables:
+            self._write_tables()
+        if not self._pending:
+            return
+        # Nested values are stored as JSON text so every row group has the same schema
+        table = self._pyarrow.Table.from_pydict({
+            column: [self._cell(row.get(column)) for row in self._pending] for column in self.columns
+        })
+        table = self._conform(table)
+        self._writer.write_table(table)
+        self._pending = []
+    
+    def _write_tables(self):
+        tables = [self._conform(table) for table in self._tables]
+        self._writer.write_table(self._pyarrow.concat_tables(tables))
+        self._tables = []
+        self._table_rows = 0
+    
+    def _open(self, schema):
+        # A column that is all null so far would be typed null for the whole
+        # file, store it as text so later values still fit
+        string = self._pyarrow.string()
+        fields = [field.with_type(string) if self._pyarrow.types.is_null(field.type) else field for field in schema]
+        return self._parquet.ParquetWriter(self.path, self._pyarrow.schema(fields))
+    
+    def _conform(self, table):
+        """Cast table to the file's schema, pages can infer different types"""
+        if self._writer is None:
+            self._writer = self._open(table.schema)
+        schema = self._writer.schema
+        return table if table.schema.equals(schema) else table.select(schema.names).cast(schema)
+    
+    @staticmethod
+    def _cell(value: Any) -> Any:
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, separators=(',', ':'), default=str)
+        return value
+
+
+_WRITERS = {
+    'ndjson': _NdjsonWriter,
+    'csv': _CsvWriter,
+    'parquet': _ParquetWriter,
+}
+
+_DONE = object()
+
+
+class Exporter:
+    """
+    Stream a paginated listing to an NDJSON, CSV or Parquet file.
+    
+    Pages are written as they arrive and then dropped, so memory stays at
+    a few pages regardless of history size. The next page is fetched
+    in a background thread while the current one is written. Pass
+    start_page (e.g. result.get_next_page()) to resume an interrupted
+    NDJSON or CSV export by appending to the same file.
+    """
+    
+    def __init__(
+        self,
+        fetch: Callable[[Dict[str, Any]], PaginatedCollection],
+        filters: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        raw_fetch: Optional[Callable[[Dict[str, Any]], bytes]] = None,
+        list_key: Optional[str] = None,
+        model: Optional[type] = None,
+    ):
+        self.fetch = fetch
+        self.filters = filters
+        self.per_page = per_page
+        self.raw_fetch = raw_fetch
+        self.list_key = list_key
+        self.model = model
+    
+    def export(
+        self,
+        path: str,
+        format: str = 'ndjson',
+        columns: Optional[Sequence[str]] = None,
+        start_page: int = 1,
+        prefetch: bool = True,
+        on_page: Optional[Callable[[ExportResult], Any]] = None,
+        workers: Optional[Union[int, 'PageDecoder']] = None,
+    ) -> ExportResult:
+        """
+        Export all pages from start_page to path, returns ExportResult.
+        
+        workers (a process count or a PageDecoder) decodes pages and
+        renders rows in worker processes; this process only fetches pages
+        and writes the bytes it gets back.
+        """
+        if format not in _WRITERS:
+            raise ValueError(f"Unsupported export format '{format}', expected one of {', '.join(FORMATS)}")
+        if workers and self.raw_fetch is None:
+            raise ValueError('This listing cannot be decoded in worker processes')
+        columns = list(columns) if columns else None
+        # Without a projection the first page fixes the CSV/Parquet columns,
+        # fields that only show up later are left out and reported
+        derived = columns is None and format != 'ndjson'
+        if derived and format == 'csv' and start_page > 1:
+            # Appended rows have to line up with the header already written
+            columns = _CsvWriter.header(path)
+        result = ExportResult(path, format, start_page)
+        writer = _WRITERS[format](path, columns, start_page > 1)
+        if workers:
+            pages = self._decoded(workers, format, columns, start_page)
+        else:
+            pages = iterate_pages(self.fetch, self.filters, self.per_page, start_page)
+        try:
+            for page in (self._prefetched(pages) if prefetch else pages):
+                if workers:
+                    writer.write_encoded(page.payload, page.columns)
+                    dropped = page.dropped
+                else:
+                    rows = page.to_dict_list()
+                    if derived and columns is None and rows:
+                        columns = list(dict.fromkeys(key for row in rows for key in row))
+                    dropped = self._unknown(rows, columns) if derived else []
+                    writer.write(self._rows(rows, columns))
+                result.dropped_fields.extend(field for field in dropped if field not in result.dropped_fields)
+                result.last_page = page.get_current_page()
+                result.pages += 1
+                result.records += len(page)
+                if on_page is not None:
+                    on_page(result)
+            result.completed = True
+        finally:
+            writer.close()
+        return result
+    
+    def _decoded(self, workers: Union[int, 'PageDecoder'], format: str, columns: Optional[List[str]], start_page: int):
+        from .decoding import decoded_pages
+        
+        def fetch(page: int) -> bytes:
+            return self.raw_fetch({**(self.filters or {}), 'page': page, 'per_page': self.per_page})
+        
+        output = 'arrow' if format == 'parquet' else format
+        return decoded_pages(workers, fetch, self.list_key, self.model, output, columns, start_page)
+    
+    @staticmethod
+    def _rows(rows: List[Dict[str, Any]], columns: Optional[List[str]]) -> List[Dict[str, Any]]:
+        if columns is None:
+            return rows
+        return [{column: row.get(column) for column in columns} for row in rows]
+    
+    @staticmethod
+    def _unknown(rows: List[Dict[str, Any]], columns: Optional[List[str]]) -> List[str]:
+        known = set(columns or ())
+        return list(dict.fromkeys(key for row in rows for key in row if key not in known))
+    
+    @staticmethod
+    def _prefetched(pages):
+        """Fetch one page ahead in a background thread"""
+        buffer: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        
+        def offer(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def produce():
+            try:
+                for page in pages:
+                    if not offer(page):
+                        return
+                offer(_DONE)
+            except BaseException as e:
+                offer(e)
+            finally:
+                # Stop the source (and any worker processes) when the consumer stops early
+                if hasattr(pages, 'close'):
+                    pages.close()
+        
+        thread = threading.Thread(target=produce, name='touristesim-export', daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
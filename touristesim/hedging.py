@@ -0,0 +1,143 @@
+"""
+Hedged requests for latency-critical reads in TouristeSIM SDK
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional
+
+
+class HedgePolicy:
+    """
+    Send a second identical request when the first is slower than usual.
+    
+    The hedge delay is the given percentile of recently observed latencies
+    for the endpoint group. The first response to arrive wins; the other
+    request is cancelled if it has not started yet, otherwise its response is
+    discarded and its connection released. A budget caps hedges to a
+    fraction of all requests. Primaries run in the caller's thread when the
+    budget rules out a hedge and on a thread of their own otherwise, so
+    reads are never limited by the pool, which only runs the hedges.
+    """
+    
+    def __init__(
+        self,
+        percentile: float = 95,
+        min_delay: float = 0.05,
+        max_delay: float = 2.0,
+        budget_ratio: float = 0.1,
+        min_samples: int = 20,
+        sample_size: int = 200,
+        max_workers: int = 16,
+    ):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.sample_size = sample_size
+        self._samples: Dict[str, deque] = {}
+        self._budget = 1.0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='touristesim-hedge')
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+    
+    def get_delay(self, group: str) -> float:
+        """Get hedge delay for endpoint group"""
+        with self._lock:
+            samples = sorted(self._samples.get(group, ()))
+        if len(samples) < self.min_samples:
+            return self.max_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, min(self.max_delay, samples[index]))
+    
+    def close(self):
+        """Shut down the hedge thread pool, waiting for hedges in flight"""
+        self._executor.shutdown()
+    
+    def record(self, group: str, latency: float):
+        with self._lock:
+            samples = self._samples.get(group)
+            if samples is None:
+                samples = self._samples[group] = deque(maxlen=self.sample_size)
+            samples.append(latency)
+    
+    def run(self, group: str, fn: Callable[[], Any]) -> Any:
+        """Run fn, hedging it with a second call when it is slow"""
+        with self._lock:
+            self.requests += 1
+            self._budget = min(10.0, self._budget + self.budget_ratio)
+            affordable = self._budget >= 1
+        if not affordable:
+            # No hedge can be sent, run in the caller's thread
+            return self._timed(group, fn)[0]
+        primary: Future = Future()
+        # Otherwise the caller has to stay free to take whichever response comes first
+        threading.Thread(
+            target=self._run_primary, args=(primary, group, fn), name='touristesim-hedge-primary', daemon=True
+        ).start()
+        done, _ = wait([primary], timeout=self.get_delay(group))
+        if done or not self._take_budget():
+            return primary.result()[0]
+        
+        hedge = self._executor.submit(self._timed, group, fn)
+        with self._lock:
+            self.hedged += 1
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in pending:
+                    self._discard(loser)
+                if future is hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return future.result()[0]
+        raise error
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'hedged': self.hedged,
+            'hedge_wins': self.hedge_wins,
+            'delays': {group: self.get_delay(group) for group in list(self._samples)},
+        }
+    
+    def _timed(self, group: str, fn: Callable[[], Any]):
+        started = time.perf_counter()
+        result = fn()
+        self.record(group, time.perf_counter() - started)
+        return result, started
+    
+    def _run_primary(self, future: Future, group: str, fn: Callable[[], Any]):
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(self._timed(group, fn))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._budget >= 1:
+                self._budget -= 1
+                return True
+            return False
+    
+    @staticmethod
+    def _discard(future: Future):
+        if future.cancel():
+            return
+        
+        def close(done: Future):
+            if done.exception() is None:
+                response = done.result()[0]
+                if hasattr(response, 'close'):
+                    response.close()
+        future.add_done_callback(close)
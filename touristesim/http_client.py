@@ -1,12 +1,18 @@
 """
 HTTP Client for TouristeSIM SDK
 """
+import threading
 import time
-import requests
-from typing import Dict, Any, Optional
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 
 from .config import Config
 from .auth.oauth import OAuthClient
+from .singleflight import SingleFlight
+from .circuit_breaker import CircuitBreakerRegistry
+from .deadline import Deadline
+from .compression import TransferStats, accept_encoding_header, encode_body
+from .templates import RequestTemplates
 from .exceptions import (
     ApiException,
     AuthenticationException,
@@ -15,38 +21,176 @@ from .exceptions import (
     ResourceNotFoundException,
     ServerException,
     ConnectionException,
+    TimeoutException,
 )
 
+if TYPE_CHECKING:
+    import requests
+    from .hedging import HedgePolicy
+    from .priority import PriorityScheduler
+    from .routing import EndpointRouter
+
 
 class HttpClient:
-    """HTTP Client with OAuth, retry logic, and error handling"""
+    """
+    HTTP Client with OAuth, retry logic, and error handling.
+    
+    One instance may be shared by any number of threads. shared holds
+    components ('circuit_breakers', 'hedging', 'router') to use instead of
+    building them from config, so several clients can share their state.
+    """
     
-    def __init__(self, config: Config, oauth: OAuthClient):
+    def __init__(self, config: Config, oauth: OAuthClient, shared: Optional[Dict[str, Any]] = None):
         self.config = config
         self.oauth = oauth
-        self.session = requests.Session()
+        self._session: Optional['requests.Session'] = None
+        self._session_lock = threading.Lock()
         self.max_retries = config.get_max_retries()
         self.retry_delay_ms = 100
+        self.single_flight = SingleFlight() if config.should_coalesce_requests() else None
+        shared = shared or {}
+        self._shared = set(shared)
+        self.circuit_breakers: Optional[CircuitBreakerRegistry] = None
+        if 'circuit_breakers' in shared:
+            self.circuit_breakers = shared['circuit_breakers']
+        else:
+            breaker_options = config.get_circuit_breaker_options()
+            if breaker_options is not None:
+                self.circuit_breakers = CircuitBreakerRegistry(breaker_options)
+        self.hedging: Optional['HedgePolicy'] = None
+        if 'hedging' in shared:
+            self.hedging = shared['hedging']
+        else:
+            hedging_options = config.get_hedging_options()
+            if hedging_options is not None:
+                from .hedging import HedgePolicy
+                self.hedging = HedgePolicy(**hedging_options)
+        scheduling_options = config.get_priority_scheduling_options()
+        self.scheduler: Optional['PriorityScheduler'] = None
+        if scheduling_options is not None:
+            from .priority import PriorityScheduler
+            self.scheduler = PriorityScheduler(**scheduling_options)
+        self.router: Optional['EndpointRouter'] = None
+        if 'router' in shared:
+            self.router = shared['router']
+        else:
+            routing_options = config.get_endpoint_routing_options()
+            if routing_options is not None:
+                from .routing import EndpointRouter
+                self.router = EndpointRouter(config.get_base_urls(), probe=self._probe, **routing_options)
+        self._accept_encoding: Optional[str] = None
+        self._templates: Optional[RequestTemplates] = None
+        self._timeouts = (config.get_connect_timeout(), config.get_timeout())
+        self._verify = config.should_verify_ssl()
+        self.transfer_stats = TransferStats()
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """HTTP session, created (and requests imported) on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    # Room for one connection per concurrent caller, so shared use keeps reusing them
+                    adapter = HTTPAdapter(pool_maxsize=self.config.get_max_connections())
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+    
+    @session.setter
+    def session(self, session: 'requests.Session'):
+        self._session = session
+    
+    @property
+    def templates(self) -> RequestTemplates:
+        """Request templates for the current session, rebuilt when the session changes"""
+        templates = self._templates
+        session = self.session
+        if templates is None or templates.session is not session:
+            templates = self._templates = RequestTemplates(
+                session,
+                {
+                    'User-Agent': self.config.get_user_agent(),
+                    'Accept': 'application/json',
+                    'Content-Type': 'application/json',
+                    'Accept-Encoding': self.accept_encoding,
+                },
+                self._verify,
+            )
+        return templates
+    
+    @property
+    def accept_encoding(self) -> str:
+        """Accept-Encoding header value, resolved on first use"""
+        if self._accept_encoding is None:
+            self._accept_encoding = accept_encoding_header(self.config.get_accept_encoding())
+        return self._accept_encoding
     
     def set_max_retries(self, max_retries: int):
         """Set maximum retry attempts"""
         self.max_retries = max_retries
     
-    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def get(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Make GET request"""
-        return self.request('GET', endpoint, params=params)
+        return self.request('GET', endpoint, params=params, deadline=deadline, priority=priority)
     
-    def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def get_raw(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> bytes:
+        """Make GET request, returns the undecoded response body"""
+        return self.request('GET', endpoint, params=params, deadline=deadline, priority=priority, raw=True)
+    
+    def post(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Make POST request"""
-        return self.request('POST', endpoint, data=data)
+        return self.request('POST', endpoint, data=data, deadline=deadline, priority=priority)
     
-    def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def put(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Make PUT request"""
-        return self.request('PUT', endpoint, data=data)
+        return self.request('PUT', endpoint, data=data, deadline=deadline, priority=priority)
     
-    def delete(self, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def delete(
+        self,
+        endpoint: str,
+        data: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Make DELETE request"""
-        return self.request('DELETE', endpoint, data=data)
+        return self.request('DELETE', endpoint, data=data, deadline=deadline, priority=priority)
+    
+    def close(self):
+        """Close the session and stop the hedging and routing threads this client built"""
+        if self.hedging is not None and 'hedging' not in self._shared:
+            self.hedging.close()
+        if self.router is not None and 'router' not in self._shared:
+            self.router.close()
+        if self._session is not None:
+            self._session.close()
     
     def request(
         self,
@@ -54,32 +198,127 @@ class HttpClient:
         endpoint: str,
         params: Optional[Dict[str, Any]] = None,
         data: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        priority: Optional[str] = None,
+        raw: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Make HTTP request, coalescing concurrent identical GET requests.
+        
+        deadline is the overall time budget in seconds for the call, including
+        retries, backoff and token refresh (defaults to the 'deadline' option).
+        priority is the scheduling class ('high', 'normal', 'low') when the
+        'priority_scheduling' option is enabled, defaulting to the enclosing
+        priority() block. raw returns the response body as bytes instead of
+        decoded JSON.
+        """
+        budget = Deadline(
+            deadline if deadline is not None else self.config.get_deadline(),
+            self.config.get_min_attempt_time(),
+        )
+        if self.scheduler is not None:
+            priority = self.scheduler.resolve(priority)
+        if method.upper() == 'GET' and self.single_flight is not None:
+            key = (SingleFlight.make_key(method, endpoint, params), priority, raw)
+            # Callers joining an identical request still stop at their own deadline
+            return self.single_flight.do(
+                key,
+                lambda: self._send(method, endpoint, params, data, budget, priority, raw),
+                budget,
+            )
+        return self._send(method, endpoint, params, data, budget, priority, raw)
+    
+    def priority(self, name: str):
+        """Context manager running calls made in the block with priority name"""
+        from .priority import priority
+        return priority(name)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get request statistics"""
+        stats: Dict[str, Any] = {}
+        if self.single_flight is not None:
+            stats['coalescing'] = self.single_flight.get_stats()
+        if self.circuit_breakers is not None:
+            stats['circuit_breakers'] = self.circuit_breakers.get_states()
+        if self.hedging is not None:
+            stats['hedging'] = self.hedging.get_stats()
+        if self.scheduler is not None:
+            stats['priorities'] = self.scheduler.get_stats()
+        if self.router is not None:
+            stats['endpoints'] = self.router.get_stats()
+        stats['transfer'] = self.transfer_stats.to_dict()
+        if self._templates is not None:
+            stats['templates'] = self._templates.get_stats()
+        return stats
+    
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        priority: Optional[str] = None,
+        raw: bool = False,
+    ) -> Dict[str, Any]:
+        """Make HTTP request with retry logic, recording one circuit breaker outcome per call"""
+        deadline = deadline or Deadline()
+        breaker = self.circuit_breakers.for_endpoint(endpoint) if self.circuit_breakers is not None else None
+        if breaker is None:
+            return self._send_with_retries(method, endpoint, params, data, deadline, priority, raw)
+        if not breaker.allow():
+            raise ServerException.circuit_open(breaker.name)
+        try:
+            result = self._send_with_retries(method, endpoint, params, data, deadline, priority, raw)
+        except Exception as e:
+            # Retries are part of the call, only its final outcome counts
+            if self._is_breaker_failure(e):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            raise
+        breaker.record_success()
+        return result
+    
+    def _send_with_retries(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        data: Optional[Dict[str, Any]],
+        deadline: Deadline,
+        priority: Optional[str],
+        raw: bool,
     ) -> Dict[str, Any]:
-        """Make HTTP request with retry logic"""
+        import requests
+        
         last_error = None
+        body, body_headers, body_size = encode_body(data, self.config.get_request_compression_threshold())
         
         for attempt in range(self.max_retries + 1):
+            deadline.check()
             try:
-                token = self.oauth.get_token()
-                
-                headers = {
-                    'Authorization': f'Bearer {token}',
-                    'User-Agent': self.config.get_user_agent(),
-                    'Accept': 'application/json',
-                    'Content-Type': 'application/json',
-                }
+                tried: List[str] = []
+                while True:
+                    base_url = self.router.choose(tried) if self.router is not None else self.config.get_base_url()
+                    started = time.monotonic()
+                    try:
+                        response = self._attempt(method, base_url, endpoint, params, body, body_headers, deadline, priority)
+                    except requests.exceptions.RequestException as e:
+                        # Another endpoint may answer, failing over does not use up a retry
+                        if self.router is None or not self._can_fail_over(method, e):
+                            raise
+                        self.router.record_failure(base_url)
+                        tried.append(base_url)
+                        if len(tried) >= len(self.router.endpoints) or deadline.is_expired():
+                            raise
+                        continue
+                    if self.router is not None:
+                        self.router.record_response(base_url, time.monotonic() - started, response.status_code >= 500)
+                    break
                 
-                url = f"{self.config.get_base_url()}{endpoint}"
-                
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    params=params,
-                    json=data,
-                    headers=headers,
-                    timeout=self.config.get_timeout(),
-                    verify=self.config.should_verify_ssl(),
-                )
+                self.transfer_stats.record_request(body_size, len(body or b''), bool(body_headers))
+                self.transfer_stats.record_response(response)
                 
                 # Handle errors
                 if response.status_code == 401:
@@ -89,8 +328,8 @@ class HttpClient:
                     raise self._map_exception(response)
                 
                 if response.status_code == 429:
-                    if attempt < self.max_retries:
-                        retry_after = int(response.headers.get('Retry-After', 60))
+                    retry_after = int(response.headers.get('Retry-After', 60))
+                    if attempt < self.max_retries and deadline.can_wait(retry_after):
                         time.sleep(retry_after)
                         continue
                     raise self._map_exception(response)
@@ -99,18 +338,21 @@ class HttpClient:
                     raise self._map_exception(response)
                 
                 if response.status_code >= 500:
-                    if attempt < self.max_retries:
-                        time.sleep(self.retry_delay_ms * (attempt + 1) / 1000)
+                    if attempt < self.max_retries and deadline.can_wait(self._retry_delay(attempt)):
+                        time.sleep(self._retry_delay(attempt))
                         continue
                     raise self._map_exception(response)
                 
                 response.raise_for_status()
-                return response.json()
+                return response.content if raw else response.json()
+            
+            except TimeoutException:
+                raise
             
             except ConnectionException as e:
                 last_error = e
-                if attempt < self.max_retries:
-                    time.sleep(self.retry_delay_ms * (attempt + 1) / 1000)
+                if attempt < self.max_retries and deadline.can_wait(self._retry_delay(attempt)):
+                    time.sleep(self._retry_delay(attempt))
                     continue
                 raise
             
@@ -118,9 +360,16 @@ class HttpClient:
                 raise
             
             except requests.exceptions.RequestException as e:
+                if isinstance(e, requests.exceptions.Timeout) and deadline.is_expired():
+                    # The caller's deadline cut the attempt short, the upstream may be fine
+                    raise TimeoutException.deadline_exceeded(deadline.seconds) from e
                 last_error = e
-                if attempt < self.max_retries and self._is_retryable_error(e):
-                    time.sleep(self.retry_delay_ms * (attempt + 1) / 1000)
+                if (
+                    attempt < self.max_retries
+                    and self._is_retryable_error(e)
+                    and deadline.can_wait(self._retry_delay(attempt))
+                ):
+                    time.sleep(self._retry_delay(attempt))
                     continue
                 raise self._map_exception_from_request_error(e)
         
@@ -129,9 +378,90 @@ class HttpClient:
         
         raise ConnectionException('Request failed after retries')
     
+    def _attempt(
+        self,
+        method: str,
+        base_url: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        body: Optional[bytes],
+        body_headers: Dict[str, str],
+        deadline: Deadline,
+        priority: Optional[str],
+    ) -> 'requests.Response':
+        """Send one attempt to base_url"""
+        token = self.oauth.get_token(self._timeout(deadline), base_url)
+        deadline.check()
+        templates = self.templates
+        
+        if templates.can_prepare():
+            template = templates.template(method, base_url)
+            
+            def transmit() -> 'requests.Response':
+                prepared = templates.prepare(template, token, endpoint, params, body, body_headers)
+                return self.session.send(prepared, timeout=self._timeout(deadline), **template.settings)
+        else:
+            headers = dict(templates.headers(token))
+            headers.update(body_headers)
+            
+            def transmit() -> 'requests.Response':
+                return self.session.request(
+                    method=method,
+                    url=f"{base_url}{endpoint}",
+                    params=params,
+                    data=body,
+                    headers=headers,
+                    timeout=self._timeout(deadline),
+                    verify=self._verify,
+                )
+        
+        def send() -> 'requests.Response':
+            slot = self.scheduler.slot(priority, deadline.remaining()) if self.scheduler is not None else nullcontext(True)
+            with slot as acquired:
+                if not acquired:
+                    raise TimeoutException.deadline_exceeded(deadline.seconds)
+                return transmit()
+        
+        if self.hedging is not None and method.upper() == 'GET':
+            return self.hedging.run(CircuitBreakerRegistry.group(endpoint), send)
+        return send()
+    
+    def _probe(self, url: str) -> bool:
+        """Check whether an endpoint answers (any non-5xx response)"""
+        response = self.session.get(
+            url,
+            headers={'User-Agent': self.config.get_user_agent()},
+            timeout=(self.config.get_connect_timeout(), self.config.get_connect_timeout()),
+            verify=self.config.should_verify_ssl(),
+        )
+        response.close()
+        return response.status_code < 500
+    
+    def _timeout(self, deadline: Deadline):
+        """Get (connect, read) timeout for the next attempt"""
+        return deadline.timeout(*self._timeouts)
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Get backoff delay in seconds before the next attempt"""
+        return self.retry_delay_ms * (attempt + 1) / 1000
+    
+    @classmethod
+    def _is_breaker_failure(cls, error: Exception) -> bool:
+        """Check if a call's final error points at an unhealthy upstream (transport error, 5xx or 429)"""
+        import requests
+        
+        if isinstance(error, TimeoutException):
+            # Raised locally when the caller's deadline or a scheduler slot runs out
+            return False
+        if isinstance(error, (ServerException, RateLimitException, ConnectionException)):
+            return True
+        return isinstance(error, requests.exceptions.RequestException) and cls._is_retryable_error(error)
+    
     @staticmethod
-    def _is_retryable_error(error: requests.exceptions.RequestException) -> bool:
+    def _is_retryable_error(error: 'requests.exceptions.RequestException') -> bool:
         """Check if error is retryable"""
+        import requests
+        
         if isinstance(error, requests.exceptions.ConnectTimeout):
             return True
         if isinstance(error, requests.exceptions.ReadTimeout):
@@ -141,7 +471,21 @@ class HttpClient:
         return False
     
     @staticmethod
-    def _map_exception(response: requests.Response) -> ApiException:
+    def _can_fail_over(method: str, error: 'requests.exceptions.RequestException') -> bool:
+        """Check if request can be resent to another endpoint"""
+        import requests
+        from urllib3.exceptions import NewConnectionError
+        
+        if method.upper() != 'POST' and HttpClient._is_retryable_error(error):
+            return True
+        # A POST may only move when it never reached the server
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    
+    @staticmethod
+    def _map_exception(response: 'requests.Response') -> ApiException:
         """Map HTTP response to exception"""
         status = response.status_code
         try:
@@ -168,8 +512,10 @@ class HttpClient:
             return ApiException(message, status, data)
     
     @staticmethod
-    def _map_exception_from_request_error(error: requests.exceptions.RequestException) -> ApiException:
+    def _map_exception_from_request_error(error: 'requests.exceptions.RequestException') -> ApiException:
         """Map request exception to API exception"""
+        import requests
+        
         if isinstance(error, requests.exceptions.ConnectTimeout):
             return ConnectionException.timeout(str(error))
         elif isinstance(error, requests.exceptions.ReadTimeout):
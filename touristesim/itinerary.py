@@ -0,0 +1,309 @@
+"""
+Multi-country itinerary plan optimizer for TouristeSIM SDK
+"""
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .models import Plan
+
+
+def _popcount(value: int) -> int:
+    return bin(value).count('1')
+
+
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count  # noqa: F811
+
+
+class _OutOfBudget(Exception):
+    """Search budget used up"""
+
+
+class ItineraryOption:
+    """A set of plans covering every country of a trip"""
+    
+    def __init__(self, plans: List[Plan], total_price: float, coverage: Dict[str, Plan], optimal: bool = True):
+        self.plans = plans
+        self.total_price = total_price
+        self.coverage = coverage
+        self.optimal = optimal
+    
+    def get_plans(self) -> List[Plan]:
+        return self.plans
+    
+    def get_total_price(self) -> float:
+        return self.total_price
+    
+    def is_optimal(self) -> bool:
+        """Check the search proved no cheaper option exists (False when the time budget ran out)"""
+        return self.optimal
+    
+    def get_plan_for(self, code: str) -> Optional[Plan]:
+        """Get plan covering country"""
+        return self.coverage.get(code.upper())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'plans': [plan.to_dict() for plan in self.plans],
+            'total_price': self.total_price,
+            'coverage': {code: plan.get('id') for code, plan in self.coverage.items()},
+            'optimal': self.optimal,
+        }
+
+
+class ItineraryOptimizer:
+    """
+    Cheapest plan combinations for multi-country trips.
+    
+    Country coverage of every catalog plan is stored as a bitset over the
+    catalog's country codes. A query keeps the eligible plans (long
+    enough validity and enough data), drops plans dominated by a cheaper
+    plan with a superset of the trip countries, then solves weighted set
+    cover by branch and bound, starting from a greedy cover: branch on the
+    uncovered country with the fewest covering plans, prune when the cost
+    plus a lower bound for the remaining countries cannot beat the best
+    cover found so far. The search stops at time_budget and returns the
+    best cover found by then, flagged as not proven optimal.
+    """
+    
+    def __init__(self, plans: Iterable[Plan]):
+        self.plans: List[Plan] = []
+        self._masks: List[int] = []
+        self._bits: Dict[str, int] = {}
+        self._global = 0
+        self.built_at = time.time()
+        for plan in plans:
+            if not isinstance(plan, Plan):
+                plan = Plan(plan)
+            codes = [self._code(item) for item in plan.get_countries()]
+            mask = 0
+            for code in codes:
+                if code:
+                    mask |= 1 << self._bit(code.upper())
+            if not mask and not plan.is_global():
+                continue
+            if not mask:
+                # Global plan without a country list covers every country
+                self._global |= 1 << len(self.plans)
+            self.plans.append(plan)
+            self._masks.append(mask)
+    
+    def count(self) -> int:
+        return len(self.plans)
+    
+    def optimize(
+        self,
+        countries: Sequence[str],
+        days: Union[int, Dict[str, int]] = 0,
+        min_gb: float = 0,
+        limit: int = 3,
+        max_plans: Optional[int] = None,
+        time_budget: Optional[float] = 0.05,
+    ) -> List[ItineraryOption]:
+        """
+        Get the cheapest plan combination covering all countries, then alternatives.
+        
+        Alternatives are the cheapest covers avoiding one plan of the best
+        option, ranked by price, up to limit options in total. days is the
+        trip length every plan must be valid for, or days per country (a
+        plan then only counts for countries it is valid long enough for).
+        min_gb is the data every plan must include; unlimited plans always
+        qualify. time_budget caps the search in seconds (None for no cap).
+        """
+        trip = list(dict.fromkeys(code.upper() for code in countries))
+        if not trip or limit < 1:
+            return []
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        candidates = self._candidates(trip, days, min_gb)
+        covers: List[List[int]] = [[] for _ in trip]
+        for index, (mask, _, _) in enumerate(candidates):
+            for position in range(len(trip)):
+                if mask >> position & 1:
+                    covers[position].append(index)
+        
+        best = self._solve(len(trip), candidates, covers, frozenset(), max_plans, float('inf'), deadline)
+        if best is None:
+            return []
+        found = {frozenset(best[1]): best}
+        if limit > 1:
+            for index in best[1]:
+                if deadline is not None and time.monotonic() > deadline:
+                    break
+                # Only covers cheaper than the current limit-th option can make the list
+                ranked = sorted(solution[0] for solution in found.values())
+                bound = ranked[limit - 1] if len(ranked) >= limit else float('inf')
+                alternative = self._solve(len(trip), candidates, covers, frozenset((index,)), max_plans, bound, deadline)
+                if alternative is not None:
+                    found.setdefault(frozenset(alternative[1]), alternative)
+        ranked = sorted(found.values(), key=lambda solution: (solution[0], len(solution[1])))[:limit]
+        
+        options = []
+        for cost, chosen, optimal in ranked:
+            plans = [candidates[index][2] for index in chosen]
+            coverage: Dict[str, Plan] = {}
+            for index in chosen:
+                mask, _, plan = candidates[index]
+                for position, code in enumerate(trip):
+                    if mask >> position & 1 and code not in coverage:
+                        coverage[code] = plan
+            options.append(ItineraryOption(plans, round(cost, 2), coverage, optimal))
+        return options
+    
+    def _solve(
+        self,
+        size: int,
+        candidates: List[Tuple[int, float, Plan]],
+        all_covers: List[List[int]],
+        excluded: FrozenSet[int],
+        max_plans: Optional[int],
+        bound: float,
+        deadline: Optional[float],
+    ) -> Optional[Tuple[float, Tuple[int, ...], bool]]:
+        """Branch and bound for the cheapest cover below bound, returns (cost, chosen indexes, optimal)"""
+        covers = [[index for index in plans if index not in excluded] for plans in all_covers]
+        if any(not plans for plans in covers):
+            return None
+        cheapest = [min(candidates[index][1] for index in plans) for plans in covers]
+        full = (1 << size) - 1
+        best: List[Any] = [bound, None]
+        greedy = self._greedy(full, candidates, excluded)
+        if greedy is not None and greedy[0] < bound and (max_plans is None or len(greedy[1]) <= max_plans):
+            best[0], best[1] = greedy
+        # Cheapest cost seen per covered set, reaching it again for more cannot
+        # help; with max_plans only when it also uses as many plans
+        reached: Dict[Any, float] = {}
+        nodes = [0]
+        
+        def search(covered: int, cost: float, chosen: Tuple[int, ...]):
+            if covered == full:
+                if cost < best[0]:
+                    best[0], best[1] = cost, chosen
+                return
+            state = covered if max_plans is None else (covered, len(chosen))
+            if reached.get(state, float('inf')) <= cost:
+                return
+            reached[state] = cost
+            if max_plans is not None and len(chosen) >= max_plans:
+                return
+            nodes[0] += 1
+            if deadline is not None and nodes[0] & 31 == 1 and time.monotonic() > deadline:
+                raise _OutOfBudget()
+            remaining = full & ~covered
+            uncovered = [position for position in range(size) if remaining >> position & 1]
+            # Lower bound: each uncovered country pays at least its cheapest per-country share
+            ratios: Dict[int, float] = {}
+            lower = 0.0
+            for position in uncovered:
+                share = float('inf')
+                for index in covers[position]:
+                    ratio = ratios.get(index)
+                    if ratio is None:
+                        mask, price, _ = candidates[index]
+                        ratio = ratios[index] = price / _popcount(mask & remaining)
+                    if ratio < share:
+                        share = ratio
+                lower += share
+            lower = max(lower, max(cheapest[position] for position in uncovered))
+            if cost + lower >= best[0]:
+                return
+            position = min(uncovered, key=lambda p: len(covers[p]))
+            # Most countries per price first, so good covers are found early
+            for index in sorted(covers[position], key=ratios.__getitem__):
+                mask, price, _ = candidates[index]
+                if cost + price >= best[0]:
+                    continue
+                search(covered | mask, cost + price, chosen + (index,))
+        
+        optimal = True
+        try:
+            search(0, 0.0, ())
+        except _OutOfBudget:
+            optimal = False
+        if best[1] is None:
+            return None
+        return best[0], best[1], optimal
+    
+    @staticmethod
+    def _greedy(
+        full: int,
+        candidates: List[Tuple[int, float, Plan]],
+        excluded: FrozenSet[int],
+    ) -> Optional[Tuple[float, Tuple[int, ...]]]:
+        """Cover by cheapest price per newly covered country, without redundant plans"""
+        covered = 0
+        chosen: List[int] = []
+        while covered != full:
+            pick, pick_ratio = None, float('inf')
+            for index, (mask, price, _) in enumerate(candidates):
+                gain = mask & ~covered
+                if gain and index not in excluded:
+                    ratio = price / _popcount(gain)
+                    if ratio < pick_ratio:
+                        pick, pick_ratio = index, ratio
+            if pick is None:
+                return None
+            chosen.append(pick)
+            covered |= candidates[pick][0]
+        # Drop plans the others already cover, most expensive first
+        for index in sorted(chosen, key=lambda index: -candidates[index][1]):
+            others = 0
+            for other in chosen:
+                if other != index:
+                    others |= candidates[other][0]
+            if others == full:
+                chosen.remove(index)
+        return sum(candidates[index][1] for index in chosen), tuple(chosen)
+    
+    def _candidates(self, trip: List[str], days: Union[int, Dict[str, int]], min_gb: float) -> List[Tuple[int, float, Plan]]:
+        """Get (trip mask, price, plan) of useful plans, sorted by price"""
+        bits = [self._bits.get(code) for code in trip]
+        per_country = isinstance(days, dict)
+        needed = {code.upper(): value for code, value in days.items()} if per_country else {}
+        trip_mask = 0
+        for bit in bits:
+            if bit is not None:
+                trip_mask |= 1 << bit
+        best_for_mask: Dict[int, Tuple[float, Plan]] = {}
+        for index, plan in enumerate(self.plans):
+            plan_mask = self._masks[index]
+            is_global = self._global >> index & 1
+            if not is_global and not plan_mask & trip_mask:
+                continue
+            if min_gb and not plan.is_unlimited() and plan.get('data', 0) < min_gb * 1024:
+                continue
+            validity = plan.get_validity_days()
+            if not per_country and validity < days:
+                continue
+            mask = 0
+            for position, bit in enumerate(bits):
+                if is_global or (bit is not None and plan_mask >> bit & 1):
+                    if per_country and validity < needed.get(trip[position], 0):
+                        continue
+                    mask |= 1 << position
+            if not mask:
+                continue
+            price = plan.get_price()
+            current = best_for_mask.get(mask)
+            if current is None or price < current[0]:
+                best_for_mask[mask] = (price, plan)
+        
+        # Drop plans when a plan at most as cheap covers a superset of the trip countries
+        ordered = sorted(best_for_mask.items(), key=lambda item: (item[1][0], -_popcount(item[0])))
+        kept: List[Tuple[int, float, Plan]] = []
+        for mask, (price, plan) in ordered:
+            if any(other & mask == mask for other, _, _ in kept):
+                continue
+            kept.append((mask, price, plan))
+        return kept
+    
+    def _bit(self, code: str) -> int:
+        bit = self._bits.get(code)
+        if bit is None:
+            bit = self._bits[code] = len(self._bits)
+        return bit
+    
+    @staticmethod
+    def _code(item: Any) -> str:
+        if isinstance(item, dict):
+            return item.get('code') or item.get('iso') or ''
+        return str(item)
@@ -0,0 +1,291 @@
+"""
+Local balance ledger with optimistic reservations for TouristeSIM SDK
+"""
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .models import Order, BalanceTransaction
+from .resources import Balance, Orders
+from .exceptions import ApiException, ValidationException
+
+
+class Reservation:
+    """Funds held for an order that has not settled yet"""
+    
+    PENDING = 'pending'
+    SETTLED = 'settled'
+    RELEASED = 'released'
+    
+    def __init__(self, reservation_id: int, amount: float, reference: Any = None):
+        self.id = reservation_id
+        self.amount = amount
+        self.reference = reference
+        self.state = self.PENDING
+        self.created_at = time.time()
+        # Last balance fetch started before the order was placed
+        self.epoch = 0
+    
+    def is_pending(self) -> bool:
+        return self.state == self.PENDING
+
+
+class BalanceLedger:
+    """
+    Local view of the partner balance for admitting orders without a round-trip.
+    
+    Seeded from Balance.get(). reserve() holds an order's amount against
+    the cached balance under a lock; settle() applies the final amount and
+    release() returns the hold. The API is only consulted when the cached
+    balance is older than max_age or the headroom after a reservation
+    would drop below min_headroom. reconcile() applies balance history
+    entries this ledger did not record itself (top-ups, orders placed
+    elsewhere) and can run periodically in the background.
+    
+    Every balance fetch gets an epoch when it starts. A reservation is
+    stamped with the current epoch at reserve() time, and place_order()
+    restamps it right before the order is created. settle() does not
+    subtract the charge again when the confirmed balance comes from a
+    fetch started after that, since the API balance may already include
+    it. reconcile() corrects the rare fetch that raced the order itself.
+    Network calls never run while the ledger lock is held.
+    """
+    
+    def __init__(
+        self,
+        balance: Balance,
+        max_age: float = 300,
+        min_headroom: float = 0,
+        reconcile_interval: Optional[float] = 300,
+        balance_key: Optional[Callable[[Dict[str, Any]], float]] = None,
+    ):
+        self.balance = balance
+        self.max_age = max_age
+        self.min_headroom = min_headroom
+        self.reconcile_interval = reconcile_interval
+        self.balance_key = balance_key or self._default_balance
+        self.confirmed: Optional[float] = None
+        self.currency: Optional[str] = None
+        self.refreshed_at: Optional[float] = None
+        self._reservations: Dict[int, Reservation] = {}
+        self._ids = itertools.count(1)
+        # Charges settled locally, by order ID, until seen in the history
+        self._settled_orders: Dict[Any, float] = {}
+        self._last_transaction_id: Optional[int] = None
+        self._history_marked = False
+        self._lock = threading.RLock()
+        self._fetches = 0
+        self._epoch = 0
+        self._timer: Optional[threading.Timer] = None
+        self.refreshes = 0
+        self.local_admissions = 0
+        self.drift = 0.0
+    
+    def refresh(self) -> float:
+        """Reload balance from the API, returns confirmed balance"""
+        with self._lock:
+            self._fetches += 1
+            epoch = self._fetches
+        # Mark the history first, anything up to the mark is in the balance read next
+        marked, last_transaction_id = self._history_mark()
+        data = self.balance.get()
+        with self._lock:
+            if epoch < self._epoch:
+                # A fetch started later has already been applied
+                return self.confirmed
+            self._epoch = epoch
+            self.confirmed = self.balance_key(data)
+            self.currency = data.get('currency', self.currency)
+            self.refreshed_at = time.time()
+            self.refreshes += 1
+            # The fresh balance includes everything in the history so far
+            self._settled_orders.clear()
+            self._history_marked = marked
+            self._last_transaction_id = last_transaction_id
+            return self.confirmed
+    
+    def available(self) -> float:
+        """Get confirmed balance minus pending reservations"""
+        if self.confirmed is None:
+            self.refresh()
+        with self._lock:
+            return self._available()
+    
+    def reserved(self) -> float:
+        return sum(reservation.amount for reservation in self._reservations.values())
+    
+    def is_stale(self) -> bool:
+        return self.refreshed_at is None or time.time() - self.refreshed_at > self.max_age
+    
+    def can_afford(self, amount: float) -> bool:
+        """Check headroom without reserving"""
+        with self._lock:
+            local = not self.is_stale() and self._available() - amount >= self.min_headroom
+        if not local:
+            self.refresh()
+        with self._lock:
+            return self._available() >= amount
+    
+    def reserve(self, amount: float, reference: Any = None) -> Reservation:
+        """Hold amount, raises ValidationException when the balance is insufficient"""
+        with self._lock:
+            local = not self.is_stale() and self._available() - amount >= self.min_headroom
+        if not local:
+            self.refresh()
+        with self._lock:
+            # Checked again, other reservations may have been made meanwhile
+            available = self._available()
+            if available < amount:
+                raise ValidationException.insufficient_balance(amount, available)
+            if local:
+                self.local_admissions += 1
+            reservation = Reservation(next(self._ids), amount, reference)
+            reservation.epoch = self._fetches
+            self._reservations[reservation.id] = reservation
+            return reservation
+    
+    def settle(self, reservation: Reservation, amount: Optional[float] = None, order_id: Any = None) -> float:
+        """Apply the final charge (defaults to the reserved amount), returns available balance"""
+        with self._lock:
+            if self._reservations.pop(reservation.id, None) is None:
+                return self._available()
+            reservation.state = Reservation.SETTLED
+            if self._epoch > reservation.epoch:
+                # Refreshed since the order was placed, the charge is already in the balance
+                return self._available()
+            charge = reservation.amount if amount is None else amount
+            self.confirmed -= charge
+            if order_id is not None:
+                self._settled_orders[order_id] = charge
+            return self._available()
+    
+    def release(self, reservation: Reservation) -> float:
+        """Return held funds, returns available balance"""
+        with self._lock:
+            if self._reservations.pop(reservation.id, None) is not None:
+                reservation.state = Reservation.RELEASED
+            return self._available()
+    
+    def place_order(self, orders: Orders, data: Dict[str, Any], amount: float) -> Order:
+        """
+        Create order after reserving its estimated amount.
+        
+        The reservation is settled with Order.get_total_price() on success
+        and released when the order fails or the request raises.
+        """
+        reservation = self.reserve(amount, data.get('plan_id'))
+        with self._lock:
+            # Fetches started from here on may include the charge
+            reservation.epoch = self._fetches
+        try:
+            order = orders.create(data)
+        except BaseException:
+            self.release(reservation)
+            raise
+        if order.is_failed() or order.is_cancelled():
+            self.release(reservation)
+        else:
+            self.settle(reservation, order.get_total_price() or amount, order.get('id'))
+        return order
+    
+    def reconcile(self) -> float:
+        """
+        Apply balance history entries recorded since the last reconcile.
+        
+        History is expected newest first. Entries for orders settled by
+        this ledger are skipped. When the newest entry carries
+        balance_after, it becomes the confirmed balance. Returns the difference between the reconciled and the
+        previous confirmed balance.
+        """
+        if self.confirmed is None or not self._history_marked:
+            before = self.confirmed
+            self.refresh()
+            return 0.0 if before is None else self.confirmed - before
+        entries = self._new_history()
+        with self._lock:
+            before = self.confirmed
+            for entry in reversed(entries):
+                order_id = entry.get('order_id')
+                if order_id is not None and order_id in self._settled_orders:
+                    del self._settled_orders[order_id]
+                    continue
+                self.confirmed += entry.get_amount()
+            if entries and entries[0].get_balance_after() is not None:
+                # Authoritative, minus local charges the history does not show yet
+                self.confirmed = entries[0].get_balance_after() - sum(self._settled_orders.values())
+            if entries:
+                self._last_transaction_id = entries[0].get('id')
+            self.refreshed_at = time.time()
+            self.drift = self.confirmed - before
+            return self.drift
+    
+    def start(self):
+        """Reconcile periodically in a background thread"""
+        if self.reconcile_interval is None:
+            return
+        self.stop()
+        self._timer = threading.Timer(self.reconcile_interval, self._scheduled_reconcile)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+    
+    def pending(self) -> List[Reservation]:
+        with self._lock:
+            return list(self._reservations.values())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'confirmed': self.confirmed,
+                'reserved': self.reserved(),
+                'available': None if self.confirmed is None else self.confirmed - self.reserved(),
+                'pending': len(self._reservations),
+                'refreshes': self.refreshes,
+                'local_admissions': self.local_admissions,
+                'drift': self.drift,
+                'age': None if self.refreshed_at is None else time.time() - self.refreshed_at,
+            }
+    
+    def _new_history(self) -> List[BalanceTransaction]:
+        """Get entries newer than the last seen one, newest first"""
+        entries: List[BalanceTransaction] = []
+        for page in self.balance.history_pages():
+            for entry in page:
+                if self._last_transaction_id is not None and entry.get('id') == self._last_transaction_id:
+                    return entries
+                entries.append(entry)
+        return entries
+    
+    def _available(self) -> float:
+        return self.confirmed - self.reserved()
+    
+    def _history_mark(self) -> Tuple[bool, Optional[int]]:
+        """Get the newest history entry ID, returns whether it could be read"""
+        try:
+            latest = self.balance.history({'page': 1, 'per_page': 1}).first()
+        except ApiException:
+            return False, None
+        return True, latest.get('id') if latest is not None else None
+    
+    def _scheduled_reconcile(self):
+        try:
+            self.reconcile()
+        except ApiException:
+            # Keep the local view until the next attempt
+            pass
+        finally:
+            # A stop() while this ran cleared the timer, stay stopped
+            if self._timer is threading.current_thread():
+                self.start()
+    
+    @staticmethod
+    def _default_balance(data: Dict[str, Any]) -> float:
+        for key in ('available_balance', 'balance', 'amount'):
+            if data.get(key) is not None:
+                return float(data[key])
+        return 0.0
@@ -0,0 +1,173 @@
+"""
+DataLoader-style batching of find() lookups for TouristeSIM SDK
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from .collections import Collection
+
+
+class _LoaderFuture(Future):
+    """Future that dispatches its loader's pending batch when its result is requested"""
+    
+    def __init__(self, loader: 'Loader'):
+        super().__init__()
+        self._loader = loader
+    
+    def result(self, timeout: Optional[float] = None) -> Any:
+        if not self.done():
+            self._loader.dispatch()
+        return super().result(timeout)
+    
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        if not self.done():
+            self._loader.dispatch()
+        return super().exception(timeout)
+
+
+class Loader:
+    """
+    Collect find() calls, dedupe their keys and resolve them together.
+    
+    Keys requested with load() are queued until a result is needed (or
+    dispatch() is called), then resolved in one go: through fetch_many when
+    given, otherwise through fetch_one calls on a bounded thread pool.
+    Results are memoized for the lifetime of the loader.
+    """
+    
+    def __init__(
+        self,
+        fetch_one: Callable[[Any], Any],
+        fetch_many: Optional[Callable[[List[Any]], Dict[Any, Any]]] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_batch_size: int = 100,
+    ):
+        self.fetch_one = fetch_one
+        self.fetch_many = fetch_many
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self._memo: Dict[Hashable, Future] = {}
+        self._pending: List[Hashable] = []
+        self._lock = threading.Lock()
+        self.requests = 0
+    
+    def load(self, key: Any) -> Future:
+        """Queue key, returns future for its value"""
+        with self._lock:
+            future = self._memo.get(key)
+            if future is None:
+                future = _LoaderFuture(self)
+                self._memo[key] = future
+                self._pending.append(key)
+            return future
+    
+    def load_many(self, keys: Iterable[Any]) -> List[Any]:
+        """Load several keys, returns values in order"""
+        futures = [self.load(key) for key in keys]
+        self.dispatch()
+        return [future.result() for future in futures]
+    
+    def get(self, key: Any) -> Any:
+        """Load single key and wait for its value"""
+        return self.load(key).result()
+    
+    def prime(self, key: Any, value: Any):
+        """Seed memo with a known value"""
+        with self._lock:
+            if key not in self._memo:
+                future: Future = Future()
+                future.set_result(value)
+                self._memo[key] = future
+    
+    def clear(self, key: Optional[Any] = None):
+        """Forget memoized values"""
+        with self._lock:
+            if key is None:
+                self._memo = {k: f for k, f in self._memo.items() if not f.done()}
+            else:
+                future = self._memo.get(key)
+                if future is not None and future.done():
+                    del self._memo[key]
+    
+    def dispatch(self):
+        """Resolve all queued keys"""
+        with self._lock:
+            keys, self._pending = self._pending, []
+        for start in range(0, len(keys), self.max_batch_size):
+            self._resolve(keys[start:start + self.max_batch_size])
+    
+    def _resolve(self, keys: List[Hashable]):
+        missing = keys
+        if self.fetch_many is not None:
+            self.requests += 1
+            try:
+                found = self.fetch_many(keys)
+            except Exception as e:
+                self._fail(keys, e)
+                return
+            for key in keys:
+                if key in found:
+                    self._memo[key].set_result(found[key])
+            missing = [key for key in keys if key not in found]
+        if not missing:
+            return
+        self.requests += len(missing)
+        if self.executor is None or len(missing) == 1:
+            for key in missing:
+                self._resolve_one(key)
+        else:
+            list(self.executor.map(self._resolve_one, missing))
+    
+    def _resolve_one(self, key: Hashable):
+        future = self._memo[key]
+        try:
+            future.set_result(self.fetch_one(key))
+        except Exception as e:
+            future.set_exception(e)
+    
+    def _fail(self, keys: List[Hashable], error: Exception):
+        for key in keys:
+            future = self._memo[key]
+            if not future.done():
+                future.set_exception(error)
+
+
+class LoaderScope:
+    """Per-request scope holding loaders for plans, eSIMs and orders"""
+    
+    def __init__(self, plans: Any, esims: Any, orders: Any, concurrency: int = 8, batch_filter: Optional[str] = None):
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='touristesim-loader')
+        self.plans = Loader(plans.find, self._listing(plans, batch_filter) if batch_filter else None, self.executor)
+        self.esims = Loader(esims.find, None, self.executor)
+        self.orders = Loader(orders.find, None, self.executor)
+    
+    def dispatch(self):
+        for loader in (self.plans, self.esims, self.orders):
+            loader.dispatch()
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'plans': self.plans.requests,
+            'esims': self.esims.requests,
+            'orders': self.orders.requests,
+        }
+    
+    def close(self):
+        self.dispatch()
+        self.executor.shutdown(wait=True)
+    
+    def __enter__(self) -> 'LoaderScope':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    @staticmethod
+    def _listing(plans: Any, batch_filter: str) -> Callable[[List[Any]], Dict[Any, Any]]:
+        """Resolve plan IDs through one /plans listing call filtered by ID"""
+        def fetch_many(ids: List[Any]) -> Dict[Any, Any]:
+            collection: Collection = plans.get({batch_filter: ','.join(str(i) for i in ids), 'per_page': len(ids)})
+            wanted = {str(i): i for i in ids}
+            return {wanted[str(plan.get('id'))]: plan for plan in collection if str(plan.get('id')) in wanted}
+        return fetch_many
@@ -14,6 +14,13 @@ class Model:
         if attributes:
             self.fill(attributes)
     
+    @classmethod
+    def from_attributes(cls, attributes: Dict[str, Any]):
+        """Create model from attributes that are already cast"""
+        model = cls.__new__(cls)
+        model.attributes = attributes
+        return model
+    
     def fill(self, attributes: Dict[str, Any]):
         """Fill model with attributes"""
         for key, value in attributes.items():
@@ -276,3 +283,36 @@ class Esim(Model):
         """Get share link PIN"""
         share_link = self.get_share_link()
         return share_link.get('pin') if share_link else None
+
+
+class BalanceTransaction(Model):
+    """Balance history entry Model"""
+    
+    casts = {
+        'id': 'integer',
+        'amount': 'float',
+        'balance_before': 'float',
+        'balance_after': 'float',
+        'order_id': 'integer',
+    }
+    
+    def get_type(self) -> str:
+        return self.get('type', '')
+    
+    def get_amount(self) -> float:
+        return self.get('amount', 0)
+    
+    def is_credit(self) -> bool:
+        return self.get_amount() > 0
+    
+    def is_debit(self) -> bool:
+        return self.get_amount() < 0
+    
+    def get_balance_after(self) -> Optional[float]:
+        return self.get('balance_after')
+    
+    def get_description(self) -> str:
+        return self.get('description', '')
+    
+    def get_created_at(self) -> Optional[str]:
+        return self.get('created_at')
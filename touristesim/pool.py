@@ -0,0 +1,452 @@
+"""
+Multi-tenant client pool for TouristeSIM SDK
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+
+from . import TouristEsim
+from .config import Config
+from .http_client import HttpClient
+from .auth.oauth import OAuthClient
+from .deadline import Deadline
+from .circuit_breaker import CircuitBreakerRegistry
+from .exceptions import RateLimitException, TimeoutException
+
+if TYPE_CHECKING:
+    import requests
+    from .hedging import HedgePolicy
+    from .routing import EndpointRouter
+
+
+class FairScheduler:
+    """
+    Concurrency limiter that hands out free slots round-robin across tenants.
+    
+    At most capacity requests run at once, and at most per_tenant for a
+    single tenant. When slots are contended, each tenant with waiting
+    requests gets one slot in turn, so a tenant with a deep backlog cannot
+    starve the others.
+    """
+    
+    def __init__(self, capacity: int = 32, per_tenant: int = 4):
+        self.capacity = capacity
+        self.per_tenant = per_tenant
+        self._active = 0
+        self._running: Dict[str, int] = {}
+        self._waiters: Dict[str, Deque[threading.Event]] = {}
+        self._turns: Deque[str] = deque()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tenant: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot, returns False when timeout passes first"""
+        with self._lock:
+            if not self._turns and self._can_run(tenant):
+                self._grant(tenant)
+                return True
+            ticket = threading.Event()
+            waiters = self._waiters.get(tenant)
+            if waiters is None:
+                waiters = self._waiters[tenant] = deque()
+                self._turns.append(tenant)
+            waiters.append(ticket)
+            self._dispatch()
+        if ticket.wait(timeout):
+            return True
+        with self._lock:
+            if ticket.is_set():
+                return True
+            waiters = self._waiters.get(tenant)
+            if waiters is not None:
+                waiters.remove(ticket)
+                if not waiters:
+                    del self._waiters[tenant]
+                    self._turns.remove(tenant)
+            return False
+    
+    def release(self, tenant: str):
+        with self._lock:
+            self._active -= 1
+            running = self._running[tenant] - 1
+            if running:
+                self._running[tenant] = running
+            else:
+                del self._running[tenant]
+            self._dispatch()
+    
+    def running(self, tenant: str) -> int:
+        return self._running.get(tenant, 0)
+    
+    def waiting(self, tenant: str) -> int:
+        return len(self._waiters.get(tenant, ()))
+    
+    def _can_run(self, tenant: str) -> bool:
+        return self._active < self.capacity and self._running.get(tenant, 0) < self.per_tenant
+    
+    def _grant(self, tenant: str):
+        self._active += 1
+        self._running[tenant] = self._running.get(tenant, 0) + 1
+    
+    def _dispatch(self):
+        # One pass over the tenants in turn order, one slot each
+        for _ in range(len(self._turns)):
+            if self._active >= self.capacity:
+                return
+            tenant = self._turns.popleft()
+            waiters = self._waiters[tenant]
+            if self._running.get(tenant, 0) < self.per_tenant:
+                self._grant(tenant)
+                waiters.popleft().set()
+            if waiters:
+                self._turns.append(tenant)
+            else:
+                del self._waiters[tenant]
+
+
+class TenantMetrics:
+    """Request counters for one tenant"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.queue_time = 0.0
+        self.request_time = 0.0
+        self._lock = threading.Lock()
+    
+    def record(self, queued: float, elapsed: float, error: bool, throttled: bool):
+        with self._lock:
+            self.requests += 1
+            self.queue_time += queued
+            self.request_time += elapsed
+            if error:
+                self.errors += 1
+            if throttled:
+                self.throttled += 1
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'throttled': self.throttled,
+            'avg_queue_time': self.queue_time / self.requests if self.requests else 0.0,
+            'avg_request_time': self.request_time / self.requests if self.requests else 0.0,
+        }
+
+
+class _TokenBucket:
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token, returns seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+            self._refilled_at = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+    
+    def refund(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
+
+
+class _Tenant:
+    """Credentials and long-lived state of one tenant (kept across eviction)"""
+    
+    def __init__(self, tenant_id: str, client_id: str, client_secret: str, options: Dict[str, Any], bucket: Optional[_TokenBucket]):
+        self.tenant_id = tenant_id
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.options = options
+        self.bucket = bucket
+        self.metrics = TenantMetrics()
+        self.client: Optional[TouristEsim] = None
+        self.last_used = 0.0
+
+
+class _TenantHttpClient(HttpClient):
+    """HttpClient that goes through the pool's rate limit and fair scheduler"""
+    
+    def __init__(self, config: Config, oauth: OAuthClient, pool: 'TouristEsimPool', tenant: _Tenant):
+        shared = {'circuit_breakers': pool.circuit_breakers, 'hedging': pool.hedging}
+        # A tenant with base URLs of its own routes between them itself
+        if config.get_base_urls() == pool.base_urls:
+            shared['router'] = pool.router
+        super().__init__(config, oauth, shared)
+        self.pool = pool
+        self.tenant = tenant
+    
+    @property
+    def session(self) -> 'requests.Session':
+        return self.pool.session
+    
+    @session.setter
+    def session(self, session: 'requests.Session'):
+        self.pool.session = session
+    
+    def _send(self, method: str, endpoint: str, params=None, data=None, deadline: Optional[Deadline] = None, priority: Optional[str] = None, raw: bool = False):
+        deadline = deadline or Deadline()
+        tenant = self.tenant
+        queued_at = time.monotonic()
+        throttled = False
+        if tenant.bucket is not None:
+            wait = tenant.bucket.reserve()
+            if wait > 0:
+                throttled = True
+                if not deadline.can_wait(wait):
+                    tenant.bucket.refund()
+                    tenant.metrics.record(time.monotonic() - queued_at, 0.0, True, True)
+                    raise RateLimitException('Tenant rate limit exceeded', max(1, math.ceil(wait)))
+                time.sleep(wait)
+        if not self.pool.scheduler.acquire(tenant.tenant_id, deadline.remaining()):
+            tenant.metrics.record(time.monotonic() - queued_at, 0.0, True, throttled)
+            raise TimeoutException.deadline_exceeded(deadline.seconds)
+        started = time.monotonic()
+        error = True
+        try:
+            result = super()._send(method, endpoint, params, data, deadline, priority, raw)
+            error = False
+            return result
+        finally:
+            self.pool.scheduler.release(tenant.tenant_id)
+            tenant.metrics.record(started - queued_at, time.monotonic() - started, error, throttled)
+
+
+class TouristEsimPool:
+    """
+    Clients for many partner credentials sharing one connection pool.
+    
+    Tenants are registered with add() and their TouristEsim client is built
+    on first use. Every client sends through the same requests session, so
+    connections are reused across tenants, while tokens, coalescing and
+    transfer stats stay per tenant. Each tenant has its own request rate
+    limit, and a fair scheduler caps concurrency overall and per tenant.
+    Clients of idle tenants are evicted least recently used first; their
+    credentials and metrics are kept, so the next call rebuilds the client.
+    """
+    
+    def __init__(
+        self,
+        options: Optional[Dict[str, Any]] = None,
+        max_clients: int = 256,
+        idle_timeout: Optional[float] = 900,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_concurrency: int = 32,
+        tenant_concurrency: int = 4,
+    ):
+        self.options = dict(options or {})
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.scheduler = FairScheduler(max_concurrency, tenant_concurrency)
+        self._tenants: Dict[str, _Tenant] = {}
+        self._clients: 'OrderedDict[str, _Tenant]' = OrderedDict()
+        self._session: Optional['requests.Session'] = None
+        self._lock = threading.RLock()
+        # Clients dropped under the lock, closed once it is released
+        self._dropped: List[TouristEsim] = []
+        self.evictions = 0
+        
+        # Endpoint health, routing and hedging are shared by all tenants
+        shared = Config('', '', self.options)
+        self._shared = shared
+        self.base_urls = shared.get_base_urls()
+        breaker_options = shared.get_circuit_breaker_options()
+        self.circuit_breakers = CircuitBreakerRegistry(breaker_options) if breaker_options is not None else None
+        hedging_options = shared.get_hedging_options()
+        self.hedging: Optional['HedgePolicy'] = None
+        if hedging_options is not None:
+            from .hedging import HedgePolicy
+            self.hedging = HedgePolicy(**hedging_options)
+        routing_options = shared.get_endpoint_routing_options()
+        self.router: Optional['EndpointRouter'] = None
+        if routing_options is not None:
+            from .routing import EndpointRouter
+            self.router = EndpointRouter(shared.get_base_urls(), probe=self._probe, **routing_options)
+    
+    @property
+    def session(self) -> 'requests.Session':
+        """Shared HTTP session, sized for max_concurrency connections"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import http.cookiejar
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.scheduler.capacity)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    # Never carry cookies from one tenant's responses to another
+                    session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                    self._session = session
+        return self._session
+    
+    @session.setter
+    def session(self, session: 'requests.Session'):
+        self._session = session
+    
+    def add(
+        self,
+        tenant_id: str,
+        client_id: str,
+        client_secret: str,
+        options: Optional[Dict[str, Any]] = None,
+        requests_per_second: Optional[float] = None,
+    ):
+        """Register tenant credentials, options are merged over the pool options"""
+        rate = requests_per_second if requests_per_second is not None else self.requests_per_second
+        bucket = _TokenBucket(rate, self.burst) if rate else None
+        tenant = _Tenant(tenant_id, client_id, client_secret, {**self.options, **(options or {})}, bucket)
+        with self._lock:
+            self._drop_client(tenant_id)
+            self._tenants[tenant_id] = tenant
+        self._close_dropped()
+    
+    def remove(self, tenant_id: str):
+        with self._lock:
+            self._drop_client(tenant_id)
+            self._tenants.pop(tenant_id, None)
+        self._close_dropped()
+    
+    def client(self, tenant_id: str) -> TouristEsim:
+        """Get tenant's client, building it on first use"""
+        with self._lock:
+            tenant = self._tenants.get(tenant_id)
+            if tenant is None:
+                raise KeyError(f'Unknown tenant {tenant_id!r}')
+            tenant.last_used = time.monotonic()
+            if tenant.client is not None:
+                self._clients.move_to_end(tenant_id)
+                return tenant.client
+            client = tenant.client = self._build(tenant)
+            self._clients[tenant_id] = tenant
+            self._evict()
+        self._close_dropped()
+        return client
+    
+    def __getitem__(self, tenant_id: str) -> TouristEsim:
+        return self.client(tenant_id)
+    
+    def __contains__(self, tenant_id: str) -> bool:
+        return tenant_id in self._tenants
+    
+    def tenants(self) -> List[str]:
+        return list(self._tenants)
+    
+    def active_clients(self) -> int:
+        """Get number of tenants with a built client"""
+        return len(self._clients)
+    
+    def evict_idle(self) -> int:
+        """Close clients unused for idle_timeout seconds, returns number evicted"""
+        with self._lock:
+            evicted = self._evict_idle()
+        self._close_dropped()
+        return evicted
+    
+    def get_stats(self, tenant_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get per-tenant metrics (one tenant when tenant_id is given)"""
+        if tenant_id is not None:
+            return self._tenant_stats(self._tenants[tenant_id])
+        return {
+            'tenants': len(self._tenants),
+            'active_clients': len(self._clients),
+            'evictions': self.evictions,
+            'per_tenant': {tenant_id: self._tenant_stats(tenant) for tenant_id, tenant in list(self._tenants.items())},
+        }
+    
+    def close(self):
+        """Close all clients and the shared session"""
+        with self._lock:
+            for tenant_id in list(self._clients):
+                self._drop_client(tenant_id)
+        self._close_dropped()
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if self.hedging is not None:
+            self.hedging.close()
+        if self.router is not None:
+            self.router.close()
+    
+    def _probe(self, url: str) -> bool:
+        timeout = self._shared.get_connect_timeout()
+        response = self.session.get(url, timeout=(timeout, timeout), verify=self._shared.should_verify_ssl())
+        response.close()
+        return response.status_code < 500
+    
+    def __enter__(self) -> 'TouristEsimPool':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def _build(self, tenant: _Tenant) -> TouristEsim:
+        client = TouristEsim(
+            tenant.client_id,
+            tenant.client_secret,
+            tenant.options,
+            http_client=lambda config, oauth: _TenantHttpClient(config, oauth, self, tenant),
+        )
+        client.oauth.http_client = self.session
+        return client
+    
+    def _evict(self):
+        self._evict_idle()
+        while len(self._clients) > self.max_clients:
+            for tenant_id in self._clients:
+                if not self.scheduler.running(tenant_id) and not self.scheduler.waiting(tenant_id):
+                    self._drop_client(tenant_id)
+                    self.evictions += 1
+                    break
+            else:
+                # Every client is busy, allow going over the limit
+                return
+    
+    def _evict_idle(self) -> int:
+        if self.idle_timeout is None:
+            return 0
+        cutoff = time.monotonic() - self.idle_timeout
+        evicted = 0
+        for tenant_id, tenant in list(self._clients.items()):
+            if tenant.last_used > cutoff:
+                break
+            if self.scheduler.running(tenant_id) or self.scheduler.waiting(tenant_id):
+                continue
+            self._drop_client(tenant_id)
+            evicted += 1
+        self.evictions += evicted
+        return evicted
+    
+    def _drop_client(self, tenant_id: str):
+        tenant = self._clients.pop(tenant_id, None)
+        if tenant is not None:
+            self._dropped.append(tenant.client)
+            tenant.client = None
+    
+    def _close_dropped(self):
+        """Stop the per-tenant threads and timers of dropped clients, shared components stay open"""
+        with self._lock:
+            dropped, self._dropped = self._dropped, []
+        for client in dropped:
+            client.close()
+    
+    def _tenant_stats(self, tenant: _Tenant) -> Dict[str, Any]:
+        stats = tenant.metrics.to_dict()
+        stats['running'] = self.scheduler.running(tenant.tenant_id)
+        stats['waiting'] = self.scheduler.waiting(tenant.tenant_id)
+        stats['active'] = tenant.client is not None
+        return stats
@@ -0,0 +1,211 @@
+"""
+Priority-aware request scheduling for TouristeSIM SDK
+"""
+import copy
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Optional, Tuple
+
+HIGH = 'high'
+NORMAL = 'normal'
+LOW = 'low'
+
+DEFAULT_WEIGHTS = {HIGH: 8, NORMAL: 4, LOW: 1}
+
+_current_priority: ContextVar[Optional[str]] = ContextVar('touristesim_priority', default=None)
+
+
+def current_priority() -> Optional[str]:
+    """Get priority set by the innermost priority() block"""
+    return _current_priority.get()
+
+
+@contextmanager
+def priority(name: str) -> Iterator[None]:
+    """Run calls made in the block (in this thread or task) with the given priority"""
+    token = _current_priority.set(name)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class _ClassStats:
+    
+    def __init__(self):
+        self.dispatched = 0
+        self.running = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+        self.timeouts = 0
+    
+    def to_dict(self, queued: int) -> Dict[str, Any]:
+        return {
+            'queued': queued,
+            'running': self.running,
+            'dispatched': self.dispatched,
+            'timeouts': self.timeouts,
+            'avg_wait': self.wait_time / self.dispatched if self.dispatched else 0.0,
+            'max_wait': self.max_wait,
+        }
+
+
+class PriorityScheduler:
+    """
+    Limit in-flight requests and dequeue waiting ones by priority class.
+    
+    Each class has its own FIFO queue. Free slots go to the preemptive
+    class (high) first, ahead of any lower-priority requests already
+    queued; the remaining classes share slots in proportion to their
+    weights (stride scheduling), so low-priority work slows down under
+    load but is never starved. reserved slots are only used by the
+    preemptive class, so it does not wait for a running bulk job.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        weights: Optional[Dict[str, float]] = None,
+        reserved: int = 1,
+        preemptive: str = HIGH,
+        default: str = NORMAL,
+    ):
+        self.max_concurrency = max_concurrency
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.reserved = min(reserved, max_concurrency - 1)
+        self.preemptive = preemptive
+        self.default = default
+        self._queues: Dict[str, Deque[Tuple[float, threading.Event]]] = {name: deque() for name in self.weights}
+        self._pass: Dict[str, float] = {name: 0.0 for name in self.weights}
+        self._stats: Dict[str, _ClassStats] = {name: _ClassStats() for name in self.weights}
+        self._active = 0
+        self._lock = threading.Lock()
+    
+    def resolve(self, name: Optional[str]) -> str:
+        """Get class for explicit priority, the priority() block or the default"""
+        name = name or current_priority() or self.default
+        if name not in self.weights:
+            raise ValueError(f"Unknown priority '{name}', expected one of {', '.join(self.weights)}")
+        return name
+    
+    def acquire(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a slot, returns False when timeout passes first"""
+        queued_at = time.monotonic()
+        with self._lock:
+            if self._can_start(name) and not self._has_waiters_before(name):
+                self._start(name, 0.0)
+                return True
+            ticket = threading.Event()
+            entry = (queued_at, ticket)
+            self._queues[name].append(entry)
+        if ticket.wait(timeout):
+            return True
+        with self._lock:
+            if ticket.is_set():
+                return True
+            self._queues[name].remove(entry)
+            self._stats[name].timeouts += 1
+            return False
+    
+    def release(self, name: str):
+        with self._lock:
+            self._active -= 1
+            self._stats[name].running -= 1
+            self._dispatch()
+    
+    @contextmanager
+    def slot(self, name: str, timeout: Optional[float] = None) -> Iterator[bool]:
+        """Hold a slot for the block, yields False when none was free within timeout"""
+        acquired = self.acquire(name, timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release(name)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: stats.to_dict(len(self._queues[name])) for name, stats in self._stats.items()}
+    
+    def _can_start(self, name: str) -> bool:
+        limit = self.max_concurrency if name == self.preemptive else self.max_concurrency - self.reserved
+        return self._active < limit
+    
+    def _has_waiters_before(self, name: str) -> bool:
+        if self._queues[name]:
+            return True
+        if name != self.preemptive and self.preemptive in self._queues and self._queues[self.preemptive]:
+            return True
+        return False
+    
+    def _start(self, name: str, waited: float):
+        self._active += 1
+        stats = self._stats[name]
+        stats.running += 1
+        stats.dispatched += 1
+        stats.wait_time += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        # Advance the class's pass so the next pick favours other classes
+        floor = min(self._pass.values())
+        self._pass[name] = max(self._pass[name], floor) + 1.0 / self.weights[name]
+    
+    def _dispatch(self):
+        while True:
+            name = self._next_class()
+            if name is None:
+                return
+            queued_at, ticket = self._queues[name].popleft()
+            self._start(name, time.monotonic() - queued_at)
+            ticket.set()
+    
+    def _next_class(self) -> Optional[str]:
+        if self._queues.get(self.preemptive) and self._can_start(self.preemptive):
+            return self.preemptive
+        candidates = [
+            name for name, queue in self._queues.items()
+            if queue and name != self.preemptive and self._can_start(name)
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda name: self._pass[name])
+
+
+class PrioritizedClient:
+    """HttpClient view that sends every call with a fixed priority"""
+    
+    def __init__(self, client: Any, priority: str):
+        self._client = client
+        self._priority = priority
+    
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None, priority: Optional[str] = None):
+        return self._client.get(endpoint, params, deadline, self._resolve(priority))
+    
+    def get_raw(self, endpoint: str, params: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None, priority: Optional[str] = None):
+        return self._client.get_raw(endpoint, params, deadline, self._resolve(priority))
+    
+    def post(self, endpoint: str, data: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None, priority: Optional[str] = None):
+        return self._client.post(endpoint, data, deadline, self._resolve(priority))
+    
+    def put(self, endpoint: str, data: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None, priority: Optional[str] = None):
+        return self._client.put(endpoint, data, deadline, self._resolve(priority))
+    
+    def delete(self, endpoint: str, data: Optional[Dict[str, Any]] = None, deadline: Optional[float] = None, priority: Optional[str] = None):
+        return self._client.delete(endpoint, data, deadline, self._resolve(priority))
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+    
+    def _resolve(self, priority: Optional[str]) -> str:
+        # An explicit priority or a priority() block wins over the resource's
+        return priority or current_priority() or self._priority
+
+
+def with_priority(resource: Any, priority: str) -> Any:
+    """Copy resource so all its calls use priority"""
+    prioritized = copy.copy(resource)
+    client = resource.client._client if isinstance(resource.client, PrioritizedClient) else resource.client
+    prioritized.client = PrioritizedClient(client, priority)
+    return prioritized
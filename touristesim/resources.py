@@ -1,23 +1,66 @@
 """
 TouristeSIM SDK Resources
 """
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Union
 
-from .models import Plan, Country, Order, Esim
-from .collections import Collection, PaginatedCollection
+from .models import Plan, Country, Order, Esim, BalanceTransaction
+from .collections import Collection, PaginatedCollection, iterate_pages
+from .export import Exporter, ExportResult
 from .http_client import HttpClient
+from .events import EventDispatcher
+from .waiter import OrderWaiter
+from .exceptions import ResourceNotFoundException
+
+if TYPE_CHECKING:
+    from .itinerary import ItineraryOptimizer, ItineraryOption
+    from .decoding import PageDecoder
 
 
 class Resource:
     """Base Resource class"""
     
-    def __init__(self, client: HttpClient):
+    def __init__(self, client: HttpClient, events: Optional[EventDispatcher] = None):
         self.client = client
+        self.events = events
+    
+    def with_priority(self, priority: str) -> 'Resource':
+        """Get copy of resource whose calls use priority ('high', 'normal', 'low')"""
+        from .priority import with_priority
+        return with_priority(self, priority)
+    
+    def _decoded_pages(
+        self,
+        endpoint: str,
+        list_key: str,
+        model: type,
+        filters: Optional[Dict[str, Any]],
+        per_page: int,
+        workers: Union[int, 'PageDecoder'],
+    ) -> Iterator[PaginatedCollection]:
+        """Iterate over pages decoded in worker processes"""
+        from .decoding import decoded_pages
+        
+        def fetch(page: int) -> bytes:
+            return self.client.get_raw(endpoint, {**(filters or {}), 'page': page, 'per_page': per_page})
+        
+        for page in decoded_pages(workers, fetch, list_key, model):
+            yield page.to_collection(model)
+    
+    def _raw_fetch(self, endpoint: str) -> Callable[[Dict[str, Any]], bytes]:
+        return lambda params: self.client.get_raw(endpoint, params)
 
 
 class Plans(Resource):
     """Plans Resource"""
     
+    def __init__(self, client: HttpClient, events: Optional[EventDispatcher] = None):
+        super().__init__(client, events)
+        self._itinerary: Optional['ItineraryOptimizer'] = None
+        self._catalog: Optional[Callable[[], Iterable[Plan]]] = None
+        self._lock = threading.Lock()
+    
     def get(self, filters: Optional[Dict[str, Any]] = None) -> PaginatedCollection:
         """Get all plans with filters"""
         response = self.client.get('/plans', params=filters)
@@ -50,6 +93,44 @@ class Plans(Resource):
         """Get global plans"""
         response = self.client.get('/plans', {'type': 'global', 'per_page': per_page})
         return Collection.make(response.get('data', {}).get('plans', []), Plan)
+    
+    def optimize_itinerary(
+        self,
+        countries: Sequence[str],
+        days: Union[int, Dict[str, int]] = 0,
+        min_gb: float = 0,
+        limit: int = 3,
+        max_plans: Optional[int] = None,
+        time_budget: Optional[float] = 0.05,
+    ) -> List['ItineraryOption']:
+        """Get cheapest plans or plan combinations covering all countries of a trip, best first"""
+        return self.itinerary_optimizer().optimize(countries, days, min_gb, limit, max_plans, time_budget)
+    
+    def itinerary_optimizer(self, max_age: Optional[float] = 3600) -> 'ItineraryOptimizer':
+        """Get optimizer over the locally indexed catalog, rebuilt when older than max_age"""
+        optimizer = self._itinerary
+        if optimizer is None or (max_age is not None and time.time() - optimizer.built_at > max_age):
+            from .itinerary import ItineraryOptimizer
+            with self._lock:
+                # Another caller may have rebuilt it while this one waited
+                optimizer = self._itinerary
+                if optimizer is None or (max_age is not None and time.time() - optimizer.built_at > max_age):
+                    optimizer = ItineraryOptimizer(self._catalog() if self._catalog is not None else self.all_plans())
+                    self._itinerary = optimizer
+        return optimizer
+    
+    def set_catalog(self, source: Optional[Callable[[], Iterable[Plan]]]):
+        """Use source (e.g. a catalog snapshot) instead of the API to index plans"""
+        with self._lock:
+            self._catalog = source
+            self._itinerary = None
+    
+    def all_plans(self) -> List[Plan]:
+        """Get every plan, following pagination"""
+        plans: List[Plan] = []
+        for page in iterate_pages(self.get):
+            plans.extend(page.all())
+        return plans
 
 
 class Countries(Resource):
@@ -61,11 +142,11 @@ class Countries(Resource):
         return Collection.make(response.get('data', {}).get('countries', []), Country)
     
     def find(self, code: str) -> Optional[Country]:
-        """Find country by code"""
+        """Find country by code, returns None for unknown codes"""
         try:
             response = self.client.get(f'/countries/{code}')
             return Country(response.get('data', {}))
-        except:
+        except ResourceNotFoundException:
             return None
     
     def search(self, query: str) -> Collection:
@@ -96,6 +177,11 @@ class Regions(Resource):
 class Orders(Resource):
     """Orders Resource"""
     
+    def __init__(self, client: HttpClient, events: Optional[EventDispatcher] = None):
+        super().__init__(client, events)
+        self._waiter: Optional[OrderWaiter] = None
+        self._lock = threading.Lock()
+    
     def all(self, filters: Optional[Dict[str, Any]] = None) -> PaginatedCollection:
         """Get all orders"""
         response = self.client.get('/orders', params=filters)
@@ -104,6 +190,31 @@ class Orders(Resource):
             response.get('data', {}).get('pagination', {})
         )
     
+    def pages(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        workers: Optional[Union[int, 'PageDecoder']] = None,
+    ) -> Iterator[PaginatedCollection]:
+        """Iterate over all pages of orders, decoded in worker processes when workers is set"""
+        if workers:
+            return self._decoded_pages('/orders', 'orders', Order, filters, per_page, workers)
+        return iterate_pages(self.all, filters, per_page)
+    
+    def export(
+        self,
+        path: str,
+        format: str = 'ndjson',
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_page: int = 1,
+        per_page: int = 100,
+        workers: Optional[Union[int, 'PageDecoder']] = None,
+    ) -> ExportResult:
+        """Stream orders to an NDJSON, CSV or Parquet file, decoding in worker processes when workers is set"""
+        exporter = Exporter(self.all, filters, per_page, self._raw_fetch('/orders'), 'orders', Order)
+        return exporter.export(path, format, columns, start_page, workers=workers)
+    
     def find(self, order_id: int) -> Order:
         """Get single order"""
         response = self.client.get(f'/orders/{order_id}')
@@ -118,6 +229,22 @@ class Orders(Resource):
         """Cancel order"""
         self.client.post(f'/orders/{order_id}/cancel', {})
         return True
+    
+    def wait_until_complete(self, order_id: int, timeout: float = 300) -> Order:
+        """Wait until order is completed, failed or cancelled"""
+        return self.waiter().wait(order_id, timeout)
+    
+    async def wait_until_complete_async(self, order_id: int, timeout: float = 300) -> Order:
+        """Async version of wait_until_complete"""
+        return await self.waiter().wait_async(order_id, timeout)
+    
+    def waiter(self) -> OrderWaiter:
+        """Get shared order waiter"""
+        if self._waiter is None:
+            with self._lock:
+                if self._waiter is None:
+                    self._waiter = OrderWaiter(self, self.events, **self.client.config.get_order_waiter_options())
+        return self._waiter
 
 
 class Esims(Resource):
@@ -131,6 +258,31 @@ class Esims(Resource):
             response.get('data', {}).get('pagination', {})
         )
     
+    def pages(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        per_page: int = 100,
+        workers: Optional[Union[int, 'PageDecoder']] = None,
+    ) -> Iterator[PaginatedCollection]:
+        """Iterate over all pages of eSIMs, decoded in worker processes when workers is set"""
+        if workers:
+            return self._decoded_pages('/esims', 'esims', Esim, filters, per_page, workers)
+        return iterate_pages(self.all, filters, per_page)
+    
+    def export(
+        self,
+        path: str,
+        format: str = 'ndjson',
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_page: int = 1,
+        per_page: int = 100,
+        workers: Optional[Union[int, 'PageDecoder']] = None,
+    ) -> ExportResult:
+        """Stream eSIMs to an NDJSON, CSV or Parquet file, decoding in worker processes when workers is set"""
+        exporter = Exporter(self.all, filters, per_page, self._raw_fetch('/esims'), 'esims', Esim)
+        return exporter.export(path, format, columns, start_page, workers=workers)
+    
     def find(self, iccid: str) -> Esim:
         """Get single esim"""
         response = self.client.get(f'/esims/{iccid}')
@@ -177,6 +329,29 @@ class Balance(Resource):
             response.get('data', {}).get('history', []),
             response.get('data', {}).get('pagination', {})
         )
+    
+    def history_pages(self, filters: Optional[Dict[str, Any]] = None, per_page: int = 100) -> Iterator[PaginatedCollection]:
+        """Iterate over all pages of balance history as BalanceTransaction models"""
+        return iterate_pages(self._transactions, filters, per_page)
+    
+    def export_history(
+        self,
+        path: str,
+        format: str = 'ndjson',
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        start_page: int = 1,
+        per_page: int = 100,
+        workers: Optional[Union[int, 'PageDecoder']] = None,
+    ) -> ExportResult:
+        """Stream balance history to an NDJSON, CSV or Parquet file, decoding in worker processes when workers is set"""
+        exporter = Exporter(self._transactions, filters, per_page, self._raw_fetch('/balance/history'), 'history', BalanceTransaction)
+        return exporter.export(path, format, columns, start_page, workers=workers)
+    
+    def _transactions(self, filters: Optional[Dict[str, Any]] = None) -> PaginatedCollection:
+        """Get a page of balance history as BalanceTransaction models"""
+        page = self.history(filters)
+        return PaginatedCollection(Collection.make(page.all(), BalanceTransaction).all(), page.pagination)
 
 
 class Webhooks(Resource):
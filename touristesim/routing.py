@@ -0,0 +1,159 @@
+"""
+Latency-aware routing across equivalent API endpoints for TouristeSIM SDK
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class EndpointStats:
+    """Moving latency and error averages of one base URL"""
+    
+    def __init__(self, url: str, index: int):
+        self.url = url
+        self.index = index
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.healthy = True
+        self.down_since: Optional[float] = None
+        self.requests = 0
+        self.failovers = 0
+        self.probes = 0
+    
+    def score(self, error_penalty: float) -> float:
+        """Get routing cost, lower is better (unmeasured endpoints score 0 so they get sampled)"""
+        return (self.latency or 0.0) * (1 + error_penalty * self.error_rate)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'healthy': self.healthy,
+            'latency': self.latency,
+            'error_rate': self.error_rate,
+            'requests': self.requests,
+            'failovers': self.failovers,
+            'probes': self.probes,
+            'down_for': None if self.down_since is None else time.monotonic() - self.down_since,
+        }
+
+
+class EndpointRouter:
+    """
+    Route requests to the fastest healthy endpoint among equivalent base URLs.
+    
+    Every response updates the endpoint's exponentially weighted latency
+    and error rate (5xx). choose() returns the healthy endpoint with the
+    lowest latency, inflated by its error rate. failure_threshold
+    consecutive connection failures take an endpoint out of rotation;
+    a background thread then probes it every probe_interval seconds and
+    puts it back once it answers. When every endpoint is down, the one
+    down the longest is tried.
+    """
+    
+    def __init__(
+        self,
+        urls: Sequence[str],
+        probe: Optional[Callable[[str], bool]] = None,
+        smoothing: float = 0.2,
+        error_penalty: float = 4.0,
+        failure_threshold: int = 1,
+        probe_interval: float = 5.0,
+        probe_path: str = '',
+    ):
+        if not urls:
+            raise ValueError('At least one endpoint is required')
+        self.endpoints = [EndpointStats(url.rstrip('/'), index) for index, url in enumerate(urls)]
+        self._by_url = {stats.url: stats for stats in self.endpoints}
+        self.probe = probe
+        self.smoothing = smoothing
+        self.error_penalty = error_penalty
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.probe_path = probe_path
+        self._lock = threading.Lock()
+        self._prober: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+    
+    def choose(self, exclude: Sequence[str] = ()) -> Optional[str]:
+        """Get best endpoint not in exclude, None when all are excluded"""
+        with self._lock:
+            candidates = [stats for stats in self.endpoints if stats.url not in exclude]
+            if not candidates:
+                return None
+            healthy = [stats for stats in candidates if stats.healthy]
+            if healthy:
+                best = min(healthy, key=lambda stats: (stats.score(self.error_penalty), stats.index))
+            else:
+                best = min(candidates, key=lambda stats: stats.down_since or 0.0)
+            best.requests += 1
+            return best.url
+    
+    def record_response(self, url: str, latency: float, error: bool = False):
+        """Record a response (error for 5xx), the endpoint is reachable either way"""
+        with self._lock:
+            stats = self._by_url.get(url)
+            if stats is None:
+                return
+            stats.latency = latency if stats.latency is None else stats.latency + self.smoothing * (latency - stats.latency)
+            stats.error_rate += self.smoothing * ((1.0 if error else 0.0) - stats.error_rate)
+            self._mark_up(stats)
+    
+    def record_failure(self, url: str):
+        """Record a connection failure, taking the endpoint out of rotation at the threshold"""
+        with self._lock:
+            stats = self._by_url.get(url)
+            if stats is None:
+                return
+            stats.failures += 1
+            stats.failovers += 1
+            stats.error_rate += self.smoothing * (1.0 - stats.error_rate)
+            if stats.healthy and stats.failures >= self.failure_threshold:
+                stats.healthy = False
+                stats.down_since = time.monotonic()
+                self._start_prober()
+    
+    def healthy(self) -> List[str]:
+        with self._lock:
+            return [stats.url for stats in self.endpoints if stats.healthy]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {stats.url: stats.to_dict() for stats in self.endpoints}
+    
+    def close(self):
+        """Stop background probing"""
+        self._closed.set()
+    
+    def _mark_up(self, stats: EndpointStats):
+        stats.failures = 0
+        stats.healthy = True
+        stats.down_since = None
+    
+    def _start_prober(self):
+        if self.probe is None or self._closed.is_set():
+            return
+        if self._prober is not None and self._prober.is_alive():
+            return
+        self._prober = threading.Thread(target=self._probe_loop, name='touristesim-endpoint-probe', daemon=True)
+        self._prober.start()
+    
+    def _probe_loop(self):
+        while not self._closed.wait(self.probe_interval):
+            with self._lock:
+                down = [stats for stats in self.endpoints if not stats.healthy]
+                if not down:
+                    self._prober = None
+                    return
+            for stats in down:
+                started = time.monotonic()
+                try:
+                    reachable = self.probe(f"{stats.url}{self.probe_path}")
+                except Exception:
+                    reachable = False
+                with self._lock:
+                    stats.probes += 1
+                    if reachable and not stats.healthy:
+                        # Start from the probe's latency, older samples describe the outage
+                        stats.latency = time.monotonic() - started
+                        stats.error_rate = 0.0
+                        self._mark_up(stats)
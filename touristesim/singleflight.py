@@ -0,0 +1,94 @@
+"""
+Single-flight request coalescing for TouristeSIM SDK
+"""
+import copy
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional
+
+from .exceptions import TimeoutException
+
+if TYPE_CHECKING:
+    from .deadline import Deadline
+
+
+class _Call:
+    """In-flight call shared by concurrent callers"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls onto a single in-flight call.
+    
+    The first caller for a key executes the call, callers arriving while it
+    is in flight wait for it and receive their own deep copy of the result.
+    A waiting caller gives up when its own deadline passes, the call keeps
+    running for the others. When the call fails because the first caller's
+    deadline passed, waiting callers with time left retry it themselves.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any], deadline: Optional['Deadline'] = None) -> Any:
+        """Run fn once for all concurrent callers with the same key"""
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                if call is not None:
+                    call.followers += 1
+                    self.coalesced += 1
+                    leader = False
+                else:
+                    call = _Call()
+                    self._calls[key] = call
+                    self.executed += 1
+                    leader = True
+            
+            if leader:
+                try:
+                    call.result = fn()
+                except BaseException as e:
+                    call.error = e
+                finally:
+                    with self._lock:
+                        del self._calls[key]
+                    call.done.set()
+            elif not call.done.wait(deadline.remaining() if deadline is not None else None):
+                with self._lock:
+                    call.followers -= 1
+                raise TimeoutException.deadline_exceeded(deadline.seconds)
+            
+            if call.error is not None:
+                if not leader and isinstance(call.error, TimeoutException) and not (deadline is not None and deadline.is_expired()):
+                    # The leader ran out of its own deadline, not ours, so run the call again
+                    continue
+                raise call.error
+            if leader and call.followers == 0:
+                return call.result
+            return copy.deepcopy(call.result)
+    
+    def in_flight(self) -> int:
+        return len(self._calls)
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._calls),
+        }
+    
+    @staticmethod
+    def make_key(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build key from method, endpoint and normalized params"""
+        normalized = json.dumps(params or {}, sort_keys=True, separators=(',', ':'), default=str)
+        return f'{method.upper()} {endpoint} {normalized}'
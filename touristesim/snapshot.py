@@ -0,0 +1,245 @@
+"""
+On-disk catalog snapshots for TouristeSIM SDK
+"""
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+MAGIC = b'TESNAP'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<6sHI')
+_OFFSET = struct.Struct('<Q')
+
+
+class SnapshotSection:
+    """
+    Read-only sequence of records in a snapshot section.
+    
+    Records are decoded on access straight from the memory-mapped file, so
+    opening a snapshot does not parse the catalog.
+    """
+    
+    def __init__(self, buffer: Any, index_offset: int, count: int, model: Optional[type] = None):
+        self._buffer = buffer
+        self._index_offset = index_offset
+        self._count = count
+        self._data_offset = index_offset + (count + 1) * _OFFSET.size
+        self.model = model
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('snapshot record index out of range')
+        start = _OFFSET.unpack_from(self._buffer, self._index_offset + index * _OFFSET.size)[0]
+        end = _OFFSET.unpack_from(self._buffer, self._index_offset + (index + 1) * _OFFSET.size)[0]
+        attributes = json.loads(bytes(self._buffer[self._data_offset + start:self._data_offset + end]))
+        return self.model(attributes) if self.model is not None else attributes
+    
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(self._count):
+            yield self[index]
+    
+    def all(self) -> List[Any]:
+        return list(self)
+
+
+class CatalogSnapshot:
+    """
+    Versioned, memory-mapped snapshot of catalog data (plans, countries, regions).
+    
+    The file is mapped read-only, so every worker process on a host shares
+    the same pages from the OS page cache. Files are replaced atomically,
+    so readers never observe a partially written snapshot.
+    """
+    
+    def __init__(self, path: str, models: Optional[Dict[str, type]] = None):
+        self.path = path
+        self.models = models or {}
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a catalog snapshot')
+        if version != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f'Unsupported catalog snapshot format version {version}')
+        try:
+            self.header: Dict[str, Any] = json.loads(
+                bytes(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_size])
+            )
+        except ValueError:
+            self._mmap.close()
+            raise ValueError(f'{path} has a corrupt catalog snapshot header')
+        if not isinstance(self.header, dict) or not isinstance(self.header.get('sections'), dict):
+            self._mmap.close()
+            raise ValueError(f'{path} has a corrupt catalog snapshot header')
+        self._base = _PREAMBLE.size + header_size
+    
+    @staticmethod
+    def write(
+        path: str,
+        sections: Dict[str, List[Any]],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Write snapshot atomically, returns path"""
+        encoded: Dict[str, List[bytes]] = {}
+        for name, records in sections.items():
+            encoded[name] = [
+                json.dumps(
+                    record.to_dict() if hasattr(record, 'to_dict') else record,
+                    separators=(',', ':'),
+                ).encode('utf-8')
+                for record in records
+            ]
+        
+        # Section offsets are relative to the end of the header
+        layout: Dict[str, Dict[str, int]] = {}
+        offset = 0
+        for name, records in encoded.items():
+            layout[name] = {'offset': offset, 'count': len(records)}
+            offset += (len(records) + 1) * _OFFSET.size + sum(len(record) for record in records)
+        header = json.dumps({
+            'created_at': time.time(),
+            'metadata': metadata or {},
+            'sections': layout,
+        }, separators=(',', ':')).encode('utf-8')
+        
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.catalog-', suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                output.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+                output.write(header)
+                for name, records in encoded.items():
+                    position = 0
+                    offsets = [0]
+                    for record in records:
+                        position += len(record)
+                        offsets.append(position)
+                    output.write(b''.join(_OFFSET.pack(value) for value in offsets))
+                    output.write(b''.join(records))
+                output.flush()
+                os.fsync(output.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return path
+    
+    def __enter__(self) -> 'CatalogSnapshot':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def section(self, name: str) -> SnapshotSection:
+        """Get records of a section"""
+        layout = self.header['sections'].get(name)
+        if layout is None:
+            return SnapshotSection(b'', 0, 0, self.models.get(name))
+        return SnapshotSection(self._mmap, self._base + layout['offset'], layout['count'], self.models.get(name))
+    
+    def sections(self) -> List[str]:
+        return list(self.header['sections'])
+    
+    def get_created_at(self) -> float:
+        return self.header['created_at']
+    
+    def get_age(self) -> float:
+        """Get snapshot age in seconds"""
+        return max(0.0, time.time() - self.header['created_at'])
+    
+    def is_stale(self, max_age: float) -> bool:
+        return self.get_age() > max_age
+    
+    def get_metadata(self) -> Dict[str, Any]:
+        return self.header.get('metadata', {})
+    
+    def close(self):
+        self._mmap.close()
+
+
+class CatalogSnapshotManager:
+    """Load a catalog snapshot at startup and revalidate it in the background"""
+    
+    def __init__(
+        self,
+        path: str,
+        fetch: Callable[[], Dict[str, List[Any]]],
+        models: Optional[Dict[str, type]] = None,
+        max_age: float = 3600,
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.path = path
+        self.fetch = fetch
+        self.models = models or {}
+        self.max_age = max_age
+        self.metadata = metadata or {}
+        self.snapshot: Optional[CatalogSnapshot] = None
+        self._listeners: List[Callable[[CatalogSnapshot], Any]] = []
+        self._refreshing: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.last_error: Optional[BaseException] = None
+    
+    def load(self, revalidate: bool = True) -> CatalogSnapshot:
+        """Load snapshot from disk, fetching it first when missing or unreadable"""
+        if not os.path.exists(self.path):
+            self.refresh()
+            return self.snapshot
+        try:
+            snapshot = CatalogSnapshot(self.path, self.models)
+        except (ValueError, struct.error) as e:
+            # Corrupt or truncated file, treat it as a cache miss
+            self.last_error = e
+            self.refresh()
+            return self.snapshot
+        self._swap(snapshot)
+        if revalidate and self.snapshot.is_stale(self.max_age):
+            self.revalidate()
+        return self.snapshot
+    
+    def refresh(self) -> CatalogSnapshot:
+        """Fetch catalog from the API and write a new snapshot"""
+        CatalogSnapshot.write(self.path, self.fetch(), self.metadata)
+        self._swap(CatalogSnapshot(self.path, self.models))
+        return self.snapshot
+    
+    def revalidate(self):
+        """Refresh snapshot in a background thread"""
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            self._refreshing = threading.Thread(target=self._background_refresh, name='touristesim-catalog', daemon=True)
+            self._refreshing.start()
+    
+    def on_refresh(self, callback: Callable[[CatalogSnapshot], Any]):
+        """Register listener called with each newly loaded snapshot"""
+        self._listeners.append(callback)
+        return callback
+    
+    def _background_refresh(self):
+        try:
+            self.refresh()
+            self.last_error = None
+        except Exception as e:
+            # Keep serving the current snapshot
+            self.last_error = e
+    
+    def _swap(self, snapshot: CatalogSnapshot):
+        previous, self.snapshot = self.snapshot, snapshot
+        for callback in list(self._listeners):
+            callback(snapshot)
+        if previous is not None:
+            # Listeners have moved to the new snapshot, release the old mapping
+            previous.close()
@@ -0,0 +1,170 @@
+"""
+Webhook-driven local state store for TouristeSIM SDK
+"""
+import copy
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from .models import Order, Esim
+from .collections import iterate_pages
+from .events import WebhookEvent
+from .resources import Orders, Esims
+
+
+class StateStore:
+    """
+    Local materialized view of eSIM and order state.
+    
+    Seeded once from the listing endpoints and kept current from webhook
+    events. Reads are dictionary lookups; the API is only called for
+    unknown entries or entries older than max_age seconds. Seeding never
+    overwrites an entry updated after the listing page was fetched.
+    """
+    
+    def __init__(self, orders: Orders, esims: Esims, max_age: Optional[float] = 300):
+        self.orders = orders
+        self.esims = esims
+        self.max_age = max_age
+        self._orders: Dict[Union[int, str], Tuple[Order, float]] = {}
+        self._esims: Dict[str, Tuple[Esim, float]] = {}
+        self._usage: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def seed(self, per_page: int = 100) -> int:
+        """Load all eSIMs and orders, returns number of stored entries"""
+        count = 0
+        fetched_at = [0.0]
+        
+        def timed(fetch: Callable) -> Callable:
+            def fetch_page(filters: Dict[str, Any]) -> Any:
+                fetched_at[0] = time.monotonic()
+                return fetch(filters)
+            return fetch_page
+        
+        for page in iterate_pages(timed(self.esims.all), per_page=per_page):
+            for esim in page:
+                count += self._store(self._esims, esim.get_iccid(), esim, fetched_at[0])
+        for page in iterate_pages(timed(self.orders.all), per_page=per_page):
+            for order in page:
+                count += self._store(self._orders, self._order_key(order.get('id')), order, fetched_at[0])
+        return count
+    
+    def esim(self, iccid: str) -> Esim:
+        """Get eSIM, fetching it when missing or stale"""
+        cached = self._lookup(self._esims, iccid)
+        if cached is not None:
+            return cached
+        return self.put_esim(self.esims.find(iccid))
+    
+    def order(self, order_id: int) -> Order:
+        """Get order, fetching it when missing or stale"""
+        cached = self._lookup(self._orders, self._order_key(order_id))
+        if cached is not None:
+            return cached
+        return self.put_order(self.orders.find(order_id))
+    
+    def usage(self, iccid: str) -> Dict[str, Any]:
+        """Get eSIM usage, fetching it when missing or stale"""
+        cached = self._lookup(self._usage, iccid)
+        if cached is not None:
+            return cached
+        usage = self.esims.usage(iccid)
+        with self._lock:
+            self._usage[iccid] = (_copy(usage), time.monotonic())
+        return usage
+    
+    def put_esim(self, esim: Esim) -> Esim:
+        """Store a copy of the eSIM"""
+        self._store(self._esims, esim.get_iccid(), _copy(esim))
+        return esim
+    
+    def put_order(self, order: Order) -> Order:
+        """Store a copy of the order"""
+        self._store(self._orders, self._order_key(order.get('id')), _copy(order))
+        return order
+    
+    def apply_event(self, event: WebhookEvent):
+        """Update state from a webhook event"""
+        data = event.get_data()
+        if event.is_esim_event() and data.get('iccid'):
+            self._merge_esim(data)
+        elif event.is_order_event() and data.get('id') is not None:
+            key = self._order_key(data['id'])
+            with self._lock:
+                current = self._orders.get(key)
+                attributes = current[0].to_dict() if current else {}
+                attributes.update(data)
+                self._orders[key] = (Order(copy.deepcopy(attributes)), time.monotonic())
+            for esim in data.get('esims') or []:
+                if isinstance(esim, dict) and esim.get('iccid'):
+                    self._merge_esim(esim)
+    
+    def forget_esim(self, iccid: str):
+        with self._lock:
+            self._esims.pop(iccid, None)
+            self._usage.pop(iccid, None)
+    
+    def forget_order(self, order_id: int):
+        with self._lock:
+            self._orders.pop(self._order_key(order_id), None)
+    
+    def flush(self):
+        with self._lock:
+            self._orders.clear()
+            self._esims.clear()
+            self._usage.clear()
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'orders': len(self._orders),
+            'esims': len(self._esims),
+            'usage': len(self._usage),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+    
+    def _merge_esim(self, data: Dict[str, Any]):
+        iccid = data['iccid']
+        with self._lock:
+            current = self._esims.get(iccid)
+            attributes = current[0].to_dict() if current else {}
+            attributes.update({key: value for key, value in data.items() if key != 'usage'})
+            self._esims[iccid] = (Esim(copy.deepcopy(attributes)), time.monotonic())
+            if isinstance(data.get('usage'), dict):
+                self._usage[iccid] = (copy.deepcopy(data['usage']), time.monotonic())
+    
+    def _store(self, entries: Dict[Any, Tuple[Any, float]], key: Any, value: Any, fetched_at: Optional[float] = None) -> bool:
+        """Store entry, unless it was fetched before the stored one was updated"""
+        with self._lock:
+            current = entries.get(key)
+            if fetched_at is not None and current is not None and current[1] > fetched_at:
+                return False
+            entries[key] = (value, time.monotonic() if fetched_at is None else fetched_at)
+            return True
+    
+    @staticmethod
+    def _order_key(order_id: Any) -> Union[int, str]:
+        """Normalize order ID, numeric IDs may arrive as int or str"""
+        try:
+            return int(order_id)
+        except (TypeError, ValueError):
+            return str(order_id)
+    
+    def _lookup(self, entries: Dict[Any, Tuple[Any, float]], key: Any) -> Any:
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and (self.max_age is None or time.monotonic() - entry[1] < self.max_age):
+                self.hits += 1
+                return _copy(entry[0])
+            self.misses += 1
+        return None
+
+
+def _copy(value: Any) -> Any:
+    """Copy a cached model or dict so callers never share the stored one"""
+    if isinstance(value, (Order, Esim)):
+        return type(value).from_attributes(copy.deepcopy(value.attributes))
+    return copy.deepcopy(value)
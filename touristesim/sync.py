@@ -0,0 +1,209 @@
+"""
+Incremental SQLite sync engine for TouristeSIM SDK
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .models import Model
+
+
+class SyncEngine:
+    """
+    Incremental delta sync of paginated resources into a local SQLite database.
+    
+    A high-water mark is kept per resource: the latest cursor_field value,
+    falling back to created_at and then to the record key. Resources
+    registered with a since_filter (the listing filter taking that value)
+    only request records changed since the previous run; without one every
+    run pages through the full listing. Progress is checkpointed after
+    every page, so a crashed run resumes from the next unsynced page.
+    """
+    
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS records ('
+        ' resource TEXT NOT NULL, id TEXT NOT NULL, cursor TEXT, data TEXT NOT NULL,'
+        ' synced_at REAL NOT NULL, PRIMARY KEY (resource, id))',
+        'CREATE TABLE IF NOT EXISTS checkpoints ('
+        ' resource TEXT PRIMARY KEY, high_water TEXT, run_since TEXT, run_high_water TEXT,'
+        ' next_page INTEGER NOT NULL DEFAULT 1, status TEXT NOT NULL DEFAULT \'idle\','
+        ' updated_at REAL NOT NULL)',
+    )
+    
+    def __init__(
+        self,
+        path: str,
+        per_page: int = 100,
+        cursor_field: str = 'updated_at',
+    ):
+        self.path = path
+        self.per_page = per_page
+        self.cursor_field = cursor_field
+        self._resources: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+    
+    def register(
+        self,
+        name: str,
+        fetch: Callable,
+        key: str = 'id',
+        model: Optional[type] = None,
+        since_filter: Optional[str] = None,
+        cursor_field: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Register paginated fetch callable, e.g. sdk.orders().all.
+        
+        since_filter is the listing filter that takes the high-water mark
+        (e.g. 'updated_since'), filters are sent with every page request.
+        """
+        self._resources[name] = {
+            'fetch': fetch,
+            'key': key,
+            'model': model,
+            'since_filter': since_filter,
+            'cursor_field': cursor_field or self.cursor_field,
+            'filters': filters or {},
+        }
+        return self
+    
+    def sync(self, resources: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Sync registered resources, returns stats per resource"""
+        return {name: self.sync_resource(name) for name in (resources or list(self._resources))}
+    
+    def sync_resource(self, name: str) -> Dict[str, Any]:
+        """Pull new and changed records for one resource"""
+        spec = self._resources[name]
+        checkpoint = self.get_checkpoint(name)
+        if checkpoint['status'] == 'running':
+            # Resume interrupted run where it stopped
+            since = checkpoint['run_since']
+            run_high_water = checkpoint['run_high_water']
+            page = checkpoint['next_page']
+            resumed = True
+        else:
+            since = checkpoint['high_water']
+            run_high_water = since
+            page = 1
+            resumed = False
+            self._save_checkpoint(name, checkpoint['high_water'], since, run_high_water, page, 'running')
+        
+        pages = 0
+        records = 0
+        while True:
+            filters: Dict[str, Any] = dict(spec['filters'], page=page, per_page=self.per_page)
+            if since is not None and spec['since_filter'] is not None:
+                filters[spec['since_filter']] = since
+            collection = spec['fetch'](filters)
+            rows = []
+            for item in collection:
+                data = item.to_dict() if hasattr(item, 'to_dict') else dict(item)
+                cursor = self._cursor(data, spec)
+                run_high_water = self._latest(run_high_water, cursor)
+                rows.append((name, str(data.get(spec['key'])), None if cursor is None else str(cursor),
+                             json.dumps(data), time.time()))
+            has_more = not collection.is_empty() and collection.has_more()
+            with self._lock, self._db:
+                self._db.executemany(
+                    'INSERT OR REPLACE INTO records (resource, id, cursor, data, synced_at) VALUES (?, ?, ?, ?, ?)',
+                    rows,
+                )
+                self._write_checkpoint(name, checkpoint['high_water'], since, run_high_water, page + 1, 'running')
+            pages += 1
+            records += len(rows)
+            if not has_more:
+                break
+            page += 1
+        
+        self._save_checkpoint(name, run_high_water, None, None, 1, 'idle')
+        return {'pages': pages, 'records': records, 'high_water': run_high_water, 'resumed': resumed}
+    
+    def get_checkpoint(self, name: str) -> Dict[str, Any]:
+        """Get checkpoint state for resource"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT high_water, run_since, run_high_water, next_page, status, updated_at'
+                ' FROM checkpoints WHERE resource = ?', (name,)
+            ).fetchone()
+        if row is None:
+            return {'high_water': None, 'run_since': None, 'run_high_water': None,
+                    'next_page': 1, 'status': 'idle', 'updated_at': None}
+        return dict(zip(('high_water', 'run_since', 'run_high_water', 'next_page', 'status', 'updated_at'), row))
+    
+    def reset(self, name: str):
+        """Forget high-water mark and stored records, next run is a full sync"""
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM checkpoints WHERE resource = ?', (name,))
+            self._db.execute('DELETE FROM records WHERE resource = ?', (name,))
+    
+    def find(self, name: str, record_id: Any) -> Optional[Any]:
+        """Get stored record"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT data FROM records WHERE resource = ? AND id = ?', (name, str(record_id))
+            ).fetchone()
+        return self._hydrate(name, row[0]) if row else None
+    
+    def all(self, name: str) -> Iterator[Any]:
+        """Iterate stored records"""
+        with self._lock:
+            rows = self._db.execute('SELECT data FROM records WHERE resource = ? ORDER BY id', (name,)).fetchall()
+        for row in rows:
+            yield self._hydrate(name, row[0])
+    
+    def count(self, name: str) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM records WHERE resource = ?', (name,)).fetchone()[0]
+    
+    def close(self):
+        self._db.close()
+    
+    def _hydrate(self, name: str, data: str) -> Any:
+        model = self._resources.get(name, {}).get('model')
+        attributes = json.loads(data)
+        return model(attributes) if model and issubclass(model, Model) else attributes
+    
+    def _save_checkpoint(self, name, high_water, since, run_high_water, next_page, status):
+        with self._lock, self._db:
+            self._write_checkpoint(name, high_water, since, run_high_water, next_page, status)
+    
+    def _write_checkpoint(self, name, high_water, since, run_high_water, next_page, status):
+        self._db.execute(
+            'INSERT OR REPLACE INTO checkpoints'
+            ' (resource, high_water, run_since, run_high_water, next_page, status, updated_at)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (name, self._text(high_water), self._text(since), self._text(run_high_water), next_page, status, time.time()),
+        )
+    
+    @staticmethod
+    def _cursor(data: Dict[str, Any], spec: Dict[str, Any]) -> Any:
+        for field in (spec['cursor_field'], 'created_at', spec['key']):
+            if data.get(field) is not None:
+                return data[field]
+        return None
+    
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        return None if value is None else str(value)
+    
+    @staticmethod
+    def _latest(current: Any, candidate: Any) -> Any:
+        """Return the later of two cursor values (timestamps or numeric IDs)"""
+        if candidate is None:
+            return current
+        if current is None:
+            return candidate
+        # int first: long numeric keys such as ICCIDs lose precision as floats
+        for convert in (int, float):
+            try:
+                return candidate if convert(candidate) > convert(current) else current
+            except (TypeError, ValueError):
+                pass
+        return candidate if str(candidate) > str(current) else current
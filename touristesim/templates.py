@@ -0,0 +1,151 @@
+"""
+Prepared request templates for TouristeSIM SDK
+"""
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Tuple
+from urllib.parse import urlencode
+
+if TYPE_CHECKING:
+    import requests
+
+
+def encode_query(params: Mapping[str, Any]) -> str:
+    """Encode query parameters like requests does (lists repeat the key, None is dropped)"""
+    pairs = []
+    for key, value in params.items():
+        values = value if isinstance(value, (list, tuple)) else (value,)
+        pairs.extend((key, item) for item in values if item is not None)
+    return urlencode(pairs)
+
+
+class RequestTemplate:
+    """Parts of a request that only depend on method and base URL"""
+    
+    __slots__ = ('method', 'url', 'settings')
+    
+    def __init__(self, method: str, url: str, settings: Dict[str, Any]):
+        self.method = method
+        self.url = url
+        self.settings = settings
+
+
+class RequestTemplates:
+    """
+    Build requests from cached templates instead of Session.request().
+    
+    Session.request() merges session headers, cookies and settings and
+    scans proxy environment variables on every call. Here each
+    (method, base URL) is normalized once and the endpoint is only
+    appended and requoted per call, so IDs in paths do not fill the
+    cache. Environment settings are resolved once per base URL, and the
+    static headers (session
+    headers plus the SDK's) are merged once, with the Authorization
+    header swapped in only when the token changes. Headers added to the
+    session after the first request are not picked up.
+    """
+    
+    def __init__(self, session: 'requests.Session', headers: Dict[str, str], verify: bool, maxsize: int = 1024):
+        from requests.structures import CaseInsensitiveDict
+        
+        self.session = session
+        self.verify = verify
+        self.maxsize = maxsize
+        self.static_headers = CaseInsensitiveDict(
+            {key: value for key, value in session.headers.items() if value is not None}
+        )
+        self.static_headers.update(headers)
+        self._auth: Tuple[Optional[str], Any] = (None, None)
+        self._templates: 'OrderedDict[Tuple[str, str], RequestTemplate]' = OrderedDict()
+        self._settings: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def template(self, method: str, base_url: str) -> RequestTemplate:
+        """Get template, building it on first use"""
+        key = (method, base_url)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+        template = self._build(method, base_url)
+        with self._lock:
+            self.misses += 1
+            self._templates[key] = template
+            if len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+        return template
+    
+    def headers(self, token: str) -> Any:
+        """Get static headers with Authorization for token (shared, do not modify)"""
+        current, headers = self._auth
+        if current != token:
+            headers = self.static_headers.copy()
+            headers['Authorization'] = f'Bearer {token}'
+            self._auth = (token, headers)
+        return headers
+    
+    @staticmethod
+    def url(template: RequestTemplate, endpoint: str) -> str:
+        """Get URL of endpoint under the template's base URL"""
+        from requests.utils import requote_uri
+        
+        return requote_uri(f"{template.url}{endpoint}") if endpoint else template.url
+    
+    def prepare(
+        self,
+        template: RequestTemplate,
+        token: str,
+        endpoint: str = '',
+        params: Optional[Mapping[str, Any]] = None,
+        body: Optional[bytes] = None,
+        body_headers: Optional[Dict[str, str]] = None,
+    ) -> 'requests.PreparedRequest':
+        import requests
+        from requests.hooks import default_hooks
+        
+        prepared = requests.PreparedRequest()
+        prepared.method = template.method
+        prepared.url = self.url(template, endpoint)
+        if params:
+            query = encode_query(params)
+            if query:
+                prepared.url = f"{prepared.url}{'&' if '?' in prepared.url else '?'}{query}"
+        headers = self.headers(token).copy()
+        if body_headers:
+            headers.update(body_headers)
+        if body is not None:
+            headers['Content-Length'] = str(len(body))
+        elif template.method not in ('GET', 'HEAD'):
+            headers['Content-Length'] = '0'
+        prepared.headers = headers
+        prepared.body = body
+        prepared.hooks = default_hooks()
+        prepared.prepare_cookies(self.session.cookies)
+        return prepared
+    
+    def can_prepare(self) -> bool:
+        """Check the session has no auth or default params that need the full merge"""
+        return not self.session.auth and not self.session.params
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'templates': len(self._templates), 'hits': self.hits, 'misses': self.misses}
+    
+    def _build(self, method: str, base_url: str) -> RequestTemplate:
+        import requests
+        
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(base_url, None)
+        settings = self._settings.get(base_url)
+        if settings is None:
+            settings = self.session.merge_environment_settings(prepared.url, {}, None, self.verify, None)
+            self._settings[base_url] = settings
+        url = prepared.url
+        if url.endswith('/') and not base_url.endswith('/'):
+            # prepare_url() adds a root path, endpoints bring their own slash
+            url = url[:-1]
+        return RequestTemplate(method.upper(), url, settings)
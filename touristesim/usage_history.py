@@ -0,0 +1,245 @@
+"""
+Ring-buffer usage history and burn-rate forecasts for TouristeSIM SDK
+"""
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b'TEUSAGE'
+FORMAT_VERSION = 1
+_PREAMBLE = struct.Struct('<7sHI')
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class UsageHistory:
+    """
+    Fixed-capacity history of remaining data per eSIM.
+    
+    Every eSIM gets a slot of capacity (timestamp, remaining) samples in
+    one contiguous array of doubles, written as a ring, so memory does not
+    grow with the number of polls. A top-up (remaining going up) restarts
+    the slot's history. forecast() fits a least-squares line through each
+    slot; with numpy installed it runs over all slots at once on a
+    zero-copy view of the array, otherwise it falls back to a Python loop.
+    """
+    
+    def __init__(self, capacity: int = 32, slots: int = 1024):
+        if capacity < 2:
+            raise ValueError('capacity must be at least 2')
+        self.capacity = capacity
+        self._samples = array('d', bytes(8 * 2 * capacity * slots))
+        self._heads = array('q', bytes(8 * slots))
+        self._counts = array('q', bytes(8 * slots))
+        self._slots: Dict[str, int] = {}
+        self._iccids: List[Optional[str]] = [None] * slots
+        self._free = list(range(slots - 1, -1, -1))
+        self._lock = threading.Lock()
+    
+    def record(self, iccid: str, remaining: float, timestamp: Optional[float] = None):
+        """Add a remaining-data sample for eSIM"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            slot = self._slots.get(iccid)
+            if slot is None:
+                slot = self._allocate(iccid)
+            count = self._counts[slot]
+            head = self._heads[slot]
+            if count:
+                last = (slot * self.capacity + (head - 1) % self.capacity) * 2
+                if remaining > self._samples[last + 1]:
+                    # Topped up, the old samples say nothing about the new balance
+                    count = head = 0
+            offset = (slot * self.capacity + head) * 2
+            self._samples[offset] = timestamp
+            self._samples[offset + 1] = remaining
+            self._heads[slot] = (head + 1) % self.capacity
+            self._counts[slot] = min(count + 1, self.capacity)
+    
+    def remove(self, iccid: str):
+        with self._lock:
+            slot = self._slots.pop(iccid, None)
+            if slot is not None:
+                self._iccids[slot] = None
+                self._counts[slot] = self._heads[slot] = 0
+                self._free.append(slot)
+    
+    def samples(self, iccid: str) -> List[Tuple[float, float]]:
+        """Get (timestamp, remaining) samples of eSIM, oldest first"""
+        with self._lock:
+            slot = self._slots.get(iccid)
+            if slot is None:
+                return []
+            count, head = self._counts[slot], self._heads[slot]
+            positions = [(head - count + index) % self.capacity for index in range(count)]
+            return [
+                (self._samples[(slot * self.capacity + position) * 2], self._samples[(slot * self.capacity + position) * 2 + 1])
+                for position in positions
+            ]
+    
+    def forecast(self, now: Optional[float] = None) -> Dict[str, Tuple[float, Optional[float]]]:
+        """
+        Get (burn rate in units per second, seconds until empty) per eSIM.
+        
+        Seconds until empty is None for eSIMs that are not using data or
+        have fewer than two samples, and 0 for those already empty.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            iccids, rates, remaining, observed = self._compute()
+        forecast: Dict[str, Tuple[float, Optional[float]]] = {}
+        for iccid, rate, left, at in zip(iccids, rates, remaining, observed):
+            if iccid is None:
+                continue
+            if rate > 0:
+                forecast[iccid] = (rate, max(0.0, at + left / rate - now))
+            else:
+                forecast[iccid] = (0.0, 0.0 if left <= 0 else None)
+        return forecast
+    
+    def running_out(self, within: float, now: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Get (ICCID, seconds until empty) of eSIMs expected to run out within seconds, soonest first"""
+        expiring = [
+            (iccid, seconds)
+            for iccid, (_, seconds) in self.forecast(now).items()
+            if seconds is not None and seconds <= within
+        ]
+        return sorted(expiring, key=lambda entry: entry[1])
+    
+    def count(self) -> int:
+        return len(self._slots)
+    
+    def save(self, path: str) -> str:
+        """Write history to path atomically, returns path"""
+        with self._lock:
+            header = json.dumps({
+                'capacity': self.capacity,
+                'slots': len(self._iccids),
+                'iccids': self._iccids,
+                'byteorder': sys.byteorder,
+            }, separators=(',', ':')).encode('utf-8')
+            payload = [self._heads.tobytes(), self._counts.tobytes(), self._samples.tobytes()]
+        directory = os.path.dirname(os.path.abspath(path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, prefix='.usage-', suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as output:
+                output.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+                output.write(header)
+                for chunk in payload:
+                    output.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return path
+    
+    @classmethod
+    def load(cls, path: str) -> 'UsageHistory':
+        """Restore history written by save()"""
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        magic, version, header_size = _PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a usage history file')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported usage history format version {version}')
+        header = json.loads(data[_PREAMBLE.size:_PREAMBLE.size + header_size])
+        slots, capacity = header['slots'], header['capacity']
+        history = cls(capacity, 0)
+        offset = _PREAMBLE.size + header_size
+        for name, size in (('_heads', slots), ('_counts', slots), ('_samples', 2 * capacity * slots)):
+            values = getattr(history, name)
+            values.frombytes(data[offset:offset + 8 * size])
+            if header['byteorder'] != sys.byteorder:
+                values.byteswap()
+            offset += 8 * size
+        history._iccids = header['iccids']
+        history._slots = {iccid: slot for slot, iccid in enumerate(history._iccids) if iccid is not None}
+        history._free = [slot for slot in range(slots - 1, -1, -1) if history._iccids[slot] is None]
+        return history
+    
+    def _allocate(self, iccid: str) -> int:
+        if not self._free:
+            # Double the slots, one reallocation per doubling
+            added = max(1, len(self._iccids))
+            self._samples.frombytes(bytes(8 * 2 * self.capacity * added))
+            self._heads.frombytes(bytes(8 * added))
+            self._counts.frombytes(bytes(8 * added))
+            self._free = list(range(len(self._iccids) + added - 1, len(self._iccids) - 1, -1))
+            self._iccids.extend([None] * added)
+        slot = self._free.pop()
+        self._slots[iccid] = slot
+        self._iccids[slot] = iccid
+        return slot
+    
+    def _compute(self) -> Tuple[Sequence[Optional[str]], Sequence[float], Sequence[float], Sequence[float]]:
+        """Get ICCIDs, burn rates, last remaining and last timestamps by slot"""
+        numpy = _numpy()
+        if numpy is None:
+            return self._compute_python()
+        slots = len(self._iccids)
+        samples = numpy.frombuffer(self._samples, dtype=numpy.float64).reshape(slots, self.capacity, 2)
+        counts = numpy.frombuffer(self._counts, dtype=numpy.int64)
+        heads = numpy.frombuffer(self._heads, dtype=numpy.int64)
+        rows = numpy.arange(slots)
+        last = (heads - 1) % self.capacity
+        observed = samples[rows, last, 0]
+        remaining = samples[rows, last, 1]
+        # Samples are written from position 0 until the ring is full, so
+        # the valid positions of a slot are the first count ones
+        mask = numpy.arange(self.capacity) < counts[:, None]
+        # Times relative to the last sample keep the sums well conditioned
+        t = numpy.where(mask, samples[:, :, 0] - observed[:, None], 0.0)
+        y = numpy.where(mask, samples[:, :, 1], 0.0)
+        n = counts.astype(numpy.float64)
+        st, sy = t.sum(axis=1), y.sum(axis=1)
+        stt, sty = (t * t).sum(axis=1), (t * y).sum(axis=1)
+        denominator = n * stt - st * st
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            slope = numpy.where(denominator > 0, (n * sty - st * sy) / denominator, 0.0)
+        rates = numpy.maximum(-slope, 0.0)
+        observed = numpy.where(counts > 0, observed, numpy.nan)
+        return self._iccids, rates.tolist(), remaining.tolist(), observed.tolist()
+    
+    def _compute_python(self) -> Tuple[List[Optional[str]], List[float], List[float], List[float]]:
+        rates: List[float] = []
+        remaining: List[float] = []
+        observed: List[float] = []
+        samples, capacity = self._samples, self.capacity
+        for slot in range(len(self._iccids)):
+            count = self._counts[slot]
+            base = slot * capacity * 2
+            last = base + (self._heads[slot] - 1) % capacity * 2
+            if not count:
+                rates.append(0.0)
+                remaining.append(0.0)
+                observed.append(float('nan'))
+                continue
+            at = samples[last]
+            st = sy = stt = sty = 0.0
+            for position in range(count):
+                t = samples[base + position * 2] - at
+                y = samples[base + position * 2 + 1]
+                st += t
+                sy += y
+                stt += t * t
+                sty += t * y
+            denominator = count * stt - st * st
+            slope = (count * sty - st * sy) / denominator if denominator > 0 else 0.0
+            rates.append(max(-slope, 0.0))
+            remaining.append(samples[last + 1])
+            observed.append(at)
+        return self._iccids, rates, remaining, observed
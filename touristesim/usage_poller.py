@@ -0,0 +1,277 @@
+"""
+Adaptive eSIM usage polling scheduler for TouristeSIM SDK
+"""
+import heapq
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .models import Esim
+from .exceptions import ApiException
+
+if TYPE_CHECKING:
+    from .usage_history import UsageHistory
+
+
+class _Tracked:
+    """Polling state for one eSIM"""
+    
+    def __init__(self, iccid: str, remaining: Optional[float], validity_end: Optional[float]):
+        self.iccid = iccid
+        self.remaining = remaining
+        self.observed_at: Optional[float] = time.time() if remaining is not None else None
+        self.validity_end = validity_end
+        self.rate = 0.0
+        self.interval: Optional[float] = None
+        self.crossed: set = set()
+        self.due = 0.0
+
+
+class UsagePoller:
+    """
+    Poll eSIM usage on a per-eSIM adaptive schedule.
+    
+    eSIMs are kept in a priority queue keyed on next-due time. Each interval
+    is derived from the observed consumption rate and the distance to the
+    next threshold or validity end, with jitter, and all polls share a
+    global requests-per-second budget. Threshold crossings are emitted to
+    listeners; a listener that raises is counted in callback_errors and
+    kept in last_error without stopping the poll. Readings are also recorded in history, when given, for
+    fleet-wide burn-rate forecasts.
+    """
+    
+    def __init__(
+        self,
+        esims: Any,
+        thresholds: Sequence[float] = (1024, 500, 100),
+        min_interval: float = 60,
+        max_interval: float = 6 * 3600,
+        requests_per_second: float = 10,
+        jitter: float = 0.1,
+        smoothing: float = 0.3,
+        remaining_key: Callable[[Dict[str, Any]], Optional[float]] = None,
+        history: Optional['UsageHistory'] = None,
+    ):
+        self.esims = esims
+        self.thresholds = sorted(thresholds, reverse=True)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_second = requests_per_second
+        self.jitter = jitter
+        self.smoothing = smoothing
+        self.remaining_key = remaining_key or self._default_remaining
+        self.history = history
+        self._tracked: Dict[str, _Tracked] = {}
+        self._queue: List[Tuple[float, str]] = []
+        self._listeners: List[Callable] = []
+        self._usage_listeners: List[Callable] = []
+        self._lock = threading.Lock()
+        self._tokens = float(requests_per_second)
+        self._refilled_at = time.monotonic()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.polls = 0
+        self.callback_errors = 0
+        self.last_error: Optional[BaseException] = None
+    
+    def add(self, esim: Any, remaining: Optional[float] = None, validity_end: Any = None):
+        """Track eSIM (Esim model or ICCID), polled first right away"""
+        if isinstance(esim, Esim):
+            remaining = esim.get_balance_data() if remaining is None else remaining
+            validity_end = validity_end or esim.get_validity_end()
+            iccid = esim.get_iccid()
+        else:
+            iccid = str(esim)
+        tracked = _Tracked(iccid, remaining, self._parse_time(validity_end))
+        with self._lock:
+            self._tracked[iccid] = tracked
+            self._schedule(tracked, time.time() if remaining is None else time.time() + self._interval(tracked))
+    
+    def remove(self, iccid: str):
+        with self._lock:
+            self._tracked.pop(iccid, None)
+        if self.history is not None:
+            self.history.remove(iccid)
+    
+    def on_threshold(self, callback: Callable[[str, float, float, Dict[str, Any]], Any]):
+        """Register listener called with (iccid, threshold, remaining, usage)"""
+        self._listeners.append(callback)
+        return callback
+    
+    def on_usage(self, callback: Callable[[str, Dict[str, Any]], Any]):
+        """Register listener called with (iccid, usage) after every poll"""
+        self._usage_listeners.append(callback)
+        return callback
+    
+    def next_due(self) -> Optional[float]:
+        """Get wall time of the next scheduled poll"""
+        with self._lock:
+            self._drop_stale()
+            return self._queue[0][0] if self._queue else None
+    
+    def run_pending(self, max_polls: Optional[int] = None) -> int:
+        """Poll all due eSIMs within the request budget, returns number of polls"""
+        polled = 0
+        while max_polls is None or polled < max_polls:
+            with self._lock:
+                self._drop_stale()
+                if not self._queue or self._queue[0][0] > time.time():
+                    break
+                if not self._take_token():
+                    break
+                _, iccid = heapq.heappop(self._queue)
+                tracked = self._tracked.get(iccid)
+            if tracked is None:
+                continue
+            self._poll(tracked)
+            polled += 1
+        return polled
+    
+    def start(self):
+        """Run scheduler in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='touristesim-usage-poller', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+    
+    def get_state(self, iccid: str) -> Optional[Dict[str, Any]]:
+        tracked = self._tracked.get(iccid)
+        if tracked is None:
+            return None
+        return {
+            'remaining': tracked.remaining,
+            'rate': tracked.rate,
+            'interval': tracked.interval,
+            'next_due': tracked.due,
+            'crossed': sorted(tracked.crossed, reverse=True),
+        }
+    
+    def count(self) -> int:
+        return len(self._tracked)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_pending()
+            due = self.next_due()
+            now = time.time()
+            wait = 1.0 if due is None else max(0.0, due - now)
+            if due is not None and due <= now:
+                # Out of budget, wait for the next token
+                wait = 1.0 / self.requests_per_second
+            self._stop.wait(min(wait, self.max_interval))
+    
+    def _poll(self, tracked: _Tracked):
+        self.polls += 1
+        try:
+            usage = self.esims.usage(tracked.iccid)
+        except ApiException:
+            with self._lock:
+                if tracked.iccid in self._tracked:
+                    self._schedule(tracked, time.time() + self.min_interval)
+            return
+        now = time.time()
+        remaining = self.remaining_key(usage)
+        previous = tracked.remaining
+        if remaining is not None:
+            if previous is not None and tracked.observed_at is not None and now > tracked.observed_at:
+                observed = max(0.0, (previous - remaining) / (now - tracked.observed_at))
+                tracked.rate = self.smoothing * observed + (1 - self.smoothing) * tracked.rate
+            tracked.remaining = remaining
+            tracked.observed_at = now
+            if self.history is not None:
+                self.history.record(tracked.iccid, remaining, now)
+        for callback in self._usage_listeners:
+            self._notify(callback, tracked.iccid, usage)
+        if remaining is not None:
+            for threshold in self.thresholds:
+                if remaining <= threshold and threshold not in tracked.crossed:
+                    tracked.crossed.add(threshold)
+                    for callback in self._listeners:
+                        self._notify(callback, tracked.iccid, threshold, remaining, usage)
+                elif remaining > threshold:
+                    # Topped up, allow crossing again
+                    tracked.crossed.discard(threshold)
+        with self._lock:
+            if tracked.iccid in self._tracked:
+                self._schedule(tracked, now + self._interval(tracked))
+    
+    def _notify(self, callback: Callable, *args: Any):
+        try:
+            callback(*args)
+        except Exception as e:
+            # A failing listener must not skip the others or stop the schedule
+            self.callback_errors += 1
+            self.last_error = e
+    
+    def _interval(self, tracked: _Tracked) -> float:
+        now = time.time()
+        if tracked.rate > 0 and tracked.remaining is not None:
+            below = [t for t in self.thresholds if t < tracked.remaining]
+            target = below[0] if below else 0
+            # Poll about twice before the next threshold is expected to be crossed
+            interval = (tracked.remaining - target) / tracked.rate / 2
+        else:
+            # Idle eSIM, back off
+            interval = (tracked.interval or self.min_interval) * 2
+        if tracked.validity_end is not None and tracked.validity_end > now:
+            interval = min(interval, (tracked.validity_end - now) / 2)
+        interval = max(self.min_interval, min(self.max_interval, interval))
+        tracked.interval = interval
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+    
+    def _schedule(self, tracked: _Tracked, due: float):
+        tracked.due = due
+        heapq.heappush(self._queue, (due, tracked.iccid))
+    
+    def _drop_stale(self):
+        while self._queue:
+            due, iccid = self._queue[0]
+            tracked = self._tracked.get(iccid)
+            if tracked is not None and tracked.due == due:
+                return
+            heapq.heappop(self._queue)
+    
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.requests_per_second),
+            self._tokens + (now - self._refilled_at) * self.requests_per_second,
+        )
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+    
+    @staticmethod
+    def _default_remaining(usage: Dict[str, Any]) -> Optional[float]:
+        for key in ('balance_data', 'remaining_data', 'data_remaining'):
+            if usage.get(key) is not None:
+                return float(usage[key])
+        return None
+    
+    @staticmethod
+    def _parse_time(value: Any) -> Optional[float]:
+        if value is None or value == '':
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, datetime):
+            parsed = value
+        else:
+            try:
+                parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
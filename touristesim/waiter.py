@@ -0,0 +1,267 @@
+"""
+Order completion waiter for TouristeSIM SDK
+"""
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from .models import Order
+from .events import EventDispatcher, WebhookEvent
+from .exceptions import ApiException, TimeoutException
+
+
+def _settle(future: Future, order: Optional[Order] = None, error: Optional[BaseException] = None):
+    """Resolve future unless it was cancelled (by close() or its asyncio wrapper) in the meantime"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(order)
+    except InvalidStateError:
+        pass
+
+
+class _PendingOrder:
+    """Polling state shared by all waiters of one order"""
+    
+    def __init__(self, order_id: int, interval: float):
+        self.order_id = order_id
+        self.interval = interval
+        self.next_poll = time.monotonic() + interval
+        self.status: Optional[str] = None
+        self.waiters: List[tuple] = []
+        self.in_flight = False
+
+
+class OrderWaiter:
+    """
+    Wait for orders to reach a final status.
+    
+    All waiters share one background scheduling loop. Each order is
+    polled on an adaptive backoff schedule and resolved immediately when a
+    matching order webhook event is dispatched. Due orders are checked
+    with one listing call per 100 orders when batch_filter (the listing's
+    ID filter) is set, otherwise with up to concurrency find() calls at a
+    time. Checks run off the loop, so a slow call does not hold up other
+    orders or waiter timeouts.
+    """
+    
+    FINAL_STATUSES = ('completed', 'failed', 'cancelled')
+    
+    def __init__(
+        self,
+        orders: Any,
+        events: Optional[EventDispatcher] = None,
+        initial_interval: float = 0.5,
+        max_interval: float = 10.0,
+        multiplier: float = 1.6,
+        concurrency: int = 8,
+        batch_filter: Optional[str] = None,
+    ):
+        self.orders = orders
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.multiplier = multiplier
+        self.concurrency = concurrency
+        self.batch_filter = batch_filter
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[int, _PendingOrder] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.polls = 0
+        if events is not None:
+            events.listen(self._on_event, 'order.')
+    
+    def submit(self, order_id: int, timeout: float = 300) -> Future:
+        """Register waiter, returns future resolving to the final Order"""
+        future: Future = Future()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('Order waiter is closed')
+            pending = self._pending.get(int(order_id))
+            if pending is None:
+                pending = _PendingOrder(int(order_id), self.initial_interval)
+                self._pending[pending.order_id] = pending
+            pending.waiters.append((future, deadline, timeout))
+            self._ensure_thread()
+            self._condition.notify()
+        return future
+    
+    def wait(self, order_id: int, timeout: float = 300) -> Order:
+        """Block until order reaches a final status"""
+        try:
+            return self.submit(order_id, timeout).result(timeout)
+        except FutureTimeoutError:
+            raise TimeoutException.order(order_id, timeout) from None
+    
+    async def wait_async(self, order_id: int, timeout: float = 300) -> Order:
+        """Wait until order reaches a final status without blocking the event loop"""
+        import asyncio
+        
+        return await asyncio.wrap_future(self.submit(order_id, timeout))
+    
+    def count(self) -> int:
+        return sum(len(pending.waiters) for pending in self._pending.values())
+    
+    def close(self):
+        """Stop polling and its threads, cancelling the futures still waiting"""
+        with self._condition:
+            self._closed = True
+            pending, self._pending = list(self._pending.values()), {}
+            thread = self._thread
+            self._condition.notify()
+        for entry in pending:
+            for future, _, _ in entry.waiters:
+                future.cancel()
+        if thread is not None:
+            thread.join()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='touristesim-order-waiter', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                self._expire(now)
+                idle = [pending for pending in self._pending.values() if not pending.in_flight]
+                due = [pending for pending in idle if pending.next_poll <= now]
+                if not due:
+                    wake_at = min(
+                        [pending.next_poll for pending in idle]
+                        + [waiter[1] for pending in self._pending.values() for waiter in pending.waiters]
+                        or [now]
+                    )
+                    self._condition.wait(max(0.0, wake_at - now))
+                    continue
+                for pending in due:
+                    pending.in_flight = True
+            try:
+                self._dispatch(due)
+            except Exception as e:
+                for pending in due:
+                    self._reject(pending, e)
+    
+    def _dispatch(self, due: List[_PendingOrder]):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix='touristesim-order-waiter')
+        if self.batch_filter is None:
+            for pending in due:
+                self._executor.submit(self._poll, pending)
+            return
+        for start in range(0, len(due), 100):
+            self._executor.submit(self._poll_many, due[start:start + 100])
+    
+    def _poll(self, pending: _PendingOrder):
+        with self._condition:
+            self.polls += 1
+        try:
+            order = self.orders.find(pending.order_id)
+        except ApiException as e:
+            status = e.get_status_code()
+            if 400 <= status < 500 and status != 429:
+                self._reject(pending, e)
+                return
+            order = None
+        except Exception as e:
+            self._reject(pending, e)
+            return
+        self._update(pending, order)
+    
+    def _poll_many(self, batch: List[_PendingOrder]):
+        """Check orders through one listing call filtered by ID"""
+        with self._condition:
+            self.polls += 1
+        try:
+            listing = self.orders.all({
+                self.batch_filter: ','.join(str(pending.order_id) for pending in batch),
+                'per_page': len(batch),
+            })
+            found = {str(order.get('id')): order for order in listing}
+        except ApiException as e:
+            status = e.get_status_code()
+            if 400 <= status < 500 and status != 429:
+                for pending in batch:
+                    self._reject(pending, e)
+                return
+            found = {}
+        except Exception as e:
+            for pending in batch:
+                self._reject(pending, e)
+            return
+        for pending in batch:
+            self._update(pending, found.get(str(pending.order_id)))
+    
+    def _update(self, pending: _PendingOrder, order: Optional[Order]):
+        with self._condition:
+            pending.in_flight = False
+            if self._pending.get(pending.order_id) is not pending:
+                return
+            if order is not None and order.get_status() in self.FINAL_STATUSES:
+                self._resolve_locked(pending.order_id, order)
+                return
+            status = order.get_status() if order is not None else pending.status
+            if status != pending.status:
+                # Progress was made, poll again soon
+                pending.interval = self.initial_interval
+                pending.status = status
+            else:
+                pending.interval = min(self.max_interval, pending.interval * self.multiplier)
+            pending.next_poll = time.monotonic() + pending.interval
+            self._condition.notify()
+    
+    def _on_event(self, event: WebhookEvent):
+        data = event.get_data()
+        if data.get('id') is None:
+            return
+        order = Order(data)
+        with self._condition:
+            if order.get('id') not in self._pending:
+                return
+            if order.get_status() in self.FINAL_STATUSES:
+                self._resolve_locked(order.get('id'), order)
+            else:
+                # Something changed upstream, check right away
+                self._pending[order.get('id')].next_poll = time.monotonic()
+                self._condition.notify()
+    
+    def _resolve_locked(self, order_id: int, order: Order):
+        pending = self._pending.pop(order_id)
+        for future, _, _ in pending.waiters:
+            _settle(future, order)
+    
+    def _reject(self, pending: _PendingOrder, error: Exception):
+        with self._condition:
+            pending.in_flight = False
+            if self._pending.get(pending.order_id) is not pending:
+                return
+            del self._pending[pending.order_id]
+        for future, _, _ in pending.waiters:
+            _settle(future, error=error)
+    
+    def _expire(self, now: float):
+        for order_id in list(self._pending):
+            pending = self._pending[order_id]
+            remaining = []
+            for future, deadline, timeout in pending.waiters:
+                if future.done():
+                    continue
+                if deadline <= now:
+                    _settle(future, error=TimeoutException.order(order_id, timeout))
+                else:
+                    remaining.append((future, deadline, timeout))
+            pending.waiters = remaining
+            if not remaining:
+                del self._pending[order_id]
@@ -0,0 +1,110 @@
+"""
+Client warm-up for TouristeSIM SDK
+"""
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from .http_client import HttpClient
+
+
+class WarmupReport:
+    """Per-phase timings and failures of a warm-up run"""
+    
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.connections = 0
+        self.opened = 0
+    
+    def is_ready(self) -> bool:
+        """Check every phase succeeded"""
+        return not self.errors
+    
+    def get_timing(self, phase: str) -> Optional[float]:
+        """Get seconds a phase took ('token', 'dns', 'connections', 'catalog', 'total')"""
+        return self.timings.get(phase)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ready': self.is_ready(),
+            'timings': dict(self.timings),
+            'connections': self.connections,
+            'opened': self.opened,
+            'errors': dict(self.errors),
+        }
+    
+    def run(self, phase: str, fn: Callable[[], Any]) -> Any:
+        """Run fn as phase, recording its duration and any error"""
+        started = time.perf_counter()
+        try:
+            return fn()
+        except Exception as e:
+            self.errors[phase] = f"{type(e).__name__}: {e}"
+            return None
+        finally:
+            self.timings[phase] = time.perf_counter() - started
+
+
+def resolve(base_urls: List[str]) -> None:
+    """Resolve API hosts, raising when one does not resolve"""
+    for url in base_urls:
+        parts = urlsplit(url)
+        socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80), type=socket.SOCK_STREAM)
+
+
+def open_connections(client: 'HttpClient', base_url: str, count: int, timeout: float) -> Tuple[int, int]:
+    """
+    Fill the session's connection pool for base_url with count connected sockets.
+    
+    Connections already open are kept, so repeated calls are cheap.
+    Returns (connections ready, connections opened by this call).
+    """
+    import requests
+    from urllib3.util.connection import is_connection_dropped
+    
+    template = client.templates.template('GET', base_url)
+    adapter = client.session.get_adapter(template.url)
+    if not hasattr(adapter, 'get_connection'):
+        # Not an HTTPAdapter (e.g. a test transport), nothing to pre-open
+        return 0, 0
+    settings = template.settings
+    if hasattr(adapter, 'get_connection_with_tls_context'):
+        prepared = requests.Request('GET', template.url).prepare()
+        pool = adapter.get_connection_with_tls_context(prepared, settings['verify'], settings['proxies'], settings['cert'])
+    else:
+        pool = adapter.get_connection(template.url, settings['proxies'])
+        adapter.cert_verify(pool, template.url, settings['verify'], settings['cert'])
+    
+    # _get_conn()/_put_conn() are private HTTPConnectionPool methods (urllib3 1.x and 2.x),
+    # there is no public API to fill a pool ahead of use
+    connections = [pool._get_conn() for _ in range(count)]
+    stale = [conn for conn in connections if conn.sock is None or is_connection_dropped(conn)]
+    failures: List[BaseException] = []
+    
+    def connect(conn):
+        original = conn.timeout
+        try:
+            conn.close()
+            conn.timeout = timeout
+            conn.connect()
+        except Exception as e:
+            conn.close()
+            failures.append(e)
+        finally:
+            # The pooled connection keeps the pool's own timeout for later requests
+            conn.timeout = original
+    
+    threads = [threading.Thread(target=connect, args=(conn,), daemon=True) for conn in stale]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for conn in connections:
+        pool._put_conn(conn)
+    if failures and len(failures) == len(connections):
+        raise failures[0]
+    return len(connections) - len(failures), len(stale) - len(failures)